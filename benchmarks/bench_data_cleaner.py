@@ -0,0 +1,131 @@
+import argparse
+import os
+import re
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.data_cleaner import DataCleaner, convert_bangla_numerals
+from modules.data_ingestor import DataIngestor
+from synthetic_catalog import synthetic_catalog
+
+
+class OriginalDataCleaner:
+    """
+    DataCleaner as it was before the precompiled patterns and the vectorized path, kept verbatim as the
+    baseline: inline re.sub calls per row and one apply per pattern over the technical details.
+    """
+    def __init__(self, df: pd.DataFrame):
+        self.df = df.copy()
+
+    def clean_price(self, price_str):
+        if not price_str:
+            return None
+        price_str = convert_bangla_numerals(price_str)
+        if "৳" in price_str:
+            price_str = price_str.split("৳")[0]
+        price_str = re.sub(r'[^\d.]', '', price_str)
+        try:
+            return float(price_str)
+        except ValueError:
+            return None
+
+    def clean_description(self, description):
+        description = str(description) if description is not None else ""
+        description = re.sub(r'<[^>]+>', ' ', description)
+        description = re.sub(r'\s+', ' ', description).strip()
+        description = re.sub(
+            r'(?im)^(Features of .*?Laptop In Bangladesh\s*|Details Overview for .*?Laptop\s*)\n?',
+            '',
+            description
+        )
+        description = re.sub(r'^Description\s*', '', description, flags=re.IGNORECASE)
+        description = re.sub(
+            r' Order Online Or Visit your Nearest Star Tech Shop to get yours at lowest price.',
+            '',
+            description
+        )
+        description = re.sub(
+            r'(?i)You can buy .*?(from our website or visit our showrooms nearby.)[\.!]*\s*',
+            '',
+            description
+        )
+        description = re.sub(
+            r'(?i)Buy .*?(Laptop From Star Tech.)[\.!]*\s*',
+            '',
+            description
+        )
+        description = re.sub(
+            r'(?i)In Bangladesh, you can get .*?(Laptop From Star Tech.)[\.!]*\s*',
+            '',
+            description
+        )
+        description = re.split(r'Buying Guide|Why Choose', description)[0]
+        return description
+
+    def clean_data(self):
+        if 'Price' in self.df.columns:
+            self.df['Cleaned_Price'] = self.df['Price'].apply(lambda x: self.clean_price(str(x)))
+        else:
+            self.df['Cleaned_Price'] = None
+
+        if 'Technical Details' in self.df.columns:
+            tech = self.df['Technical Details'].apply(lambda x: re.sub(r'\s+', ' ', str(x)).strip())
+            tech = tech.apply(lambda x: re.sub(r'(Quick Overview|Key Features)', '', x, flags=re.IGNORECASE))
+            tech = tech.apply(lambda x: re.sub(r'(?i)View More Info', '', x))
+            tech = tech.apply(lambda x: re.sub(r'(?i)Licensed Application - No', '', x))
+            self.df['Cleaned_Tech_Details'] = tech
+        else:
+            self.df['Cleaned_Tech_Details'] = ""
+
+        if 'Description' in self.df.columns:
+            self.df['Cleaned_Description'] = self.df['Description'].apply(self.clean_description)
+        else:
+            self.df['Cleaned_Description'] = ""
+        return self.df
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Compare the original DataCleaner with the per-row and vectorized paths.")
+    parser.add_argument("--rows", type=int, default=100000, help="Catalog size, built by repeating the raw crawl data.")
+    parser.add_argument("--data-folder", default="data/raw")
+    parser.add_argument("--synthetic", action="store_true", help="Use a synthetic catalog instead of the crawl data.")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    if args.synthetic:
+        df = synthetic_catalog(args.rows)
+    else:
+        raw_df = DataIngestor(args.data_folder).load_data()
+        repeats = -(-args.rows // len(raw_df))
+        df = pd.concat([raw_df] * repeats, ignore_index=True).iloc[:args.rows]
+
+    strategies = {
+        "Original": lambda: OriginalDataCleaner(df).clean_data(),
+        "Per-row": lambda: DataCleaner(df).clean_data(vectorized=False, verbose=False),
+        "Vectorized": lambda: DataCleaner(df).clean_data(vectorized=True, verbose=False),
+    }
+    results, seconds = {}, {}
+    for name, clean in strategies.items():
+        start = time.perf_counter()
+        results[name] = clean()
+        seconds[name] = time.perf_counter() - start
+
+    # Both paths must reproduce the original output byte for byte
+    original = results["Original"]
+    for name in ["Per-row", "Vectorized"]:
+        pd.testing.assert_frame_equal(original, results[name], check_exact=True)
+        for col in ["Cleaned_Tech_Details", "Cleaned_Description"]:
+            assert (original[col].str.encode("utf-8") == results[name][col].str.encode("utf-8")).all(), (name, col)
+
+    print(f"Rows:        {len(df)}")
+    for name, elapsed in seconds.items():
+        print(f"{name + ':':<12} {elapsed:.2f}s ({len(df) / elapsed:,.0f} rows/s, {seconds['Original'] / elapsed:.2f}x)")
+    print("Output identical to the original")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+import argparse
+import os
+import re
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules import feature_extractor as fe
+from modules.data_cleaner import DataCleaner
+from modules.data_ingestor import DataIngestor
+
+# Single-pass candidates, kept here so the choice of extract_tech_features can be re-measured.
+# Every field pattern starts with its keyword, so its first match starts at a keyword position.
+FIELD_RES = {
+    "ryans_processor": fe.RYANS_PROCESSOR_RE,
+    "processor": fe.PROCESSOR_RE,
+    "ram": fe.RAM_RE,
+    "storage": fe.STORAGE_RE,
+    "ryans_display": fe.RYANS_DISPLAY_RE,
+    "display": fe.DISPLAY_RE,
+}
+# One compiled alternation; the branches are lookaheads so one field's capture never consumes
+# another field's text, and the leading class lets the scanner skip most positions
+FUSED_RE = re.compile(
+    "(?=[PRSDprsd])(?:" + "|".join(f"(?=(?P<{name}>{pattern.pattern}))" for name, pattern in FIELD_RES.items()) + ")",
+    re.IGNORECASE,
+)
+FUSED_VALUE_GROUPS = {name: index + 1 for name, index in FUSED_RE.groupindex.items()}
+# Key/value tokenizer: one scan for the keywords, then each field pattern anchored at its keyword
+KEYWORD_RE = re.compile(r"processor|ram|storage|display", re.IGNORECASE)
+KEYWORD_FIELDS = {
+    "p": ["ryans_processor", "processor"],
+    "r": ["ram"],
+    "s": ["storage"],
+    "d": ["ryans_display", "display"],
+}
+
+
+def assemble(text, found):
+    """
+    (processor, ram, storage, display) from the first match of every field, as extract_tech_features.
+    """
+    processor = found.get("ryans_processor" if "Processor Type" in text else "processor")
+    ram = found["ram"] + "GB" if "ram" in found else None
+    storage = fe.STORAGE_TAIL_RE.split(found["storage"])[0].strip() if "storage" in found else None
+    display = None
+    if "Display Size" in text:
+        if "ryans_display" in found:
+            display = found["ryans_display"] + " inch"
+    elif "display" in found:
+        display = fe.DISPLAY_TAIL_RE.split(found["display"])[0].strip()
+    return processor, ram, storage, display
+
+def extract_fused(text):
+    text = str(text)
+    found = {}
+    for m in FUSED_RE.finditer(text):
+        if m.lastgroup not in found:
+            found[m.lastgroup] = m.group(FUSED_VALUE_GROUPS[m.lastgroup]).strip()
+    return assemble(text, found)
+
+def extract_tokenized(text):
+    text = str(text)
+    found = {}
+    for m in KEYWORD_RE.finditer(text):
+        starts = [(m.start(), KEYWORD_FIELDS[text[m.start()].lower()])]
+        if m.end() - m.start() == 9:
+            # "ProcessoRAM": the last letter of processor can also start RAM
+            starts.append((m.end() - 1, ["ram"]))
+        for start, names in starts:
+            for name in names:
+                if name not in found:
+                    field = FIELD_RES[name].match(text, start)
+                    if field:
+                        found[name] = field.group(1).strip()
+    return assemble(text, found)
+
+def extract_methods(extractor, text):
+    """
+    The four FeatureExtractor.extract_* calls per row that extract_tech_features replaced.
+    """
+    return extractor.extract_processor(text), extractor.extract_ram(text), extractor.extract_storage(text), extractor.extract_display(text)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Compare the per-field searches of extract_tech_features with single-pass scans.")
+    parser.add_argument("--rows", type=int, default=100000, help="Rows, built by repeating the cleaned crawl data.")
+    parser.add_argument("--data-folder", default="data/raw")
+    parser.add_argument("--repeat", type=int, default=3, help="Best of this many timings per strategy.")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    cleaned = DataCleaner(DataIngestor(args.data_folder).load_data()).clean_data(verbose=False)
+    texts = cleaned["Cleaned_Tech_Details"].tolist()
+    texts = (texts * -(-args.rows // len(texts)))[:args.rows]
+
+    extractor = fe.FeatureExtractor(pd.DataFrame())
+    strategies = {
+        "4 extract_* calls": lambda text: extract_methods(extractor, text),
+        "per-field searches": fe.extract_tech_features,
+        "fused alternation": extract_fused,
+        "keyword tokenizer": extract_tokenized,
+    }
+    results = {}
+    print(f"Rows: {len(texts)}")
+    for name, extract in strategies.items():
+        seconds = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            results[name] = [extract(text) for text in texts]
+            seconds = min(seconds, time.perf_counter() - start)
+        print(f"{name + ':':<21} {seconds:.2f}s ({len(texts) / seconds:,.0f} rows/s)")
+
+    # Every strategy must reproduce the per-method output exactly
+    baseline = results["4 extract_* calls"]
+    for name, rows in results.items():
+        assert rows == baseline, name
+    print("Output identical for all strategies")
+
+if __name__ == "__main__":
+    main()
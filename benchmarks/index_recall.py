@@ -0,0 +1,92 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.vector_index import INDEX_BACKENDS, build_index, normalize_rows
+
+DEFAULT_BACKENDS = ["exact", "ivf", "int8", "binary"]
+
+
+def clustered_embeddings(rows, dimension=384, clusters=1000, spread=1.0, seed=0):
+    """
+    Normalized embeddings grouped around random topic directions, like sentence embeddings of
+    similar product listings (a uniformly random matrix has no meaningful nearest neighbours).
+    """
+    rng = np.random.default_rng(seed)
+    centers = normalize_rows(rng.standard_normal((clusters, dimension)))
+    assignments = rng.integers(0, clusters, rows)
+    embeddings = np.empty((rows, dimension), dtype=np.float32)
+    for start in range(0, rows, 65536):
+        part = assignments[start:start + 65536]
+        noise = rng.standard_normal((len(part), dimension)).astype(np.float32) * (spread / np.sqrt(dimension))
+        embeddings[start:start + len(part)] = normalize_rows(centers[part] + noise)
+    return embeddings
+
+def make_queries(embeddings, count, noise=0.5, seed=1):
+    """
+    Queries near stored laptops: random rows plus noise of the given norm.
+    """
+    rng = np.random.default_rng(seed)
+    rows = np.asarray(embeddings[rng.integers(0, len(embeddings), count)], dtype=np.float32)
+    directions = normalize_rows(rng.standard_normal(rows.shape))
+    return normalize_rows(rows + noise * directions)
+
+def recall_at_k(indices, exact_indices):
+    """
+    Share of the exact top k found by the approximate search, averaged over queries.
+    """
+    k = exact_indices.shape[1]
+    return float(np.mean([len(np.intersect1d(found, exact)) / k for found, exact in zip(indices, exact_indices)]))
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Recall@k, latency and index size of the search backends.")
+    parser.add_argument("--index-dir", help="Use a saved embedding index instead of synthetic embeddings.")
+    parser.add_argument("--rows", type=int, default=100000, help="Synthetic embeddings to generate.")
+    parser.add_argument("--backends", nargs="+", default=DEFAULT_BACKENDS, choices=list(INDEX_BACKENDS))
+    parser.add_argument("--rescore", type=int, nargs="+", help="Rescore factors to try for int8/binary (default: built-in).")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    if args.index_dir:
+        from modules.embedding_store import load_embedding_index
+
+        embeddings, _, _ = load_embedding_index(args.index_dir)
+    else:
+        embeddings = clustered_embeddings(args.rows)
+    queries = make_queries(embeddings, args.queries)
+    exact_indices, _ = build_index(embeddings, "exact").search(queries, args.k)
+
+    print(f"{len(embeddings)} x {embeddings.shape[1]} embeddings, {args.queries} queries, k={args.k}")
+    print(f"{'backend':<18} {'build s':>8} {'index MB':>9} {'ms/query':>9} {'batch ms/q':>11} {'recall@k':>9}")
+    for backend in args.backends:
+        settings = [{"rescore": r} for r in args.rescore] if args.rescore and backend in ("int8", "binary") else [{}]
+        for params in settings:
+            start = time.perf_counter()
+            index = build_index(embeddings, backend, **params)
+            build_seconds = time.perf_counter() - start
+
+            latencies = []
+            indices = []
+            for query in queries:
+                start = time.perf_counter()
+                found, _ = index.search(query[np.newaxis, :], args.k)
+                latencies.append(time.perf_counter() - start)
+                indices.append(found[0])
+            start = time.perf_counter()
+            index.search(queries, args.k)
+            batch_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+            label = backend + "".join(f" {key}={value}" for key, value in index.params().items() if key != "n_lists")
+            print(f"{label:<18} {build_seconds:>8.2f} {index.nbytes() / 1e6:>9.1f} {np.median(latencies) * 1000:>9.2f} "
+                  f"{batch_ms:>11.2f} {recall_at_k(np.array(indices), exact_indices):>9.3f}")
+
+if __name__ == "__main__":
+    main()
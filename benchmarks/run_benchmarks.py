@@ -0,0 +1,300 @@
+import argparse
+import contextlib
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("TQDM_DISABLE", "1")
+
+from modules.io_utils import read_table, write_table
+
+STAGES = ["clean", "extract", "embed", "query", "swot"]
+TEXT_COLS = ["Product Name", "Cleaned_Tech_Details", "Cleaned_Description"]
+QUERY_TEMPLATES = [
+    "{use} laptop with {ram}GB RAM under {price}k",
+    "{brand} laptop for {use} with {storage} SSD",
+    "{display} inch {brand} laptop between {low}k and {price}k",
+    "best {use} laptop",
+]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the pipeline stages on a synthetic catalog, offline (stub embedding model, fake LLM)."
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="Catalog sizes to benchmark (e.g. 1000 10000 100000 1000000).")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES)
+    parser.add_argument("--output", default="benchmarks/results/latest.json")
+    parser.add_argument("--baseline", default="benchmarks/results/baseline.json",
+                        help="Earlier results to compare against, if the file exists.")
+    parser.add_argument("--save-baseline", action="store_true", help="Also save these results as the new baseline.")
+    parser.add_argument("--batch-rows", type=int, default=1000, help="Rows per timed batch for clean/extract/embed/swot.")
+    parser.add_argument("--queries", type=int, default=200, help="Queries timed by the query stage.")
+    parser.add_argument("--swot-rows", type=int, default=5000, help="At most this many rows go through the swot stage.")
+    parser.add_argument("--swot-workers", type=int, default=4)
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Seconds per fake LLM call.")
+    parser.add_argument("--embed-workers", type=int, default=0,
+                        help="Embed stage: encode with a BulkEncoder pool of this many processes (0: in-process model.encode).")
+    parser.add_argument("--index-backend", default="exact", choices=["exact", "ivf", "int8", "binary"],
+                        help="Search backend for the query stage.")
+    parser.add_argument("--model", default="stub", help="'stub' (offline) or a sentence-transformers model name.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--work-dir", help="Keep the generated catalogs here and reuse them across runs.")
+    parser.add_argument("--child", choices=["prepare"] + STAGES, help=argparse.SUPPRESS)
+    parser.add_argument("--result-file", help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+def peak_rss_mb():
+    # ru_maxrss is in kilobytes on Linux
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+def model_name(args):
+    return "stub-minilm" if args.model == "stub" else args.model
+
+def make_queries(count, seed):
+    rng = np.random.default_rng(seed)
+    queries = []
+    for i in range(count):
+        price = int(rng.integers(40, 250))
+        queries.append(QUERY_TEMPLATES[i % len(QUERY_TEMPLATES)].format(
+            use=rng.choice(["gaming", "student", "office", "programming", "video editing"]),
+            ram=rng.choice([8, 16, 32]),
+            brand=rng.choice(["Asus", "Lenovo", "HP", "Dell", "Acer"]),
+            storage=rng.choice(["512GB", "1TB"]),
+            display=rng.choice([14, 15.6, 16]),
+            low=price - 20,
+            price=price,
+        ) + f" #{i}")  # every query distinct, so none is answered from a cache
+    return queries
+
+def prepare(args, size_dir, rows):
+    """
+    Generate the catalog and the inputs of every requested stage (untimed).
+    """
+    from synthetic_catalog import synthetic_catalog
+
+    from modules.data_cleaner import DataCleaner
+    from modules.feature_extractor import FeatureExtractor
+
+    raw = synthetic_catalog(rows, seed=args.seed)
+    write_table(raw, os.path.join(size_dir, "raw.parquet"))
+    cleaned = DataCleaner(raw).clean_data()
+    write_table(cleaned, os.path.join(size_dir, "cleaned.parquet"))
+    features = FeatureExtractor(cleaned).extract_features()
+    write_table(features, os.path.join(size_dir, "features.parquet"))
+
+    if "query" in args.stages:
+        from modules.laptop_recommender import LaptopRecommender
+
+        recommender = LaptopRecommender(model_name(args))
+        features = recommender.generate_embeddings(features, text_cols=TEXT_COLS)
+        config_file = os.path.join(size_dir, "config.json")
+        recommender.save_embeddings(features, os.path.join(size_dir, "index"), config_file)
+        with open(config_file, "r") as f:
+            config = json.load(f)
+        config["query_cache_size"] = 0
+        with open(config_file, "w") as f:
+            json.dump(config, f, indent=4)
+
+def run_stage(args, size_dir, stage):
+    """
+    Time one stage over its input in batches (one query at a time for the query stage).
+    :return: (items, unit, batch size, per-batch latencies in seconds, setup seconds)
+    """
+    start = time.perf_counter()
+    if stage == "query":
+        from modules.laptop_recommender import LaptopRecommender
+        from modules.query_processor import QueryProcessor
+
+        config_file = os.path.join(size_dir, "config.json")
+        with open(config_file, "r") as f:
+            backend = json.load(f).get("index", {}).get("backend")
+        if backend != args.index_backend:
+            LaptopRecommender.build_search_index(os.path.join(size_dir, "index"), config_file, {"backend": args.index_backend})
+        processor = QueryProcessor(model_name=model_name(args), config_path=config_file)
+        batches = make_queries(args.queries, args.seed)
+        run, unit, batch_size = processor.get_similar_laptops, "queries", 1
+    else:
+        df = read_table(os.path.join(size_dir, {"clean": "raw", "extract": "cleaned"}.get(stage, "features") + ".parquet"))
+        if stage == "clean":
+            from modules.data_cleaner import DataCleaner
+
+            run = lambda batch: DataCleaner(batch).clean_data()
+        elif stage == "extract":
+            from modules.feature_extractor import FeatureExtractor
+
+            run = lambda batch: FeatureExtractor(batch).extract_features()
+        elif stage == "embed":
+            from modules.laptop_recommender import LaptopRecommender
+
+            recommender = LaptopRecommender(model_name(args), workers=args.embed_workers)
+            if recommender.encoder is not None:
+                recommender.encoder.start()
+            run = lambda batch: recommender.generate_embeddings(batch.copy(), text_cols=TEXT_COLS)
+        else:
+            from stubs import FakeLLMClient
+            from swot_generator import SWOTAnalyzer
+
+            df = df.iloc[:args.swot_rows]
+            analyzer = SWOTAnalyzer(client=FakeLLMClient(latency=args.llm_latency, seed=args.seed),
+                                    requests_per_minute=1e9, max_workers=args.swot_workers)
+            run = lambda batch: analyzer.generate_swot_for_all(batch.copy())
+        batches = [df.iloc[i:i + args.batch_rows] for i in range(0, len(df), args.batch_rows)]
+        unit, batch_size = "rows", args.batch_rows
+    setup_seconds = time.perf_counter() - start
+
+    latencies = []
+    for batch in batches:
+        start = time.perf_counter()
+        run(batch)
+        latencies.append(time.perf_counter() - start)
+    items = len(batches) if stage == "query" else sum(len(batch) for batch in batches)
+    return items, unit, batch_size, np.array(latencies), setup_seconds
+
+def child(args):
+    rows = args.sizes[0]
+    size_dir = os.path.join(args.work_dir, f"rows_{rows}")
+    if args.model == "stub":
+        from stubs import use_stub_model
+
+        use_stub_model()
+
+    # The stages print progress; only the result file matters here
+    with contextlib.redirect_stdout(open(os.devnull, "w")):
+        if args.child == "prepare":
+            os.makedirs(size_dir, exist_ok=True)
+            prepare(args, size_dir, rows)
+            return
+        setup_rss = peak_rss_mb()
+        items, unit, batch_size, latencies, setup_seconds = run_stage(args, size_dir, args.child)
+
+    seconds = float(latencies.sum())
+    result = {
+        "stage": args.child,
+        "rows": rows,
+        "items": items,
+        "unit": unit,
+        "batch_size": batch_size,
+        "seconds": round(seconds, 4),
+        "throughput": round(items / seconds, 1) if seconds else None,
+        "latency_ms": {
+            f"p{q}": round(float(np.percentile(latencies, q)) * 1000, 3) for q in (50, 95, 99)
+        } | {"max": round(float(latencies.max()) * 1000, 3)},
+        "setup_seconds": round(setup_seconds, 3),
+        "setup_peak_rss_mb": setup_rss,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+    with open(args.result_file, "w") as f:
+        json.dump(result, f)
+
+def spawn(args, mode, rows, work_dir, result_file=None):
+    """
+    Run a stage in a fresh interpreter, so its peak RSS is its own.
+    """
+    command = [
+        sys.executable, os.path.abspath(__file__), "--child", mode, "--sizes", str(rows), "--work-dir", work_dir,
+        "--stages", *args.stages, "--batch-rows", str(args.batch_rows), "--queries", str(args.queries),
+        "--swot-rows", str(args.swot_rows), "--swot-workers", str(args.swot_workers),
+        "--llm-latency", str(args.llm_latency), "--embed-workers", str(args.embed_workers),
+        "--index-backend", args.index_backend, "--model", args.model,
+        "--seed", str(args.seed),
+    ]
+    if result_file:
+        command += ["--result-file", result_file]
+    completed = subprocess.run(command, capture_output=True, text=True)
+    if completed.returncode != 0:
+        print(f"❌ [Benchmark] {mode} at {rows} rows failed:\n{completed.stderr[-2000:]}")
+        return None
+    if result_file:
+        with open(result_file, "r") as f:
+            return json.load(f)
+    return {}
+
+def compare(results, baseline):
+    """
+    Print throughput, p95 latency and peak RSS next to the baseline (change in %).
+    """
+    previous = {(r["stage"], r["rows"]): r for r in baseline.get("results", [])}
+
+    def change(new, old):
+        return f"{100 * (new - old) / old:+.1f}%" if old else "n/a"
+
+    print(f"\n{'stage':<8} {'rows':>8} {'throughput':>14} {'':>8} {'p95 ms':>10} {'':>8} {'peak MB':>9} {'':>8}")
+    for result in results:
+        old = previous.get((result["stage"], result["rows"]))
+        cells = [f"{result['throughput']:>14,.1f}", f"{result['latency_ms']['p95']:>10.2f}", f"{result['peak_rss_mb']:>9.1f}"]
+        if old:
+            cells[0] += f" {change(result['throughput'], old['throughput']):>8}"
+            cells[1] += f" {change(result['latency_ms']['p95'], old['latency_ms']['p95']):>8}"
+            cells[2] += f" {change(result['peak_rss_mb'], old['peak_rss_mb']):>8}"
+        else:
+            cells = [cell + " " * 9 for cell in cells]
+        print(f"{result['stage']:<8} {result['rows']:>8} " + " ".join(cells))
+
+def save_json(data, path):
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(data, f, indent=4)
+
+def main():
+    args = parse_args()
+    if args.child:
+        child(args)
+        return
+
+    work_dir = args.work_dir or tempfile.mkdtemp(prefix="laptop-bench-")
+    results = []
+    try:
+        for rows in args.sizes:
+            size_dir = os.path.join(work_dir, f"rows_{rows}")
+            if not os.path.exists(os.path.join(size_dir, "features.parquet")) or (
+                    "query" in args.stages and not os.path.exists(os.path.join(size_dir, "config.json"))):
+                print(f"[Benchmark] Generating a {rows}-row synthetic catalog...")
+                if spawn(args, "prepare", rows, work_dir) is None:
+                    continue
+            for stage in args.stages:
+                result = spawn(args, stage, rows, work_dir, os.path.join(work_dir, f"result_{stage}_{rows}.json"))
+                if result is None:
+                    continue
+                results.append(result)
+                print(f"✅ [Benchmark] {stage:<8} {rows:>8} rows: {result['throughput']:,.1f} {result['unit']}/s, "
+                      f"p95 {result['latency_ms']['p95']:.2f} ms per {result['batch_size']}, peak RSS {result['peak_rss_mb']} MB")
+    finally:
+        if not args.work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    report = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "model": model_name(args),
+        "settings": {key: getattr(args, key) for key in
+                     ("batch_rows", "queries", "swot_rows", "swot_workers", "llm_latency", "embed_workers", "index_backend", "seed")},
+        "results": results,
+    }
+    save_json(report, args.output)
+    print(f"✅ Results saved to {args.output}")
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+    compare(results, baseline)
+    if args.save_baseline:
+        save_json(report, args.baseline)
+        print(f"✅ Baseline saved to {args.baseline}")
+
+if __name__ == "__main__":
+    main()
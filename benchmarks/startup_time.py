@@ -0,0 +1,59 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Commands that must not import pandas, pyarrow or torch, with their budget in milliseconds
+FAST_COMMANDS = {
+    "cli --help": ["cli.py", "--help"],
+    "cli recommend --help": ["cli.py", "recommend", "--help"],
+    "cli info": ["cli.py", "info"],
+}
+HEAVY_MODULES = ("pandas", "pyarrow", "torch", "sentence_transformers")
+
+
+def wall_time_ms(command, repeat):
+    """
+    Median wall time of running the command in a fresh interpreter (includes interpreter startup).
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable] + command, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+def heavy_imports(command):
+    """
+    Heavy modules imported by the command, from `python -X importtime`.
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime"] + command, cwd=ROOT,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    imported = {line.rsplit("|", 1)[-1].strip() for line in result.stderr.splitlines() if line.startswith("import time:")}
+    return sorted(module for module in HEAVY_MODULES if module in imported)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Measure the startup time of the CLI commands that need no model.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=300, help="Fail if a command's median wall time exceeds this.")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    baseline = wall_time_ms(["-c", "pass"], args.repeat)
+    print(f"Interpreter startup: {baseline:.0f} ms")
+    failed = False
+    for name, command in FAST_COMMANDS.items():
+        ms = wall_time_ms(command, args.repeat)
+        heavy = heavy_imports(command)
+        ok = ms <= args.budget_ms and not heavy
+        failed |= not ok
+        print(f"{'✅' if ok else '❌'} {name}: {ms:.0f} ms" + (f" (imports {', '.join(heavy)})" if heavy else ""))
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import functools
+import random
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+
+class StubSentenceTransformer:
+    def __init__(self, model_name="stub-minilm", dimension=384, seed=0):
+        """
+        Offline stand-in for SentenceTransformer with the same encode() interface.
+        Each text is hashed and mapped to the sum of a few rows of a fixed random table, so
+        identical texts get identical vectors and throughput reflects everything around the model.
+        """
+        self.model_name = model_name
+        self.dimension = dimension
+        self.table = np.random.default_rng(seed).standard_normal((4096, dimension)).astype(np.float32)
+
+    def get_sentence_embedding_dimension(self):
+        return self.dimension
+
+    def encode(self, sentences, batch_size=32, convert_to_numpy=True, normalize_embeddings=False, **kwargs):
+        single = isinstance(sentences, str)
+        texts = pd.Series([sentences] if single else list(sentences), dtype=object)
+        embeddings = np.empty((len(texts), self.dimension), dtype=np.float32)
+        for start in range(0, len(texts), max(batch_size, 1024)):
+            hashes = pd.util.hash_pandas_object(texts.iloc[start:start + max(batch_size, 1024)], index=False).to_numpy()
+            rows = (hashes[:, None] >> np.array([0, 12, 24, 36, 48], dtype=np.uint64)) & np.uint64(4095)
+            embeddings[start:start + len(hashes)] = self.table[rows.astype(np.int64)].sum(axis=1)
+        if normalize_embeddings:
+            embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+        return embeddings[0] if single else embeddings
+
+
+def use_stub_model(dimension=384):
+    """
+    Make LaptopRecommender and QueryProcessor load StubSentenceTransformer instead of downloading a model.
+    """
+    import modules.embedding_model
+
+    # A partial of a module-level class can be pickled, so BulkEncoder worker processes load the stub too
+    modules.embedding_model.SentenceTransformer = functools.partial(StubSentenceTransformer, dimension=dimension)
+    modules.embedding_model.clear_models()
+
+
+class FakeAPIError(Exception):
+    def __init__(self, code):
+        super().__init__(f"HTTP {code}")
+        self.code = code
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeLLMClient:
+    def __init__(self, latency=0.0, fail_rate=0.0, seed=0):
+        """
+        Offline stand-in for a Gemini GenerativeModel.
+        :param latency: Seconds each call takes (simulated network and generation time).
+        :param fail_rate: Share of calls failing with a retryable 429/503 error.
+        """
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.calls = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def generate_content(self, prompt):
+        with self._lock:
+            self.calls += 1
+            fail = self._random.random() < self.fail_rate
+        if self.latency:
+            time.sleep(self.latency)
+        if fail:
+            raise FakeAPIError(self._random.choice([429, 503]))
+        return FakeResponse(
+            "**Strengths:** Fast SSD, good display\n**Weaknesses:** Average battery\n"
+            "**Opportunities:** Student market\n**Threats:** Cheaper competitors"
+        )
@@ -0,0 +1,169 @@
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.data_ingestor import RAW_COLUMNS
+
+BANGLA_DIGITS = str.maketrans("0123456789", "০১২৩৪৫৬৭৮৯")
+
+# (brand, series, model codes)
+MODELS = [
+    ("Acer", "Aspire 3", ["A315-59", "A315-510P", "A315-44P"]),
+    ("Acer", "Aspire Lite", ["AL15-41", "AL15-52"]),
+    ("Asus", "VivoBook Go 15", ["E1504FA", "E1504GA"]),
+    ("Asus", "VivoBook 15", ["X1504VA", "X1502ZA"]),
+    ("Asus", "TUF Gaming F15", ["FX507ZC4", "FX506HF"]),
+    ("Dell", "Inspiron 15", ["3520", "3530"]),
+    ("Dell", "Vostro 14", ["3420", "3430"]),
+    ("HP", "Victus 15", ["fa1091TX", "fb0147AX"]),
+    ("HP", "15s", ["fq5786TU", "fd0292TU"]),
+    ("Lenovo", "IdeaPad Slim 3i", ["15IRH8", "15IAH8"]),
+    ("Lenovo", "IdeaPad 1", ["15AMN7", "15IGL7"]),
+    ("Lenovo", "LOQ", ["15IRH8", "15APH8"]),
+    ("MSI", "Modern 14", ["C12MO", "C13M"]),
+    ("Walton", "Passion", ["BX310U", "BX510U"]),
+]
+# (Ryans processor type, Ryans generation, full CPU name, Star Tech cache/clock details)
+CPUS = [
+    ("Core i3", "12th (Intel)", "Intel Core i3 1215U", "10MB Cache, up to 4.40 GHz"),
+    ("Core i5", "12th (Intel)", "Intel Core i5 1235U", "12MB Cache, up to 4.40 GHz"),
+    ("Core i5", "13th (Intel)", "Intel Core i5 13420H", "12MB Cache, up to 4.60 GHz"),
+    ("Core i7", "13th (Intel)", "Intel Core i7 13620H", "24MB Cache, up to 4.90 GHz"),
+    ("Ryzen 3", "Ryzen", "AMD Ryzen 3 7320U", "4MB L3 Cache, up to 4.1 GHz"),
+    ("Ryzen 5", "Ryzen", "AMD Ryzen 5 7520U", "4MB L3 Cache, up to 4.3 GHz"),
+    ("Ryzen 7", "Ryzen", "AMD Ryzen 7 7735HS", "16MB L3 Cache, up to 4.75 GHz"),
+    ("Celeron", "Celeron", "Intel Celeron N4020", "4MB Cache, up to 2.80 GHz"),
+]
+RAM_GB = [4, 8, 16, 32]
+STORAGE = ["256GB", "512GB", "1TB"]
+DISPLAYS = ["13.3", "14", "15.6", "16"]
+COLORS = ["Pure Silver", "Steel Gray", "Arctic Grey", "Mixed Black", "Platinum Silver", "Moonstone Purple"]
+SENTENCES = [
+    "It is built for everyday productivity, online classes and entertainment.",
+    "The processor delivers smooth multitasking for office work, browsing and streaming.",
+    "Its Full HD display offers sharp visuals and vibrant colors for work and play.",
+    "The fast SSD ensures quick boot-ups, file transfers and improved responsiveness.",
+    "A slim and lightweight chassis makes it easy to carry between home, office and campus.",
+    "Wi-Fi 6 and Bluetooth 5.1 keep you connected with fast and stable wireless networking.",
+    "The backlit keyboard and precision touchpad make long typing sessions comfortable.",
+    "Integrated graphics handle light gaming, photo editing and HD video playback.",
+    "The battery lasts up to 8 hours on a single charge for a full day of work.",
+    "এই ল্যাপটপের দাম ৬৫,০০০ টাকা থেকে শুরু এবং ২ বছরের ওয়ারেন্টি রয়েছে।",
+    "The dual speakers with audio enhancement deliver clear sound for calls and movies.",
+    "USB Type-C, HDMI and USB-A ports let you connect displays, storage and accessories.",
+]
+
+
+def _pick(rng, options, rows):
+    return np.asarray(options, dtype=object)[rng.integers(0, len(options), rows)]
+
+
+def _join(*parts):
+    """
+    Concatenate string columns (pd.Series or scalars) element-wise.
+    """
+    result = parts[0]
+    for part in parts[1:]:
+        result = result + part
+    return result
+
+
+def synthetic_catalog(rows, seed=0, sentences=6, ryans_share=0.4):
+    """
+    Raw laptop records shaped like the Ryans and Star Tech crawler output (URL, Product Name,
+    Price, Technical Details, Description), with the same boilerplate the cleaner removes:
+    "Quick Overview" / "Key Features" headers, "View More Info", "Licensed Application - No",
+    intro lines, promotional sentences, HTML tags and "Buying Guide" / "Why Choose" tails.
+    Star Tech prices include "৳" price pairs, "To be announced" and Bangla numerals.
+    Built with vectorized string ops, so 1M rows take seconds rather than minutes.
+    :param sentences: Filler sentences per description (the crawled descriptions average ~2.8k chars, ~25 sentences).
+    """
+    rng = np.random.default_rng(seed)
+    ids = pd.Series(np.arange(rows)).astype(str)
+    model = rng.integers(0, len(MODELS), rows)
+    brand = pd.Series([m[0] for m in MODELS], dtype=object)[model].reset_index(drop=True)
+    series = pd.Series([m[1] for m in MODELS], dtype=object)[model].reset_index(drop=True)
+    codes = pd.Series([m[2] for m in MODELS], dtype=object)[model].reset_index(drop=True)
+    code = pd.Series([c[i % len(c)] for c, i in zip(codes, rng.integers(0, 6, rows))], dtype=object)
+    cpu = rng.integers(0, len(CPUS), rows)
+    cpu_type = pd.Series([c[0] for c in CPUS], dtype=object)[cpu].reset_index(drop=True)
+    cpu_gen = pd.Series([c[1] for c in CPUS], dtype=object)[cpu].reset_index(drop=True)
+    cpu_name = pd.Series([c[2] for c in CPUS], dtype=object)[cpu].reset_index(drop=True)
+    cpu_details = pd.Series([c[3] for c in CPUS], dtype=object)[cpu].reset_index(drop=True)
+    ram = pd.Series(_pick(rng, RAM_GB, rows)).astype(str)
+    storage = pd.Series(_pick(rng, STORAGE, rows))
+    display = pd.Series(_pick(rng, DISPLAYS, rows))
+    color = pd.Series(_pick(rng, COLORS, rows))
+    price = pd.Series((rng.integers(250, 3000, rows) * 100)).astype(np.int64)
+
+    model_name = _join(brand, " ", series, " ", code)
+    body = _join(*[_join(" ", pd.Series(_pick(rng, SENTENCES, rows))) for _ in range(sentences)])
+    is_ryans = rng.random(rows) < ryans_share
+
+    ryans = pd.DataFrame({
+        "URL": _join("https://www.ryans.com/", model_name.str.lower().str.replace(" ", "-"), "-", ids),
+        "Product Name": _join(model_name, " ", cpu_name, " ", ram, "GB RAM, ", storage, " SSD ", display,
+                              " Inch FHD Display ", color, " Laptop"),
+        "Price": price.astype(str) + ".0",
+        "Technical Details": _join("Quick Overview\nProcessor Type. - ", cpu_type, "\nGeneration - ", cpu_gen,
+                                   "\nRAM - ", ram, "GB\nStorage - ", storage, " SSD\nGraphics Memory - Shared",
+                                   "\nDisplay Size (Inch) - ", display, "\nLicensed Application - No"),
+        "Description": _join("Features of ", model_name, " Laptop In Bangladesh\n", "The ", model_name, " comes with ",
+                             cpu_name, ", ", ram, "GB RAM and ", storage, " SSD.", body,
+                             " You can buy ", model_name, " from our website or visit our showrooms nearby."),
+    })
+
+    # Star Tech: "125,000৳128,000৳" (price and regular price), some unannounced and some in Bangla numerals
+    formatted = price.map("{:,}".format)
+    regular = (price + rng.integers(0, 40, rows) * 100).map("{:,}".format)
+    startech_price = _join(formatted, "৳")
+    has_regular = rng.random(rows) < 0.3
+    startech_price[has_regular] = _join(formatted, "৳", regular, "৳")[has_regular]
+    bangla = rng.random(rows) < 0.1
+    startech_price[bangla] = startech_price[bangla].str.translate(BANGLA_DIGITS)
+    startech_price[rng.random(rows) < 0.1] = "To be announced"
+    startech_name = _join(model_name, " ", cpu_name, " ", display, '" FHD Laptop')
+    tail = pd.Series(np.where(rng.random(rows) < 0.5, " Buying Guide: compare warranty and after-sales service.",
+                              " Why Choose Star Tech? Nationwide delivery and EMI."), dtype=object)
+    startech = pd.DataFrame({
+        "URL": _join("https://www.startech.com.bd/", startech_name.str.lower().str.replace(r'[^a-z0-9]+', '-', regex=True), ids),
+        "Product Name": startech_name,
+        "Price": startech_price,
+        "Technical Details": _join("Key Features\nModel: ", series, " ", code, "\nProcessor: ", cpu_name, " (", cpu_details,
+                                   ")\nRAM: ", ram, "GB DDR4, Storage: ", storage, " M.2 NVMe SSD\nDisplay: ", display,
+                                   '" FHD (1920x1080) IPS\nView More Info'),
+        "Description": _join("Description\n<p>", startech_name, "</p>\n<p>The ", model_name, " is powered by ", cpu_name,
+                             " with ", ram, "GB of DDR4 memory and a ", storage, " NVMe SSD.", body,
+                             "</p> Buy ", startech_name, " Laptop From Star Tech.",
+                             " Order Online Or Visit your Nearest Star Tech Shop to get yours at lowest price.", tail),
+    })
+
+    df = startech.where(pd.DataFrame({col: ~is_ryans for col in RAW_COLUMNS}), ryans)
+    return df[RAW_COLUMNS]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Write a synthetic crawl (ryans/startech raw CSVs) for benchmarking.")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--output-folder", default="data/synthetic")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--sentences", type=int, default=6, help="Filler sentences per description.")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    df = synthetic_catalog(args.rows, seed=args.seed, sentences=args.sentences)
+    os.makedirs(args.output_folder, exist_ok=True)
+    is_ryans = df["URL"].str.startswith("https://www.ryans.com/")
+    for retailer, rows in (("ryans", df[is_ryans]), ("startech", df[~is_ryans])):
+        path = os.path.join(args.output_folder, f"{retailer}_laptops_raw.csv")
+        rows.to_csv(path, index=False)
+        print(f"✅ {len(rows)} synthetic {retailer} laptops saved to {path}")
+
+if __name__ == "__main__":
+    main()
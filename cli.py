@@ -0,0 +1,70 @@
+import argparse
+import json
+import os
+
+import data_prepare
+import recommend_laptops
+import save_embeddings
+
+# Only argparse/json/os are imported up front; each command imports pandas, pyarrow or
+# sentence-transformers (torch) itself, so `info` and `--help` start in well under a second.
+COMMANDS = {
+    "prepare": (data_prepare, "Clean the crawled laptop data and extract features."),
+    "embed": (save_embeddings, "Embed the feature-extracted laptops and build the search index."),
+    "recommend": (recommend_laptops, "Laptop recommendations from the saved embedding index (or --serve them)."),
+}
+
+
+def show_info(args):
+    """
+    Print the recommender config and the index manifest, reading only the JSON files.
+    """
+    with open(args.config, "r") as f:
+        config = json.load(f)
+    print(f"Config: {args.config}")
+    if config.get("query"):
+        print(f"  Query: {config['query']}")
+    queries = config.get("queries") or []
+    if queries or config.get("queries_file"):
+        print(f"  Batch queries: {len(queries) or config.get('queries_file')}")
+    print(f"  Search index: {json.dumps(config.get('index', {'backend': 'exact'}))}")
+    if config.get("built_index"):
+        print(f"  Built index: {json.dumps(config['built_index'])}")
+    if config.get("query_cache_file"):
+        cache_file = config["query_cache_file"]
+        size = f"{os.path.getsize(cache_file) / 1024:.1f} KB" if os.path.exists(cache_file) else "not written yet"
+        print(f"  Query cache: {cache_file} ({size})")
+
+    index_dir = config.get("index_dir")
+    if not index_dir:
+        print(f"  Embeddings: {config.get('embedding_file', 'none')} (legacy pickle)")
+        return
+    manifest_path = os.path.join(index_dir, "manifest.json")  # modules.embedding_store.MANIFEST_FILE
+    if not os.path.exists(manifest_path):
+        print(f"⚠️ No embedding index in {index_dir}. Run `python cli.py embed` first.")
+        return
+    with open(manifest_path, "r") as f:
+        manifest = json.load(f)
+    print(f"Index: {index_dir}")
+    print(f"  Model: {manifest['model_name']}")
+    print(f"  Laptops: {manifest['row_count']} x {manifest['dimension']} ({manifest['dtype']})")
+    print(f"  Built: {manifest['created_at']}")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Laptop data preparation, embedding and recommendation.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    for name, (module, description) in COMMANDS.items():
+        module.add_arguments(commands.add_parser(name, help=description, description=description))
+    info = commands.add_parser("info", help="Show the recommender config and index metadata (no model or pandas import).")
+    info.add_argument("--config", default="config/recommender_config.json")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.command == "info":
+        show_info(args)
+    else:
+        COMMANDS[args.command][0].run(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+import argparse
+
+from modules.crawler import ADAPTERS, run_crawl
+from modules.instrumentation import add_metrics_arguments, apply_metrics_arguments
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Crawl laptop listings from the supported retailers.")
+    parser.add_argument("sites", nargs="*", default=list(ADAPTERS), help=f"Retailers to crawl (default: all of {', '.join(ADAPTERS)}).")
+    parser.add_argument("--output-dir", default="data/raw")
+    parser.add_argument("--max-pages", type=int, default=200, help="Safety limit on listing pages per retailer.")
+    parser.add_argument("--base-url", help="Serve listing pages from this host instead, e.g. a local copy of saved pages.")
+    parser.add_argument("--checkpoint", help="Crawl state file used to resume and refresh (default: <output-dir>/crawl_state.sqlite).")
+    parser.add_argument("--no-checkpoint", action="store_true", help="Fetch every page again without saving crawl state.")
+    parser.add_argument("--ttl-hours", type=float, default=24, help="Re-fetch product pages crawled longer ago than this.")
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--per-host-limit", type=int, default=4)
+    parser.add_argument("--requests-per-second", type=float, default=2.0)
+    add_metrics_arguments(parser)
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    apply_metrics_arguments(args)
+    run_crawl(
+        args.sites,
+        output_dir=args.output_dir,
+        base_url=args.base_url,
+        max_pages=args.max_pages,
+        checkpoint_file=False if args.no_checkpoint else args.checkpoint,
+        ttl_hours=args.ttl_hours,
+        max_workers=args.workers,
+        per_host_limit=args.per_host_limit,
+        requests_per_second=args.requests_per_second,
+    )
+
+if __name__ == "__main__":
+    main()
@@ -1,40 +1,110 @@
+import argparse
 import os
 
-import pandas as pd
-from modules.data_cleaner import DataCleaner
-from modules.data_ingestor import DataIngestor
-from modules.feature_extractor import FeatureExtractor
-from tqdm import tqdm
+from modules.instrumentation import add_metrics_arguments, apply_metrics_arguments
 
 
 def ensure_dir(directory):
     if not os.path.exists(directory):
         os.makedirs(directory)
 
-def main():
+def add_arguments(parser):
+    parser.add_argument("--data-folder", default="data/raw")
+    parser.add_argument("--processed-folder", default="data/processed")
+    parser.add_argument("--stream", action="store_true",
+                        help="Process the CSV files in fixed-size chunks into the Parquet datasets "
+                             "data/processed/cleaned/ and features/ (one part per CSV file).")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="Rows per chunk in --stream mode.")
+    parser.add_argument("--files", nargs="+",
+                        help="Only process these CSV files; with --stream their parts are added to (or replaced in) the existing datasets.")
+    parser.add_argument("--excel", action="store_true", help="Also export the cleaned and feature tables as .xlsx for review.")
+    add_metrics_arguments(parser)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Clean the crawled laptop data and extract features.")
+    add_arguments(parser)
+    return parser.parse_args()
+
+def run_streaming(ingestor, processed_folder, chunk_size, append):
+    """
+    Clean and extract features chunk by chunk; peak memory is bounded by chunk_size.
+    Each CSV file gets its own part file in data/processed/cleaned/ and data/processed/features/,
+    replaced when the file is processed again, so re-running --files adds no duplicate rows
+    (a file that is now empty removes its part).
+    save_embeddings.py reads whichever of features/ and feature_extracted.parquet is newer.
+    :param append: Keep the parts of the other CSV files (--files); otherwise the datasets are rewritten.
+    """
+    from tqdm import tqdm
+
+    from modules.data_cleaner import DataCleaner
+    from modules.feature_extractor import FeatureExtractor
+    from modules.io_utils import ParquetAppender, part_path
+
+    cleaned_dir = os.path.join(processed_folder, "cleaned")
+    features_dir = os.path.join(processed_folder, "features")
+    csv_files = ingestor.csv_files()
+    cleaned_rows = features_rows = 0
+
+    with tqdm(desc="Processing chunks") as progress:
+        for i, csv_file in enumerate(csv_files):
+            # The first part clears the datasets unless appending
+            overwrite = not append and i == 0
+            cleaned_path = part_path(cleaned_dir, csv_file, overwrite=overwrite)
+            features_path = part_path(features_dir, csv_file, overwrite=overwrite)
+            with ParquetAppender(cleaned_path) as cleaned_out, ParquetAppender(features_path) as features_out:
+                for chunk in ingestor.iter_file_chunks(csv_file, chunksize=chunk_size):
+                    cleaned_df = DataCleaner(chunk).clean_data(verbose=False)
+                    cleaned_out.write(cleaned_df)
+                    featured_df = FeatureExtractor(cleaned_df).extract_features(verbose=False)
+                    features_out.write(featured_df)
+                    progress.update()
+            cleaned_rows += cleaned_out.rows
+            features_rows += features_out.rows
+
+    print(f"[Main] Cleaned data of {len(csv_files)} CSV file(s) written to {cleaned_dir} ({cleaned_rows} rows)")
+    print(f"[Main] Feature extracted data of {len(csv_files)} CSV file(s) written to {features_dir} ({features_rows} rows)")
+
+def run(args):
+    # Imported here so the unified CLI does not load pandas for other commands
+    from modules.data_cleaner import DataCleaner
+    from modules.data_ingestor import DataIngestor
+    from modules.feature_extractor import FeatureExtractor
+    from modules.io_utils import write_table
+
+    apply_metrics_arguments(args)
+
     # 1. Data Ingestion from CSV files in data/raw
-    data_folder = "data/raw"
-    ingestor = DataIngestor(data_folder)
+    data_folder = args.data_folder
+    ingestor = DataIngestor(data_folder, files=args.files)
+
+    processed_folder = args.processed_folder
+    ensure_dir(processed_folder)
+
+    if args.stream:
+        run_streaming(ingestor, processed_folder, args.chunk_size, append=args.files is not None)
+        return
+
     raw_df = ingestor.load_data()
 
     # 2. Data Cleaning & Normalization
     cleaner = DataCleaner(raw_df)
     cleaned_df = cleaner.clean_data()
-    
+
     # Save the cleaned data for observation.
-    processed_folder = "data/processed"
-    ensure_dir(processed_folder)
-    cleaned_excel_file = os.path.join(processed_folder, "combined_data_cleaned.xlsx")
-    cleaned_df.to_excel(cleaned_excel_file, index=False)
-    print(f"[Main] Cleaned data saved to {cleaned_excel_file}")
-    
+    cleaned_file = os.path.join(processed_folder, "combined_data_cleaned.parquet")
+    write_table(cleaned_df, cleaned_file, excel=args.excel)
+    print(f"[Main] Cleaned data saved to {cleaned_file}")
+
     # 3. Feature Extraction using LLM-based Entity Extraction
     extractor = FeatureExtractor(cleaned_df)
     featured_df = extractor.extract_features()
-    
-    feature_extracted_excel = os.path.join(processed_folder, "feature_extracted.xlsx")
-    featured_df.to_excel(feature_extracted_excel, index=False)
-    print(f"[Main] Feature extracted data saved to {feature_extracted_excel}")
+
+    feature_extracted_file = os.path.join(processed_folder, "feature_extracted.parquet")
+    write_table(featured_df, feature_extracted_file, excel=args.excel)
+    print(f"[Main] Feature extracted data saved to {feature_extracted_file}")
+
+def main():
+    run(parse_args())
 
 if __name__ == "__main__":
     main()
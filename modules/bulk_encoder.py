@@ -0,0 +1,168 @@
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from modules import embedding_model
+from modules.instrumentation import METRICS
+
+# Model of this worker process, loaded once by _init_worker, or the reason loading failed
+_worker_model = None
+_worker_error = None
+
+
+def available_cpus():
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def build_texts(df: pd.DataFrame, text_cols):
+    """
+    Join the text columns of every row with single spaces, a whole column at a time.
+    Same strings as df[text_cols].astype(str).agg(' '.join, axis=1), so content hashes do not change.
+    """
+    texts = df[text_cols[0]].astype(str)
+    for column in text_cols[1:]:
+        texts = texts + " " + df[column].astype(str)
+    return texts
+
+
+def _init_worker(model_name, model_class, threads, cpu_slots):
+    """
+    Load one model per worker process, with its math libraries limited to `threads` threads
+    and, where the OS supports it, the process pinned to its own block of cores.
+    Errors are kept for _encode_chunk to raise: an initializer that raises makes the pool
+    respawn the worker forever, and the caller would wait on its results indefinitely.
+    """
+    global _worker_model, _worker_error
+    try:
+        for variable in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+            os.environ[variable] = str(threads)
+        cpus = cpu_slots.get()
+        if cpus and hasattr(os, "sched_setaffinity"):
+            os.sched_setaffinity(0, cpus)
+        if model_class is not None:
+            embedding_model.SentenceTransformer = model_class
+        _worker_model = embedding_model.load_model(model_name)
+        if "torch" in sys.modules:
+            import torch
+
+            torch.set_num_threads(threads)
+    except Exception as e:
+        _worker_error = f"{type(e).__name__}: {e}"
+
+
+def _encode_chunk(texts, batch_size):
+    if _worker_error is not None:
+        raise RuntimeError(f"Encoder worker could not load its model ({_worker_error})")
+    return np.asarray(_worker_model.encode(texts, batch_size=batch_size, convert_to_numpy=True), dtype=np.float32)
+
+
+class BulkEncoder:
+    def __init__(self, model_name="all-MiniLM-L6-v2", workers=1, batch_size=64, chunk_size=None,
+                 threads_per_worker=None, pin_cpus=True):
+        """
+        Encoder for large catalogs on CPU-only hosts. Texts are sorted by length, so each batch pads
+        to a similar length, and streamed in chunks through a pool of worker processes, each with its
+        own model. Vectors are written into one preallocated float32 array (or memmap) as chunks finish.
+        The workers stay up between encode() calls; close() (or a with block) stops them.
+        :param workers: Worker processes; 1 encodes in this process without a pool.
+        :param batch_size: Texts per model forward pass.
+        :param chunk_size: Texts sent to a worker at a time (default: 16 batches).
+        :param threads_per_worker: Math library threads per worker (default: the available cores divided among the workers).
+        :param pin_cpus: Pin each worker to its own block of cores (Linux only).
+        """
+        self.model_name = model_name
+        self.workers = max(1, workers)
+        self.batch_size = batch_size
+        self.chunk_size = chunk_size or batch_size * 16
+        cpus = available_cpus()
+        self.threads_per_worker = threads_per_worker or max(1, len(cpus) // self.workers)
+        # Worker i gets cores i*t .. i*t+t-1 (wrapping around when there are more threads than cores)
+        self.cpu_slots = [
+            {cpus[(i * self.threads_per_worker + j) % len(cpus)] for j in range(self.threads_per_worker)} if pin_cpus else None
+            for i in range(self.workers)
+        ]
+        self._pool = None
+
+    def start(self):
+        """
+        Start the worker processes, which load their models in the background. Called by the first
+        encode() that needs the pool; the workers are kept until close(). No pool is used with one worker.
+        """
+        if self._pool is None and self.workers > 1:
+            context = multiprocessing.get_context("spawn")  # fork is unsafe once torch has started threads
+            cpu_slots = context.Queue()
+            for cpus in self.cpu_slots:
+                cpu_slots.put(cpus)
+            initargs = (self.model_name, embedding_model.SentenceTransformer, self.threads_per_worker, cpu_slots)
+            self._pool = context.Pool(self.workers, initializer=_init_worker, initargs=initargs)
+        return self._pool
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def encode(self, texts, out=None, path=None):
+        """
+        Encode texts into a (texts x dim) float32 matrix, in the order given.
+        :param out: Optional preallocated float32 array or memmap to write into.
+        :param path: Otherwise, write into a new .npy memmap at this path, so the matrix never has
+                     to fit in memory; without either, an array is allocated on the first chunk.
+        :return: The filled matrix.
+        """
+        texts = pd.Series(texts, dtype=object).reset_index(drop=True)
+        # Longest first: similar lengths share a batch, and the slowest chunks start early.
+        # Character length stands in for token length, which would need a tokenizer pass.
+        order = np.argsort(-texts.str.len().to_numpy(), kind="stable")
+        chunks = [(start, texts.iloc[order[start:start + self.chunk_size]].tolist())
+                  for start in range(0, len(texts), self.chunk_size)]
+
+        def write(start, vectors):
+            nonlocal out
+            if out is None:
+                shape = (len(texts), vectors.shape[1])
+                out = np.lib.format.open_memmap(path, mode="w+", dtype=np.float32, shape=shape) if path else np.empty(shape, dtype=np.float32)
+            out[order[start:start + len(vectors)]] = vectors
+
+        start_time = time.perf_counter()
+        if self.workers == 1 or len(chunks) <= 1:
+            model = embedding_model.load_model(self.model_name)
+            for start, chunk in chunks:
+                write(start, np.asarray(model.encode(chunk, batch_size=self.batch_size, convert_to_numpy=True), dtype=np.float32))
+        else:
+            pool = self.start()
+            # At most two chunks per worker in flight, so finished vectors never pile up
+            pending = deque()
+            for start, chunk in chunks:
+                pending.append((start, pool.apply_async(_encode_chunk, (chunk, self.batch_size))))
+                if len(pending) >= 2 * self.workers:
+                    write(*self._result(pending.popleft()))
+            while pending:
+                write(*self._result(pending.popleft()))
+        if hasattr(out, "flush"):
+            out.flush()
+
+        seconds = time.perf_counter() - start_time
+        rate = len(texts) / seconds if seconds else 0.0
+        METRICS.set_gauge("embed_bulk_texts_per_second", rate)
+        print(f"[BulkEncoder] Encoded {len(texts)} texts in {seconds:.1f}s ({rate:.0f} texts/s, {self.workers} worker(s)).")
+        return out if out is not None else np.empty((0, 0), dtype=np.float32)
+
+    @staticmethod
+    def _result(item):
+        start, result = item
+        return start, result.get()
@@ -0,0 +1,5 @@
+from modules.crawler.adapters import ADAPTERS, RyansAdapter, SiteAdapter, StartechAdapter, get_adapter
+from modules.crawler.browser import BrowserFetcher
+from modules.crawler.checkpoint import CrawlCheckpoint
+from modules.crawler.engine import CrawlerEngine
+from modules.crawler.scheduler import CrawlScheduler, run_crawl
@@ -0,0 +1,122 @@
+from urllib.parse import urljoin, urlsplit
+
+from bs4 import BeautifulSoup
+
+
+def text_of(selector):
+    """
+    Field extractor returning the visible text of the first element matching selector
+    (one line per text node, close to Selenium's element.text).
+    """
+    def extract(soup):
+        element = soup.select_one(selector)
+        return element.get_text("\n", strip=True) if element is not None else "N/A"
+    return extract
+
+
+def attribute_of(selector, attribute):
+    """
+    Field extractor returning an attribute of the first element matching selector.
+    """
+    def extract(soup):
+        element = soup.select_one(selector)
+        return element.get(attribute, "N/A") if element is not None else "N/A"
+    return extract
+
+
+class SiteAdapter:
+    """
+    Everything that is specific to one retailer. Adding a retailer means subclassing this with
+    its listing URL pattern, product link selector and field extractors.
+    """
+    name = None
+    listing_url_pattern = None  # e.g. "https://example.com/laptops?page={page}"
+    link_selector = None
+    name_selector = "h1[itemprop='name']"
+    field_extractors = {}
+
+    def __init__(self, base_url=None):
+        """
+        :param base_url: Optional replacement for the scheme and host of the site's URLs (listing
+                         and product pages), e.g. a local HTTP server serving saved pages.
+        """
+        self.base_url = base_url if not base_url or base_url.endswith("/") else base_url + "/"
+
+    def site_url(self, url):
+        """
+        Map a URL on the retailer's host onto base_url; other URLs are returned unchanged.
+        """
+        if not self.base_url or urlsplit(url).netloc != urlsplit(self.listing_url_pattern).netloc:
+            return url
+        parts = urlsplit(url)
+        return urljoin(self.base_url, parts.path.lstrip("/") + (f"?{parts.query}" if parts.query else ""))
+
+    def original_url(self, url):
+        """
+        Inverse of site_url: the retailer URL of a page served under base_url.
+        """
+        if not self.base_url or not url.startswith(self.base_url):
+            return url
+        return urljoin(self.listing_url_pattern, "/" + url[len(self.base_url):])
+
+    def listing_url(self, page):
+        return self.site_url(self.listing_url_pattern.format(page=page))
+
+    def parse_links(self, html, url):
+        """
+        Extract the absolute product links from a listing page, mapped onto base_url when it is set.
+        """
+        soup = BeautifulSoup(html, "html.parser")
+        links = []
+        for a in soup.select(self.link_selector):
+            href = a.get("href")
+            if href:
+                # Resolve against the retailer URL, so root-relative links keep base_url's path
+                links.append(self.site_url(urljoin(self.original_url(url), href)))
+        return links
+
+    def parse_product(self, html, url):
+        """
+        Parse a static product page. Returns None when the product name is missing,
+        which usually means the page needs JavaScript to render.
+        """
+        soup = BeautifulSoup(html, "html.parser")
+        name = soup.select_one(self.name_selector)
+        if name is None:
+            return None
+        # The retailer URL, also for pages served under base_url
+        product = {"URL": self.original_url(url), "Product Name": name.get_text("\n", strip=True)}
+        for field, extract in self.field_extractors.items():
+            product[field] = extract(soup)
+        return product
+
+
+class RyansAdapter(SiteAdapter):
+    name = "ryans"
+    listing_url_pattern = "https://www.ryans.com/category/laptop-all-laptop?page={page}"
+    link_selector = ".product-home-card .image-box a"
+    field_extractors = {
+        "Price": attribute_of("meta[itemprop='price']", "content"),
+        "Technical Details": text_of(".overview"),
+        "Description": text_of(".details-tab"),
+    }
+
+
+class StartechAdapter(SiteAdapter):
+    name = "startech"
+    listing_url_pattern = "https://www.startech.com.bd/laptop-notebook?page={page}"
+    link_selector = ".p-item-name a"
+    field_extractors = {
+        "Price": text_of(".product-price"),
+        "Technical Details": text_of(".short-description"),
+        "Description": text_of("#description"),
+    }
+
+
+ADAPTERS = {adapter.name: adapter for adapter in (RyansAdapter, StartechAdapter)}
+
+
+def get_adapter(name, **kwargs):
+    if name not in ADAPTERS:
+        raise ValueError(f"Unknown site '{name}'. Available: {', '.join(ADAPTERS)}")
+    return ADAPTERS[name](**kwargs)
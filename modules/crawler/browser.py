@@ -0,0 +1,47 @@
+import threading
+
+
+class BrowserFetcher:
+    def __init__(self, wait_seconds=30, wait_selector="h1"):
+        """
+        Headless Chrome fallback for pages that only render with JavaScript.
+        Selenium is imported and the browser started on first use, and pages are loaded
+        one at a time through a single driver.
+        """
+        self.wait_seconds = wait_seconds
+        self.wait_selector = wait_selector
+        self.driver = None
+        self._lock = threading.Lock()
+
+    def _start(self):
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.chrome.service import Service
+        from webdriver_manager.chrome import ChromeDriverManager
+
+        chrome_options = Options()
+        chrome_options.add_argument("--headless")  # Run in headless mode (no browser window)
+        chrome_options.add_argument("--disable-gpu")
+        chrome_options.add_argument("--no-sandbox")
+        chrome_options.add_argument("--disable-dev-shm-usage")
+        self.driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
+
+    def fetch(self, url):
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        with self._lock:
+            if self.driver is None:
+                self._start()
+            self.driver.get(url)
+            WebDriverWait(self.driver, self.wait_seconds).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, self.wait_selector))
+            )
+            return self.driver.page_source
+
+    def close(self):
+        with self._lock:
+            if self.driver is not None:
+                self.driver.quit()
+                self.driver = None
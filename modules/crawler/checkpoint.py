@@ -0,0 +1,72 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+class CrawlCheckpoint:
+    def __init__(self, path="data/raw/crawl_state.sqlite"):
+        """
+        Persistent crawl state keyed by product URL: when it was fetched, a hash of its HTML,
+        the HTTP validators (ETag / Last-Modified) and the parsed product. Every page is
+        committed as soon as it is crawled, so an interrupted crawl resumes where it stopped.
+        """
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            " url TEXT PRIMARY KEY, site TEXT, fetched_at REAL, content_hash TEXT,"
+            " etag TEXT, last_modified TEXT, data TEXT)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS pages_site ON pages (site)")
+        self._db.commit()
+
+    def get(self, url):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT fetched_at, content_hash, etag, last_modified, data FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        fetched_at, content_hash, etag, last_modified, data = row
+        return {
+            "fetched_at": fetched_at,
+            "content_hash": content_hash,
+            "etag": etag,
+            "last_modified": last_modified,
+            "data": json.loads(data) if data else None,
+        }
+
+    @staticmethod
+    def is_fresh(record, ttl_seconds):
+        return record is not None and record["data"] is not None and time.time() - record["fetched_at"] < ttl_seconds
+
+    @staticmethod
+    def content_hash(html):
+        return hashlib.sha256(html.encode("utf-8")).hexdigest()
+
+    def record(self, url, site, data, content_hash=None, etag=None, last_modified=None):
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, site, time.time(), content_hash, etag, last_modified, json.dumps(data, ensure_ascii=False)),
+            )
+            self._db.commit()
+
+    def touch(self, url):
+        """
+        Mark a page as re-validated now (e.g. after a 304 Not Modified) without changing its data.
+        """
+        with self._lock:
+            self._db.execute("UPDATE pages SET fetched_at = ? WHERE url = ?", (time.time(), url))
+            self._db.commit()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
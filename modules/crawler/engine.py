@@ -0,0 +1,124 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import requests
+from tqdm import tqdm
+
+from modules.instrumentation import METRICS
+from modules.rate_limiter import TokenBucket
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class CrawlerEngine:
+    def __init__(self, max_workers=16, per_host_limit=4, requests_per_second=2.0, burst=4, timeout=30,
+                 retries=3, backoff=1.0, browser_fallback=None, user_agent="Mozilla/5.0 (compatible; laptop-crawler)"):
+        """
+        Concurrent HTTP crawler: a thread pool of requests sessions with per-host concurrency
+        limits and a per-host token-bucket rate limiter. Pages are parsed from static HTML;
+        pages whose parser returns None are re-fetched through browser_fallback (e.g. a
+        BrowserFetcher) when one is given.
+        """
+        self.max_workers = max_workers
+        self.per_host_limit = per_host_limit
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.browser_fallback = browser_fallback
+        self.user_agent = user_agent
+        self.stats = {"fetched": 0, "not_modified": 0, "cached": 0, "retries": 0, "failed": 0, "browser_fallbacks": 0}
+        self._local = threading.local()
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def _session(self):
+        # requests.Session is not thread-safe, so every worker thread gets its own
+        if not hasattr(self._local, "session"):
+            self._local.session = requests.Session()
+            self._local.session.headers["User-Agent"] = self.user_agent
+        return self._local.session
+
+    def _host_limits(self, url):
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._hosts:
+                self._hosts[host] = (
+                    threading.BoundedSemaphore(self.per_host_limit),
+                    TokenBucket(self.requests_per_second, self.burst),
+                )
+            return self._hosts[host]
+
+    def count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+        METRICS.inc(f"crawler_{key}_total")
+
+    def fetch(self, url, headers=None):
+        """
+        Fetch a page, retrying with exponential backoff on 429/5xx and connection errors.
+        :param headers: Extra request headers, e.g. If-None-Match / If-Modified-Since.
+        :return: The response (status 200, or 304 for a conditional request), or None if every attempt failed.
+        """
+        semaphore, bucket = self._host_limits(url)
+        host = urlsplit(url).netloc
+        for attempt in range(self.retries + 1):
+            bucket.acquire()
+            try:
+                with semaphore:
+                    with METRICS.timer("crawler_fetch_seconds", host=host):
+                        response = self._session().get(url, headers=headers, timeout=self.timeout)
+                METRICS.inc("crawler_responses_total", host=host, status=response.status_code)
+                if response.status_code not in RETRY_STATUS_CODES:
+                    response.raise_for_status()
+                    self.count("fetched")
+                    return response
+            except requests.HTTPError as e:
+                print(f"❌ {url}: {e}")
+                break
+            except requests.RequestException as e:
+                METRICS.inc("crawler_responses_total", host=host, status=type(e).__name__)
+                print(f"⚠️ {url}: {e}")
+            if attempt < self.retries:
+                self.count("retries")
+                time.sleep(self.backoff * (2 ** attempt))
+        self.count("failed")
+        return None
+
+    def parse_html(self, html, url, parse):
+        """
+        Parse fetched HTML; falls back to the browser when the static HTML is not enough.
+        """
+        result = parse(html, url) if html is not None else None
+        if result is None and self.browser_fallback is not None:
+            self.count("browser_fallbacks")
+            try:
+                with METRICS.timer("crawler_browser_fetch_seconds"):
+                    html = self.browser_fallback.fetch(url)
+                result = parse(html, url)
+            except Exception as e:
+                print(f"❌ Browser fallback failed for {url}: {e}")
+        return result
+
+    def fetch_and_parse(self, url, parse):
+        response = self.fetch(url)
+        return self.parse_html(response.text if response is not None else None, url, parse)
+
+    def map(self, fn, items, desc="🔄 Crawling"):
+        """
+        Run fn over items on the worker pool, with a progress bar.
+        :return: Results in the same order as items.
+        """
+        items = list(items)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(tqdm(executor.map(fn, items), total=len(items), desc=desc))
+
+    def crawl(self, urls, parse, desc="🔄 Crawling"):
+        """
+        Fetch and parse many URLs concurrently.
+        :return: Parsed results in the same order as urls (None for pages that failed).
+        """
+        return self.map(lambda url: self.fetch_and_parse(url, parse), urls, desc=desc)
@@ -0,0 +1,173 @@
+import os
+import time
+
+import pandas as pd
+
+from modules.crawler.adapters import get_adapter
+from modules.crawler.browser import BrowserFetcher
+from modules.crawler.checkpoint import CrawlCheckpoint
+from modules.crawler.engine import CrawlerEngine
+from modules.instrumentation import METRICS
+
+
+class CrawlScheduler:
+    def __init__(self, adapter, engine=None, output_dir="data/raw", pages_per_batch=4, max_pages=200,
+                 checkpoint=None, ttl_hours=24, max_failed_pages=3):
+        """
+        Runs one site adapter through the shared crawler engine: discovers product links page by page
+        until a listing page yields no new links, then fetches every product page.
+        :param pages_per_batch: Listing pages fetched concurrently per round.
+        :param max_pages: Safety limit on the number of listing pages.
+        :param max_failed_pages: Stop pagination after this many listing pages in a row could not be
+                                 fetched (after the engine's retries and one more round of them).
+        :param checkpoint: Optional CrawlCheckpoint. Product pages crawled less than ttl_hours ago are
+                           reused, older ones are re-validated with ETag / Last-Modified when available.
+        """
+        self.adapter = adapter
+        self.engine = engine or CrawlerEngine()
+        self.checkpoint = checkpoint
+        self.ttl_seconds = ttl_hours * 3600
+        self.output_dir = output_dir
+        self.pages_per_batch = pages_per_batch
+        self.max_pages = max_pages
+        self.max_failed_pages = max_failed_pages
+        self.raw_data_file = os.path.join(output_dir, f"{adapter.name}_laptops_raw.csv")
+        self.urls_file = os.path.join(output_dir, f"{adapter.name}_product_links.txt")
+
+    def fetch_listings(self, pages):
+        """
+        Product links of each listing page, None for pages that could not be fetched. Failed pages
+        get a second round of the engine's retries with backoff; an empty page is [] (the last page).
+        """
+        results = self.engine.crawl(
+            [self.adapter.listing_url(p) for p in pages], self.adapter.parse_links,
+            desc=f"🔍 {self.adapter.name} pages {pages.start}-{pages.stop - 1}",
+        )
+        failed = [i for i, links in enumerate(results) if links is None]
+        if failed:
+            print(f"⚠️ {self.adapter.name}: {len(failed)} listing page(s) failed, retrying")
+            retried = self.engine.crawl(
+                [self.adapter.listing_url(pages[i]) for i in failed], self.adapter.parse_links,
+                desc=f"🔁 {self.adapter.name} retrying {len(failed)} page(s)",
+            )
+            for i, links in zip(failed, retried):
+                results[i] = links
+        return results
+
+    def discover_links(self):
+        product_links = {}
+        failed_in_a_row = 0
+        page = 1
+        while page <= self.max_pages:
+            pages = range(page, min(page + self.pages_per_batch, self.max_pages + 1))
+            for p, links in zip(pages, self.fetch_listings(pages)):
+                if links is None:
+                    # A failed fetch is not the end of the listing: skip the page, unless the site keeps failing
+                    failed_in_a_row += 1
+                    METRICS.inc("crawler_listing_pages_failed_total", site=self.adapter.name)
+                    if failed_in_a_row >= self.max_failed_pages:
+                        print(f"❌ Page {p} - {failed_in_a_row} listing pages in a row failed, stopping pagination "
+                              f"(Total: {len(product_links)})")
+                        return list(product_links)
+                    print(f"⚠️ Page {p} - listing fetch failed, skipping to the next page")
+                    continue
+                failed_in_a_row = 0
+                new_links = [link for link in links if link not in product_links]
+                if not new_links:
+                    print(f"✅ Page {p} - no new product links, stopping pagination (Total: {len(product_links)})")
+                    return list(product_links)
+                product_links.update(dict.fromkeys(new_links))
+                print(f"✅ Page {p} - Found {len(new_links)} new product links (Total so far: {len(product_links)})")
+            page = pages.stop
+        return list(product_links)
+
+    def fetch_product(self, url):
+        """
+        Fetch one product page through the checkpoint: reuse it while fresh, send a conditional
+        request when it is stale, and persist the result as soon as it is parsed.
+        """
+        record = self.checkpoint.get(url)
+        if CrawlCheckpoint.is_fresh(record, self.ttl_seconds):
+            self.engine.count("cached")
+            return record["data"]
+
+        headers = {}
+        if record is not None and record["data"] is not None:
+            if record["etag"]:
+                headers["If-None-Match"] = record["etag"]
+            if record["last_modified"]:
+                headers["If-Modified-Since"] = record["last_modified"]
+
+        response = self.engine.fetch(url, headers=headers or None)
+        if response is None:
+            return record["data"] if record is not None else None
+        if response.status_code == 304:
+            self.engine.count("not_modified")
+            self.checkpoint.touch(url)
+            return record["data"]
+
+        content_hash = CrawlCheckpoint.content_hash(response.text)
+        if record is not None and record["data"] is not None and record["content_hash"] == content_hash:
+            product = record["data"]
+        else:
+            product = self.engine.parse_html(response.text, url, self.adapter.parse_product)
+        if product is not None:
+            self.checkpoint.record(
+                url, self.adapter.name, product, content_hash,
+                etag=response.headers.get("ETag"), last_modified=response.headers.get("Last-Modified"),
+            )
+        return product
+
+    def run(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        print(f"\n🚀 Fetching {self.adapter.name} product links...")
+        with METRICS.stage(f"crawl_links:{self.adapter.name}") as stage:
+            product_links = self.discover_links()
+            stage.rows_out = len(product_links)
+        with open(self.urls_file, "w") as f:
+            for url in product_links:
+                f.write(url + "\n")
+        print(f"\n📄 Product URLs saved to {self.urls_file}")
+
+        print(f"\n📊 Fetching {self.adapter.name} product details...\n")
+        with METRICS.stage(f"crawl_products:{self.adapter.name}", rows_in=len(product_links)) as stage:
+            start = time.perf_counter()
+            if self.checkpoint is None:
+                results = self.engine.crawl(product_links, self.adapter.parse_product, desc="🔄 Crawling Products")
+            else:
+                results = self.engine.map(self.fetch_product, product_links, desc="🔄 Crawling Products")
+            df = pd.DataFrame([product for product in results if product])
+            stage.rows_out = len(df)
+            stage.extra.update(self.engine.stats)
+            elapsed = time.perf_counter() - start
+            if elapsed > 0:
+                METRICS.set_gauge("crawler_pages_per_second", round(len(product_links) / elapsed, 3), site=self.adapter.name)
+        df.to_csv(self.raw_data_file, index=False)
+        print(f"\n✅ Scraping completed! {len(df)} products saved in '{self.raw_data_file}'. Stats: {self.engine.stats}")
+        return df
+
+
+def run_crawl(site_names, output_dir="data/raw", base_url=None, max_pages=200, checkpoint_file=None, ttl_hours=24, **engine_kwargs):
+    """
+    Crawl the given retailers with one shared engine; Chrome is only started if a page needs it.
+    :param checkpoint_file: SQLite file for resumable crawling (default: crawl_state.sqlite in output_dir).
+                            Pass False to disable checkpointing.
+    """
+    browser = BrowserFetcher()
+    engine = CrawlerEngine(browser_fallback=browser, **engine_kwargs)
+    checkpoint = None
+    if checkpoint_file is not False:
+        checkpoint = CrawlCheckpoint(checkpoint_file or os.path.join(output_dir, "crawl_state.sqlite"))
+    try:
+        return {
+            name: CrawlScheduler(
+                get_adapter(name, base_url=base_url), engine, output_dir,
+                max_pages=max_pages, checkpoint=checkpoint, ttl_hours=ttl_hours,
+            ).run()
+            for name in site_names
+        }
+    finally:
+        browser.close()
+        if checkpoint is not None:
+            checkpoint.close()
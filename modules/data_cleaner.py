@@ -1,9 +1,52 @@
 import re
+
+import numpy as np
 import pandas as pd
 
+from modules.instrumentation import METRICS
+
 # Mapping for Bangla digits to English
 BANGLA_DIGITS = str.maketrans("০১২৩৪৫৬৭৮৯", "0123456789")
 
+# Precompiled patterns shared by the per-row and vectorized cleaning paths.
+# The description patterns are applied in this exact order; several of them overlap
+# (e.g. "You can buy ..." also matches "Buy ..."), so they cannot be merged into one alternation.
+WHITESPACE_RE = re.compile(r'\s+')
+PRICE_AFTER_CURRENCY_RE = re.compile(r'৳.*', re.DOTALL)
+NON_PRICE_CHARS_RE = re.compile(r'[^\d.]')
+TECH_BOILERPLATE_RES = [
+    re.compile(r'(Quick Overview|Key Features)', re.IGNORECASE),
+    re.compile(r'(?i)View More Info'),
+    re.compile(r'(?i)Licensed Application - No'),
+]
+HTML_TAG_RE = re.compile(r'<[^>]+>')
+DESCRIPTION_INTRO_RE = re.compile(r'(?im)^(Features of .*?Laptop In Bangladesh\s*|Details Overview for .*?Laptop\s*)\n?')
+DESCRIPTION_PREFIX_RE = re.compile(r'^Description\s*', re.IGNORECASE)
+DESCRIPTION_PROMO_RES = [
+    re.compile(r' Order Online Or Visit your Nearest Star Tech Shop to get yours at lowest price.'),
+    re.compile(r'(?i)You can buy .*?(from our website or visit our showrooms nearby.)[\.!]*\s*'),
+    re.compile(r'(?i)Buy .*?(Laptop From Star Tech.)[\.!]*\s*'),
+    re.compile(r'(?i)In Bangladesh, you can get .*?(Laptop From Star Tech.)[\.!]*\s*'),
+]
+DESCRIPTION_TAIL_RE = re.compile(r'(?:Buying Guide|Why Choose).*', re.DOTALL)
+
+# Merged alternations for the vectorized path: one pass instead of one per pattern. A single pass
+# removes what the sequence removes ("Quick Overview" and "View More Info" share only "View", and the
+# leftmost match wins either way), except where a removal joins the text around it into a new
+# match; _sub_rows redoes those rows in sequence. The leading lookahead lets the scanner skip
+# every position that cannot start a branch.
+TECH_BOILERPLATE_RE = re.compile(
+    r'(?=[QKVLqkvl])(?:Quick Overview|Key Features|View More Info|Licensed Application - No)', re.IGNORECASE
+)
+# Intro line, then the "Description" prefix of what is left (start of text, after whitespace normalization)
+DESCRIPTION_HEAD_RE = re.compile(
+    r'^(?:Features of .*?Laptop In Bangladesh\s*|Details Overview for .*?Laptop\s*)?(?:Description\s*)?', re.IGNORECASE
+)
+
+# Characters that re.IGNORECASE matches against ASCII letters but str.lower() does not map to them.
+# Rows containing any of them skip the lowercase literal pre-checks and always get the pattern applied.
+CASE_FOLD_EXCEPTIONS_RE = re.compile('[\u0130\u0131\u017f]')
+
 def convert_bangla_numerals(text):
     """Convert Bangla numerals in the text to English digits."""
     if text:
@@ -27,7 +70,7 @@ class DataCleaner:
         if "৳" in price_str:
             price_str = price_str.split("৳")[0]
         # Remove commas and any non-digit (except period) characters.
-        price_str = re.sub(r'[^\d.]', '', price_str)
+        price_str = NON_PRICE_CHARS_RE.sub('', price_str)
         try:
             return float(price_str)
         except ValueError:
@@ -44,51 +87,168 @@ class DataCleaner:
         """
         description = str(description) if description is not None else ""
         # Remove HTML tags.
-        description = re.sub(r'<[^>]+>', ' ', description)
+        description = HTML_TAG_RE.sub(' ', description)
         # Normalize whitespace.
-        description = re.sub(r'\s+', ' ', description).strip()
+        description = WHITESPACE_RE.sub(' ', description).strip()
         # Remove unwanted introductory lines anywhere in the description:
         # - Lines starting with "Features of ... Laptop In Bangladesh"
         # - Lines starting with "Details Overview for ... Laptop"
-        description = re.sub(
-            r'(?im)^(Features of .*?Laptop In Bangladesh\s*|Details Overview for .*?Laptop\s*)\n?',
-            '',
-            description
-        )
+        description = DESCRIPTION_INTRO_RE.sub('', description)
         # Remove leading "Description" (for Startech).
-        description = re.sub(r'^Description\s*', '', description, flags=re.IGNORECASE)
-        # Remove promotional sentence (specific fixed text)
-        description = re.sub(
-            r' Order Online Or Visit your Nearest Star Tech Shop to get yours at lowest price.',
-            '',
-            description
-        )
-        # Remove generic promotional sentences that start with "You can buy ..." up to phrases like
-        # "from our website" or "visit our showrooms nearby"
-        description = re.sub(
-            r'(?i)You can buy .*?(from our website or visit our showrooms nearby.)[\.!]*\s*',
-            '',
-            description
-        )
-        # Remove generic promotional sentences that start with "Buy ..." up to phrases like
-        # "Laptop From Star Tech"
-        description = re.sub(
-            r'(?i)Buy .*?(Laptop From Star Tech.)[\.!]*\s*',
-            '',
-            description
-        )
-        # Remove generic promotional sentences that start with "In Bangladesh, you can get" up to phrases like
-        # "Laptop From Star Tech."
-        description = re.sub(
-            r'(?i)In Bangladesh, you can get .*?(Laptop From Star Tech.)[\.!]*\s*',
-            '',
-            description
-        )
+        description = DESCRIPTION_PREFIX_RE.sub('', description)
+        # Remove promotional sentences, in order:
+        # - the fixed Star Tech "Order Online Or Visit ..." sentence
+        # - "You can buy ... from our website or visit our showrooms nearby."
+        # - "Buy ... Laptop From Star Tech."
+        # - "In Bangladesh, you can get ... Laptop From Star Tech."
+        for pattern in DESCRIPTION_PROMO_RES:
+            description = pattern.sub('', description)
         # Remove any trailing sections starting with "Buying Guide" or "Why Choose".
-        description = re.split(r'Buying Guide|Why Choose', description)[0]
+        description = DESCRIPTION_TAIL_RE.sub('', description, count=1)
         return description
 
-    def clean_data(self):
+    @staticmethod
+    def _contains_all(series: pd.Series, *literals):
+        mask = np.ones(len(series), dtype=bool)
+        for literal in literals:
+            mask &= series.str.contains(literal, regex=False).to_numpy(dtype=bool)
+        return mask
+
+    @staticmethod
+    def _normalize_whitespace(series: pd.Series):
+        # Same result as WHITESPACE_RE.sub(' ', text).strip(): str.split() and \s use the same whitespace set.
+        return series.str.split().str.join(' ')
+
+    @staticmethod
+    def _sub_rows(values: pd.Series, lowered: pd.Series, pattern, mask, repl='', count=0, sequence=None):
+        """
+        Apply pattern.sub only to the rows in mask and keep the lowercased copy in sync for the rows
+        that changed. Masks are built from literals every match must contain, so rows outside the
+        mask would be left unchanged by the pattern anyway.
+        :param sequence: The patterns a merged alternation stands for. Changed rows that still match
+                         (a removal joined the text around it into a new match) are redone by
+                         removing them one after the other, as the per-row path does.
+        """
+        if not mask.any():
+            return values, lowered
+        before = values[mask]
+        after = before.str.replace(pattern, repl, n=count or -1, regex=True)
+        changed = (before != after).to_numpy(dtype=bool)
+        if sequence is not None and changed.any():
+            rematch = np.zeros(len(after), dtype=bool)
+            rematch[changed] = after[changed].str.contains(pattern, regex=True).to_numpy(dtype=bool)
+            if rematch.any():
+                redone = before[rematch]
+                for part in sequence:
+                    redone = redone.str.replace(part, repl, regex=True)
+                after = after.copy()
+                after[rematch] = redone
+                changed = (before != after).to_numpy(dtype=bool)
+        if changed.any():
+            rows = np.flatnonzero(mask)[changed]
+            values = values.copy()
+            values.iloc[rows] = after[changed].to_numpy()
+            if lowered is not None:
+                lowered = lowered.copy()
+                lowered.iloc[rows] = after[changed].str.lower().to_numpy()
+        return values, lowered
+
+    def clean_prices(self, prices: pd.Series):
+        """
+        Vectorized clean_price over a whole column.
+        """
+        prices = prices.astype(str)
+        cleaned = (
+            prices.str.translate(BANGLA_DIGITS)
+            .str.replace(PRICE_AFTER_CURRENCY_RE, '', regex=True)
+            .str.replace(NON_PRICE_CHARS_RE, '', regex=True)
+        )
+        return pd.to_numeric(cleaned, errors='coerce').astype('float64')
+
+    def clean_tech_details(self, tech: pd.Series):
+        """
+        Vectorized cleaning of the technical details column.
+        """
+        tech = self._normalize_whitespace(tech.astype(str))
+        # Remove "Quick Overview" / "Key Features", "View More Info" and "Licensed Application - No" in
+        # one pass over every row: the merged pattern is cheaper than the literal pre-checks would be.
+        everything = np.ones(len(tech), dtype=bool)
+        tech, _ = self._sub_rows(tech, None, TECH_BOILERPLATE_RE, everything, sequence=TECH_BOILERPLATE_RES)
+        return tech
+
+    def clean_descriptions(self, descriptions: pd.Series):
+        """
+        Vectorized clean_description over a whole column, applying the same patterns in the same order.
+        Each pattern only runs on the rows that contain the literal text it needs to match.
+        """
+        index = descriptions.index
+        is_none = np.fromiter((d is None for d in descriptions), dtype=bool, count=len(descriptions))
+        descriptions = descriptions.astype(str).mask(is_none, "").reset_index(drop=True)
+        descriptions, _ = self._sub_rows(
+            descriptions, None, HTML_TAG_RE, self._contains_all(descriptions, '<', '>'), repl=' '
+        )
+        descriptions = self._normalize_whitespace(descriptions)
+        lowered = descriptions.str.lower()
+        unfoldable = descriptions.str.contains(CASE_FOLD_EXCEPTIONS_RE, regex=True).to_numpy(dtype=bool)
+
+        # After whitespace normalization there are no newlines left, so "^" only matches at the start:
+        # the intro line and then the "Description" prefix, in one anchored match.
+        mask = lowered.str.startswith(('features of ', 'details overview for ', 'description')).to_numpy(dtype=bool)
+        descriptions, lowered = self._sub_rows(descriptions, lowered, DESCRIPTION_HEAD_RE, mask | unfoldable, count=1)
+
+        # The promo patterns stay one pass each: "Buy ..." and "In Bangladesh, you can get ..." overlap
+        # "You can buy ...", and merging the first two is slower, as an alternation loses the literal-prefix search.
+        order_online, you_can_buy, buy_from_star_tech, in_bangladesh = DESCRIPTION_PROMO_RES
+        mask = self._contains_all(descriptions, ' Order Online Or Visit your Nearest Star Tech Shop to get yours at lowest price')
+        descriptions, lowered = self._sub_rows(descriptions, lowered, order_online, mask)
+        mask = self._contains_all(lowered, 'you can buy ', 'from our website or visit our showrooms nearby')
+        descriptions, lowered = self._sub_rows(descriptions, lowered, you_can_buy, mask | unfoldable)
+        mask = self._contains_all(lowered, 'buy ', 'laptop from star tech')
+        descriptions, lowered = self._sub_rows(descriptions, lowered, buy_from_star_tech, mask | unfoldable)
+        mask = self._contains_all(lowered, 'in bangladesh, you can get ', 'laptop from star tech')
+        descriptions, lowered = self._sub_rows(descriptions, lowered, in_bangladesh, mask | unfoldable)
+
+        mask = self._contains_all(descriptions, 'Buying Guide') | self._contains_all(descriptions, 'Why Choose')
+        descriptions, _ = self._sub_rows(descriptions, None, DESCRIPTION_TAIL_RE, mask, count=1)
+        descriptions.index = index
+        return descriptions
+
+    def clean_data(self, vectorized=True, verbose=True):
+        """
+        Clean prices, technical details and descriptions.
+        :param vectorized: Clean whole columns with pandas string ops (default). The per-row path
+                           gives identical output and is kept as the reference implementation.
+        :param verbose: Print when done (off when cleaning many chunks under one progress bar).
+        """
+        with METRICS.stage("clean", rows_in=len(self.df)) as stage:
+            df = self._clean_data_vectorized() if vectorized else self._clean_data_rowwise()
+            stage.rows_out = len(df)
+        if verbose:
+            print("[DataCleaner] Data cleaning complete.")
+        return df
+
+    def _clean_data_vectorized(self):
+        if 'Price' in self.df.columns:
+            with METRICS.timer("clean_column_seconds", column="Price"):
+                self.df['Cleaned_Price'] = self.clean_prices(self.df['Price'])
+        else:
+            self.df['Cleaned_Price'] = None
+
+        if 'Technical Details' in self.df.columns:
+            with METRICS.timer("clean_column_seconds", column="Technical Details"):
+                self.df['Cleaned_Tech_Details'] = self.clean_tech_details(self.df['Technical Details'])
+        else:
+            self.df['Cleaned_Tech_Details'] = ""
+
+        if 'Description' in self.df.columns:
+            with METRICS.timer("clean_column_seconds", column="Description"):
+                self.df['Cleaned_Description'] = self.clean_descriptions(self.df['Description'])
+        else:
+            self.df['Cleaned_Description'] = ""
+
+        return self.df
+
+    def _clean_data_rowwise(self):
         # Clean Price: process each record using clean_price
         if 'Price' in self.df.columns:
             self.df['Cleaned_Price'] = self.df['Price'].apply(lambda x: self.clean_price(str(x)))
@@ -97,12 +257,11 @@ class DataCleaner:
 
         # Clean Technical Details:
         if 'Technical Details' in self.df.columns:
-            tech = self.df['Technical Details'].apply(lambda x: re.sub(r'\s+', ' ', str(x)).strip())
-            # Remove the unwanted phrases "Quick Overview" and "Key Features"
-            tech = tech.apply(lambda x: re.sub(r'(Quick Overview|Key Features)', '', x, flags=re.IGNORECASE))
-            # Remove "View More Info" from technical details.
-            tech = tech.apply(lambda x: re.sub(r'(?i)View More Info', '', x))
-            tech = tech.apply(lambda x: re.sub(r'(?i)Licensed Application - No', '', x))
+            tech = self.df['Technical Details'].apply(lambda x: WHITESPACE_RE.sub(' ', str(x)).strip())
+            # Remove the unwanted phrases "Quick Overview", "Key Features", "View More Info"
+            # and "Licensed Application - No"
+            for pattern in TECH_BOILERPLATE_RES:
+                tech = tech.apply(lambda x: pattern.sub('', x))
             self.df['Cleaned_Tech_Details'] = tech
         else:
             self.df['Cleaned_Tech_Details'] = ""
@@ -113,5 +272,4 @@ class DataCleaner:
         else:
             self.df['Cleaned_Description'] = ""
 
-        print("[DataCleaner] Data cleaning complete.")
         return self.df
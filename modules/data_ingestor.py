@@ -2,21 +2,82 @@
 import os
 import pandas as pd
 
+from modules.instrumentation import METRICS
+
+# Columns the crawlers write; everything is read as text and typed later by the cleaner
+RAW_COLUMNS = ["URL", "Product Name", "Price", "Technical Details", "Description"]
+RAW_DTYPES = {column: str for column in RAW_COLUMNS}
+
+
 class DataIngestor:
-    def __init__(self, data_folder):
+    def __init__(self, data_folder, files=None):
+        """
+        :param data_folder: Folder with the crawled CSV files.
+        :param files: Optional list of CSV files (paths, or names inside data_folder) to read instead
+                      of every CSV in the folder, e.g. only the snapshots that are new since the last run.
+        """
         self.data_folder = data_folder
+        self.files = files
+
+    def csv_files(self):
+        if self.files is not None:
+            return [f if os.path.dirname(f) else os.path.join(self.data_folder, f) for f in self.files]
+        return [
+            os.path.join(self.data_folder, file)
+            for file in sorted(os.listdir(self.data_folder)) if file.endswith(".csv")
+        ]
 
     def load_data(self):
-        data_frames = []
-        for file in os.listdir(self.data_folder):
-            if file.endswith(".csv"):
-                file_path = os.path.join(self.data_folder, file)
+        with METRICS.stage("ingest") as stage:
+            data_frames = []
+            for file_path in self.csv_files():
                 df = pd.read_csv(file_path)
+                METRICS.inc("ingest_rows_total", len(df), file=os.path.basename(file_path))
                 data_frames.append(df)
-        if data_frames:
-            combined_df = pd.concat(data_frames, ignore_index=True)
-            print(f"[DataIngestor] Loaded {len(combined_df)} records from CSV files in {self.data_folder}")
-            return combined_df
+            if data_frames:
+                combined_df = pd.concat(data_frames, ignore_index=True)
+                print(f"[DataIngestor] Loaded {len(combined_df)} records from CSV files in {self.data_folder}")
+            else:
+                print("[DataIngestor] No CSV files found.")
+                combined_df = pd.DataFrame()
+            stage.rows_out = len(combined_df)
+        return combined_df
+
+    def iter_chunks(self, chunksize=10000, usecols=RAW_COLUMNS, dtype=RAW_DTYPES):
+        """
+        Stream the CSV files as DataFrames of at most chunksize rows, so memory is bounded by the
+        chunk size rather than by the total crawl history.
+        :param usecols: Columns to read; columns missing from a file are skipped.
+        :param dtype: Explicit column dtypes (text by default) instead of per-chunk inference.
+        """
+        total = 0
+        for file_path in self.csv_files():
+            for chunk in self.iter_file_chunks(file_path, chunksize, usecols, dtype):
+                total += len(chunk)
+                yield chunk
+        if total:
+            print(f"[DataIngestor] Streamed {total} records from CSV files in {self.data_folder}")
         else:
             print("[DataIngestor] No CSV files found.")
-            return pd.DataFrame()
+
+    def iter_file_chunks(self, file_path, chunksize=10000, usecols=RAW_COLUMNS, dtype=RAW_DTYPES):
+        """
+        Stream one CSV file as DataFrames of at most chunksize rows (see iter_chunks).
+        An empty file (not even a header) yields no chunks.
+        """
+        try:
+            reader = pd.read_csv(
+                file_path,
+                chunksize=chunksize,
+                usecols=(lambda column: column in usecols) if usecols is not None else None,
+                dtype=dtype,
+            )
+        except pd.errors.EmptyDataError:
+            return
+        while True:
+            with METRICS.timer("ingest_chunk_read_seconds"):
+                chunk = next(reader, None)
+            if chunk is None:
+                break
+            METRICS.inc("ingest_rows_total", len(chunk), file=os.path.basename(file_path))
+            yield chunk.reset_index(drop=True)
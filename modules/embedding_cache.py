@@ -0,0 +1,91 @@
+import hashlib
+import os
+import re
+
+import numpy as np
+
+CACHE_FILE = "cache.npz"
+
+
+def content_hash(text):
+    """
+    Hash the text an embedding is generated from.
+    """
+    return hashlib.sha256(str(text).encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    def __init__(self, cache_dir="data/processed/embedding_cache", model_name="all-MiniLM-L6-v2"):
+        """
+        Persistent embedding cache keyed by model name plus a hash of the embedded text.
+        Each model gets its own file holding the content hashes and float32 vectors in the same row order.
+        """
+        self.model_name = model_name
+        self.cache_file = os.path.join(cache_dir, re.sub(r'[^\w.-]+', '_', model_name), CACHE_FILE)
+        self.keys = np.empty(0, dtype="<U64")
+        self.vectors = None
+        self._rows = {}
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.cache_file):
+            return
+        with np.load(self.cache_file, allow_pickle=False) as data:
+            if str(data["model_name"]) != self.model_name:
+                return
+            self.keys = data["keys"]
+            self.vectors = data["vectors"]
+        self._rows = {key: i for i, key in enumerate(self.keys.tolist())}
+
+    def __len__(self):
+        return len(self.keys)
+
+    def lookup(self, hashes):
+        """
+        Look up embeddings by content hash.
+        :return: Row positions in the cache (-1 for misses) as an int64 array.
+        """
+        return np.array([self._rows.get(h, -1) for h in hashes], dtype=np.int64)
+
+    def update(self, hashes, hits, new_vectors):
+        """
+        Rebuild the cache from the hits of the last lookup plus newly encoded vectors.
+        Entries whose hash is no longer in the catalog are evicted.
+        :param hashes: Content hashes of the current catalog, in order.
+        :param hits: Result of lookup(hashes).
+        :param new_vectors: Encoded vectors for the misses (hits == -1), in order.
+        :return: float32 embedding matrix aligned with hashes.
+        """
+        hits = np.asarray(hits, dtype=np.int64)
+        found = hits >= 0
+        if len(new_vectors):
+            dimension = np.shape(new_vectors)[1]
+        elif self.vectors is not None:
+            dimension = self.vectors.shape[1]
+        else:
+            dimension = 0
+
+        embeddings = np.empty((len(hashes), dimension), dtype=np.float32)
+        if found.any():
+            embeddings[found] = self.vectors[hits[found]]
+        if (~found).any():
+            embeddings[~found] = new_vectors
+
+        # Keep one row per distinct hash; products that disappeared are dropped.
+        keys, first_rows = np.unique(np.asarray(hashes, dtype="<U64"), return_index=True)
+        self.keys = keys
+        self.vectors = embeddings[first_rows]
+        self._rows = {key: i for i, key in enumerate(keys.tolist())}
+        return embeddings
+
+    def save(self):
+        """
+        Write the cache to a single file, replaced atomically so an interrupted run never leaves it half-written.
+        """
+        if self.vectors is None:
+            return
+        os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+        tmp_file = self.cache_file + ".tmp"
+        with open(tmp_file, "wb") as f:
+            np.savez(f, model_name=np.array(self.model_name), keys=self.keys, vectors=self.vectors)
+        os.replace(tmp_file, self.cache_file)
@@ -0,0 +1,32 @@
+import threading
+
+# sentence_transformers.SentenceTransformer, imported on the first load_model() call: importing it
+# pulls in torch, which takes seconds. Assign a factory here to load a different model class.
+SentenceTransformer = None
+
+_models = {}
+_lock = threading.Lock()
+
+
+def load_model(model_name):
+    """
+    Load a sentence transformer model, once per process and model name, so the recommender
+    and the query processor running in the same process share one copy.
+    """
+    global SentenceTransformer
+    with _lock:
+        if model_name not in _models:
+            if SentenceTransformer is None:
+                from sentence_transformers import SentenceTransformer
+            print(f"[EmbeddingModel] Loading '{model_name}'...")
+            _models[model_name] = SentenceTransformer(model_name)
+        return _models[model_name]
+
+
+def clear_models():
+    """
+    Drop the loaded models (e.g. after swapping the model class).
+    """
+    with _lock:
+        _models.clear()
+
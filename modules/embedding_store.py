@@ -0,0 +1,92 @@
+import json
+import os
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from modules.io_utils import dataframe_to_arrow
+
+FORMAT_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+MATRIX_FILE = "embeddings.npy"
+METADATA_FILE = "metadata.arrow"
+
+
+def save_embedding_index(index_dir, embeddings, metadata: pd.DataFrame, model_name):
+    """
+    Save an embedding index directory:
+      - embeddings.npy: contiguous, L2-normalized float32 matrix (one row per laptop).
+      - metadata.arrow: uncompressed Arrow IPC file with the laptop columns.
+      - manifest.json: model name, dimension, row count and file names.
+    The manifest is written last so a half-written index is never picked up.
+    """
+    embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+    if embeddings.ndim != 2 or embeddings.shape[0] != len(metadata):
+        raise ValueError(
+            f"Embedding matrix shape {embeddings.shape} does not match {len(metadata)} metadata rows"
+        )
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    embeddings = embeddings / norms
+
+    os.makedirs(index_dir, exist_ok=True)
+    np.save(os.path.join(index_dir, MATRIX_FILE), embeddings)
+
+    table = dataframe_to_arrow(metadata)
+    with pa.OSFile(os.path.join(index_dir, METADATA_FILE), "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+    manifest = {
+        "format_version": FORMAT_VERSION,
+        "model_name": model_name,
+        "dimension": int(embeddings.shape[1]),
+        "row_count": int(embeddings.shape[0]),
+        "dtype": "float32",
+        "normalized": True,
+        "matrix_file": MATRIX_FILE,
+        "metadata_file": METADATA_FILE,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+    }
+    with open(os.path.join(index_dir, MANIFEST_FILE), "w") as f:
+        json.dump(manifest, f, indent=4)
+    return manifest
+
+
+def load_manifest(index_dir):
+    """
+    Read and validate the manifest of an embedding index directory.
+    """
+    with open(os.path.join(index_dir, MANIFEST_FILE), "r") as f:
+        manifest = json.load(f)
+    if manifest.get("format_version") != FORMAT_VERSION:
+        raise ValueError(
+            f"Unsupported embedding index format {manifest.get('format_version')} in {index_dir}"
+        )
+    return manifest
+
+
+def load_embedding_index(index_dir, mmap=True):
+    """
+    Load an embedding index directory without copying it into memory.
+    :return: (embeddings, metadata, manifest) where embeddings is a read-only memory-mapped
+             float32 matrix and metadata is a memory-mapped Arrow table.
+    """
+    manifest = load_manifest(index_dir)
+
+    embeddings = np.load(
+        os.path.join(index_dir, manifest["matrix_file"]), mmap_mode="r" if mmap else None
+    )
+    if embeddings.shape != (manifest["row_count"], manifest["dimension"]):
+        raise ValueError(
+            f"Embedding matrix shape {embeddings.shape} does not match manifest in {index_dir}"
+        )
+
+    source = pa.memory_map(os.path.join(index_dir, manifest["metadata_file"]), "r")
+    metadata = pa.ipc.open_file(source).read_all()
+    if metadata.num_rows != manifest["row_count"]:
+        raise ValueError(f"Metadata row count does not match manifest in {index_dir}")
+
+    return embeddings, metadata, manifest
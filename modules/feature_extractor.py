@@ -1,7 +1,95 @@
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
 import pandas as pd
 from tqdm import tqdm
 
+from modules.instrumentation import METRICS
+
+# Precompiled patterns for the spec fields in Cleaned_Tech_Details.
+RYANS_PROCESSOR_RE = re.compile(r'Processor Type\.?\s*[-:]\s*(.*?)\s*(?=RAM\s*[-:])', re.IGNORECASE)
+PROCESSOR_RE = re.compile(r'Processor\s*[-:]\s*([^\n,]+)', re.IGNORECASE)
+RAM_RE = re.compile(r'RAM\s*[-:]\s*([\d]+)\s*GB', re.IGNORECASE)
+STORAGE_RE = re.compile(r'Storage\s*[-:]\s*([^\n,;]+)', re.IGNORECASE)
+STORAGE_TAIL_RE = re.compile(r'\s+(?:Graphics|Display|Licensed Application|Features|Camera)\b', re.IGNORECASE)
+RYANS_DISPLAY_RE = re.compile(r'Display Size\s*\(Inch\)\s*[-:]\s*([\d\.]+)', re.IGNORECASE)
+DISPLAY_RE = re.compile(r'Display\s*[-:]\s*([^\n]+)', re.IGNORECASE)
+DISPLAY_TAIL_RE = re.compile(r'\s+(?:Licensed Application|Graphics|Features|Touch[-\s]?Screen|with)\b', re.IGNORECASE)
+
+# Patterns for the numeric spec columns derived from the extracted text fields.
+RAM_GB_RE = r'(\d+(?:\.\d+)?)\s*GB'
+STORAGE_SIZE_RE = r'(?i)(\d+(?:\.\d+)?)\s*(TB?|GB?)\b'
+SSD_RE = r'(?i)SSD|NVMe'
+DISPLAY_INCH_RE = r'(?i)(\d{1,2}(?:\.\d+)?)(?=\s*(?:"|\u201d|-?\s*inch)|\s+(?:HD|FHD|QHD|UHD|WUXGA|OLED)\b)'
+
+
+def extract_tech_features(text):
+    """
+    Extract (processor, ram, storage, display) from one tech-details string in one function call
+    per row, with the same results as the individual FeatureExtractor.extract_* methods.
+    This is not a single-pass scan: each field is its own regex search, which jumps straight to its
+    keyword. A fused alternation of all fields and a keyword tokenizer give identical output but
+    run about 2x slower (benchmarks/bench_feature_extractor.py).
+    """
+    text = str(text)
+
+    processor = None
+    m = (RYANS_PROCESSOR_RE if "Processor Type" in text else PROCESSOR_RE).search(text)
+    if m:
+        processor = m.group(1).strip()
+
+    m = RAM_RE.search(text)
+    ram = m.group(1).strip() + "GB" if m else None
+
+    m = STORAGE_RE.search(text)
+    storage = STORAGE_TAIL_RE.split(m.group(1).strip())[0].strip() if m else None
+
+    display = None
+    if "Display Size" in text:
+        m = RYANS_DISPLAY_RE.search(text)
+        if m:
+            display = m.group(1).strip() + " inch"
+    else:
+        m = DISPLAY_RE.search(text)
+        if m:
+            display = DISPLAY_TAIL_RE.split(m.group(1).strip())[0].strip()
+
+    return processor, ram, storage, display
+
+
+def numeric_specs(df: pd.DataFrame):
+    """
+    Derive typed spec columns from the extracted text fields and the cleaned price.
+    Unknown values are NaN (is_ssd is False); a price of 0 means "not listed" and is NaN too.
+    :return: DataFrame with float32 ram_gb, storage_gb, display_inch, price and a bool is_ssd.
+    """
+    def text_column(name):
+        if name in df.columns:
+            return df[name].astype("string")
+        return pd.Series(pd.NA, index=df.index, dtype="string")
+
+    ram = text_column('RAM').str.extract(RAM_GB_RE, expand=False)
+    storage = text_column('Storage')
+    size = storage.str.extract(STORAGE_SIZE_RE)
+    storage_gb = pd.to_numeric(size[0], errors='coerce') * np.where(size[1].str.upper().str.startswith('T').fillna(False), 1024, 1)
+    display = text_column('Display').str.extract(DISPLAY_INCH_RE, expand=False)
+    price = pd.to_numeric(df['Cleaned_Price'], errors='coerce') if 'Cleaned_Price' in df.columns else pd.Series(np.nan, index=df.index)
+
+    return pd.DataFrame({
+        'ram_gb': pd.to_numeric(ram, errors='coerce').astype(np.float32),
+        'storage_gb': storage_gb.astype(np.float32),
+        'is_ssd': storage.str.contains(SSD_RE).fillna(False).astype(bool),
+        'display_inch': pd.to_numeric(display, errors='coerce').astype(np.float32),
+        'price': price.where(price > 0).astype(np.float32),
+    }, index=df.index)
+
+
+def _extract_chunk(texts):
+    return [extract_tech_features(text) for text in texts]
+
+
 class FeatureExtractor:
     def __init__(self, df: pd.DataFrame):
         self.df = df.copy()
@@ -10,12 +98,12 @@ class FeatureExtractor:
         text = str(text)
         # For Ryans format: if "Processor Type" exists, capture text between "Processor Type" and "RAM"
         if "Processor Type" in text:
-            m = re.search(r'Processor Type\.?\s*[-:]\s*(.*?)\s*(?=RAM\s*[-:])', text, re.IGNORECASE)
+            m = RYANS_PROCESSOR_RE.search(text)
             if m:
                 return m.group(1).strip()
         else:
             # For Startech or generic, look for "Processor:" pattern.
-            m = re.search(r'Processor\s*[-:]\s*([^\n,]+)', text, re.IGNORECASE)
+            m = PROCESSOR_RE.search(text)
             if m:
                 return m.group(1).strip()
         return None
@@ -23,7 +111,7 @@ class FeatureExtractor:
     def extract_ram(self, text: str):
         text = str(text)
         # Look for pattern like "RAM - 16GB" (allowing optional spaces)
-        m = re.search(r'RAM\s*[-:]\s*([\d]+)\s*GB', text, re.IGNORECASE)
+        m = RAM_RE.search(text)
         if m:
             return m.group(1).strip() + "GB"
         return None
@@ -31,13 +119,13 @@ class FeatureExtractor:
     def extract_storage(self, text: str):
         text = str(text)
         # Look for "Storage" followed by a dash/colon and capture up to a delimiter.
-        m = re.search(r'Storage\s*[-:]\s*([^\n,;]+)', text, re.IGNORECASE)
+        m = STORAGE_RE.search(text)
         if m:
             storage_text = m.group(1).strip()
             # Remove extra parts by splitting on common keywords:
             # For example, if storage_text is "512GB Gen 4 SSD Graphics: NVIDIA RTX 4070 8GB GDDR6",
             # we want just "512GB Gen 4 SSD"
-            storage_clean = re.split(r'\s+(?:Graphics|Display|Licensed Application|Features|Camera)\b', storage_text, flags=re.IGNORECASE)[0]
+            storage_clean = STORAGE_TAIL_RE.split(storage_text)[0]
             return storage_clean.strip()
         return None
 
@@ -45,42 +133,54 @@ class FeatureExtractor:
         text = str(text)
         # First try for Ryans format: "Display Size (Inch) - <value>"
         if "Display Size" in text:
-            m = re.search(r'Display Size\s*\(Inch\)\s*[-:]\s*([\d\.]+)', text, re.IGNORECASE)
+            m = RYANS_DISPLAY_RE.search(text)
             if m:
                 # Optionally, you could capture more (e.g., additional words) if needed.
                 display_val = m.group(1).strip()
                 return display_val + " inch"
         else:
             # For Startech or generic format, look for "Display:" pattern.
-            m = re.search(r'Display\s*[-:]\s*([^\n]+)', text, re.IGNORECASE)
+            m = DISPLAY_RE.search(text)
             if m:
                 display_text = m.group(1).strip()
                 # Remove extra details after keywords such as "Licensed Application", "Graphics", "Features", etc.
-                display_clean = re.split(r'\s+(?:Licensed Application|Graphics|Features|Touch[-\s]?Screen|with)\b', display_text, flags=re.IGNORECASE)[0]
+                display_clean = DISPLAY_TAIL_RE.split(display_text)[0]
                 return display_clean.strip()
         return None
 
-    def extract_features(self):
-        processors = []
-        rams = []
-        storages = []
-        displays = []
-        
-        for tech_details in tqdm(self.df['Cleaned_Tech_Details'], desc="Extracting features"):
-            proc = self.extract_processor(tech_details)
-            ram = self.extract_ram(tech_details)
-            stor = self.extract_storage(tech_details)
-            disp = self.extract_display(tech_details)
-            
-            processors.append(proc)
-            rams.append(ram)
-            storages.append(stor)
-            displays.append(disp)
-        
-        self.df['Processor'] = processors
-        self.df['RAM'] = rams
-        self.df['Storage'] = storages
-        self.df['Display'] = displays
-        
-        print("[FeatureExtractor] Feature extraction complete.")
+    def extract_features(self, n_jobs=1, chunk_size=10000, verbose=True):
+        """
+        Extract Processor, RAM, Storage and Display from Cleaned_Tech_Details.
+        :param n_jobs: Worker processes for large frames (None or -1 = all cores). Rows are split
+                       into chunks of chunk_size; frames smaller than one chunk run in-process.
+        :param verbose: Show a progress bar and print when done (off when extracting many chunks
+                        under one progress bar).
+        """
+        with METRICS.stage("extract", rows_in=len(self.df)) as stage:
+            texts = self.df['Cleaned_Tech_Details'].tolist()
+            if n_jobs is None or n_jobs < 0:
+                n_jobs = os.cpu_count() or 1
+            chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+
+            if n_jobs > 1 and len(chunks) > 1:
+                with ProcessPoolExecutor(max_workers=min(n_jobs, len(chunks))) as executor:
+                    results = executor.map(_extract_chunk, chunks)
+                    features = [row for chunk in tqdm(results, total=len(chunks), desc="Extracting features", disable=not verbose) for row in chunk]
+            else:
+                features = [extract_tech_features(text) for text in tqdm(texts, desc="Extracting features", disable=not verbose)]
+
+            processors, rams, storages, displays = zip(*features) if features else ([], [], [], [])
+            self.df['Processor'] = list(processors)
+            self.df['RAM'] = list(rams)
+            self.df['Storage'] = list(storages)
+            self.df['Display'] = list(displays)
+
+            # Typed columns for filtering: ram_gb, storage_gb, is_ssd, display_inch, price
+            with METRICS.timer("extract_numeric_specs_seconds"):
+                specs = numeric_specs(self.df)
+            self.df[specs.columns] = specs
+            stage.rows_out = len(self.df)
+
+        if verbose:
+            print("[FeatureExtractor] Feature extraction complete.")
         return self.df
@@ -0,0 +1,436 @@
+import atexit
+import contextlib
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+METRIC_PREFIX = "laptop_"
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+def rss_bytes():
+    """
+    Current resident set size of this process, or None where /proc is not available.
+    """
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def peak_rss_bytes():
+    """
+    Peak resident set size of this process so far (ru_maxrss is KB on Linux, bytes on macOS).
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def memory_snapshot():
+    """
+    Current and peak RSS in MB, plus traced Python allocations when tracemalloc is running.
+    """
+    import tracemalloc
+
+    snapshot = {"rss_mb": None, "peak_rss_mb": None}
+    for key, value in (("rss_mb", rss_bytes()), ("peak_rss_mb", peak_rss_bytes())):
+        if value is not None:
+            snapshot[key] = round(value / 2 ** 20, 1)
+    if tracemalloc.is_tracing():
+        current, peak = tracemalloc.get_traced_memory()
+        snapshot["traced_mb"] = round(current / 2 ** 20, 1)
+        snapshot["traced_peak_mb"] = round(peak / 2 ** 20, 1)
+    return snapshot
+
+
+def _escape_label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _key(name, labels):
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _quantiles(recent):
+    # Imported here: every entry script imports this module for its --metrics flags,
+    # and `cli.py info` / `--help` must not pay for numpy
+    import numpy as np
+
+    recent = np.fromiter(recent, dtype=np.float64)
+    return [(q, float(np.quantile(recent, q))) for q in QUANTILES]
+
+
+class MetricsRegistry:
+    def __init__(self, reservoir_size=10000):
+        """
+        Thread-safe in-process metrics: counters, gauges and timing summaries (count, sum, max and
+        a bounded reservoir of recent observations for percentiles), each with optional labels.
+        Stages can also write one JSON line per event (configure(json_log=...)) and be profiled
+        with cProfile or tracemalloc (configure(profile=[...])).
+        """
+        self.reservoir_size = reservoir_size
+        self.counters = {}
+        self.gauges = {}
+        self.summaries = {}
+        self.json_log = None
+        self.profile = set()
+        self.profile_mode = "cprofile"
+        self.profile_dir = "outputs/profiles"
+        self.metrics_file = None
+        self._lock = threading.Lock()
+        self._log_lock = threading.Lock()
+
+    def configure(self, json_log=None, profile=None, profile_mode=None, profile_dir=None, metrics_file=None):
+        """
+        :param json_log: File to append JSON events to ("-" for stdout).
+        :param profile: Stage names to profile, or ["all"].
+        :param profile_mode: "cprofile" (call graph, saved as .prof for snakeviz/pstats)
+                             or "tracemalloc" (top allocating lines, saved as .txt).
+        :param profile_dir: Where profiles are written.
+        :param metrics_file: Write all metrics here when the process exits
+                             (Prometheus text for .prom files, JSON otherwise).
+        """
+        if json_log is not None:
+            self.json_log = json_log
+        if profile is not None:
+            self.profile = set(profile)
+        if profile_mode is not None:
+            if profile_mode not in ("cprofile", "tracemalloc"):
+                raise ValueError(f"Unknown profile mode '{profile_mode}' (use cprofile or tracemalloc)")
+            self.profile_mode = profile_mode
+        if profile_dir is not None:
+            self.profile_dir = profile_dir
+        if metrics_file is not None:
+            if self.metrics_file is None:
+                atexit.register(self.write_metrics_file)
+            self.metrics_file = metrics_file
+
+    def configure_from_env(self):
+        """
+        Opt-in settings without code changes: LAPTOP_METRICS_FILE, LAPTOP_METRICS_LOG, LAPTOP_PROFILE
+        (comma-separated stage names or "all"), LAPTOP_PROFILE_MODE and LAPTOP_PROFILE_DIR.
+        """
+        profile = os.environ.get("LAPTOP_PROFILE")
+        self.configure(
+            json_log=os.environ.get("LAPTOP_METRICS_LOG"),
+            profile=[name.strip() for name in profile.split(",") if name.strip()] if profile else None,
+            profile_mode=os.environ.get("LAPTOP_PROFILE_MODE"),
+            profile_dir=os.environ.get("LAPTOP_PROFILE_DIR"),
+            metrics_file=os.environ.get("LAPTOP_METRICS_FILE"),
+        )
+
+    def inc(self, name, value=1, **labels):
+        key = _key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def set_gauge(self, name, value, **labels):
+        with self._lock:
+            self.gauges[_key(name, labels)] = value
+
+    def observe(self, name, value, **labels):
+        key = _key(name, labels)
+        with self._lock:
+            summary = self.summaries.get(key)
+            if summary is None:
+                summary = self.summaries[key] = {"count": 0, "sum": 0.0, "max": 0.0,
+                                                 "recent": deque(maxlen=self.reservoir_size)}
+            summary["count"] += 1
+            summary["sum"] += value
+            summary["max"] = max(summary["max"], value)
+            summary["recent"].append(value)
+
+    def timer(self, name, **labels):
+        """
+        Time a block or function into the summary `name` (in seconds):
+            with METRICS.timer("query_encode_seconds"): ...
+            @METRICS.timer("swot_request_seconds")
+        """
+        return Timer(self, name, labels)
+
+    def log_event(self, event, **fields):
+        """
+        Write one structured JSON line (when a JSON log is configured).
+        """
+        if not self.json_log:
+            return
+        line = json.dumps({"ts": time.strftime("%Y-%m-%dT%H:%M:%S"), "event": event, **fields}, default=str)
+        with self._log_lock:
+            if self.json_log == "-":
+                print(line, flush=True)
+            else:
+                if os.path.dirname(self.json_log):
+                    os.makedirs(os.path.dirname(self.json_log), exist_ok=True)
+                with open(self.json_log, "a") as f:
+                    f.write(line + "\n")
+
+    @contextlib.contextmanager
+    def stage(self, name, rows_in=None):
+        """
+        Instrument one processing step: wall time, rows in/out, RSS before/after and the peak RSS,
+        plus a profile when the stage is selected for profiling. Set `s.rows_out` on the
+        yielded object to record the output size.
+            with METRICS.stage("clean", rows_in=len(df)) as s:
+                ...
+                s.rows_out = len(cleaned)
+        """
+        record = StageRecord(name, rows_in)
+        profiler = self._start_profile(name)
+        rss_before = rss_bytes()
+        start = time.perf_counter()
+        status = "ok"
+        try:
+            yield record
+        except BaseException:
+            status = "error"
+            raise
+        finally:
+            seconds = time.perf_counter() - start
+            rss_after = rss_bytes()
+            profile_file = self._stop_profile(name, profiler)
+            self.observe("stage_seconds", seconds, stage=name)
+            self.inc("stage_runs_total", stage=name, status=status)
+            if rows_in is not None:
+                self.inc("stage_rows_in_total", rows_in, stage=name)
+            if record.rows_out is not None:
+                self.inc("stage_rows_out_total", record.rows_out, stage=name)
+            if rss_after is not None:
+                self.set_gauge("stage_rss_bytes", rss_after, stage=name)
+            peak = peak_rss_bytes()
+            if peak is not None:
+                self.set_gauge("process_peak_rss_bytes", peak)
+            rows = record.rows_out if record.rows_out is not None else rows_in
+            self.log_event(
+                "stage", stage=name, status=status, seconds=round(seconds, 4), rows_in=rows_in, rows_out=record.rows_out,
+                rows_per_second=round(rows / seconds, 1) if rows and seconds else None,
+                rss_delta_mb=round((rss_after - rss_before) / 2 ** 20, 1) if rss_after is not None and rss_before is not None else None,
+                **record.extra, **memory_snapshot(), profile=profile_file,
+            )
+
+    def _start_profile(self, name):
+        if not (self.profile & {name, "all"}):
+            return None
+        if self.profile_mode == "tracemalloc":
+            import tracemalloc
+
+            started = not tracemalloc.is_tracing()
+            if started:
+                tracemalloc.start(10)
+            tracemalloc.reset_peak()
+            return ("tracemalloc", started)
+        import cProfile
+
+        # cProfile only sees the calling thread; worker-pool stages show up as waiting on futures
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:  # another profiler is already active (nested profiled stages)
+            return None
+        return ("cprofile", profiler)
+
+    def _stop_profile(self, name, profiler):
+        if profiler is None:
+            return None
+        os.makedirs(self.profile_dir, exist_ok=True)
+        path = os.path.join(self.profile_dir, f"{name.replace(':', '_')}-{time.strftime('%Y%m%d-%H%M%S')}")
+        mode, handle = profiler
+        if mode == "cprofile":
+            handle.disable()
+            path += ".prof"
+            handle.dump_stats(path)
+        else:
+            import tracemalloc
+
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            if handle:
+                tracemalloc.stop()
+            path += ".tracemalloc.txt"
+            with open(path, "w") as f:
+                f.write(f"Traced peak: {peak / 2 ** 20:.1f} MB\n\n")
+                for stat in snapshot.statistics("lineno")[:25]:
+                    f.write(f"{stat}\n")
+            self.set_gauge("stage_traced_peak_bytes", peak, stage=name)
+        print(f"[Instrumentation] {self.profile_mode} profile of '{name}' saved to {path}")
+        return path
+
+    def snapshot(self):
+        """
+        All metrics as a JSON-serializable dict.
+        """
+        def labelled(key, **values):
+            name, labels = key
+            return {"name": name, "labels": dict(labels), **values}
+
+        with self._lock:
+            summaries = []
+            for key, summary in self.summaries.items():
+                summaries.append(labelled(
+                    key, count=summary["count"], sum=round(summary["sum"], 6), max=round(summary["max"], 6),
+                    **{f"p{int(q * 100)}": round(value, 6) for q, value in _quantiles(summary["recent"])},
+                ))
+            return {
+                "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "counters": [labelled(key, value=value) for key, value in self.counters.items()],
+                "gauges": [labelled(key, value=value) for key, value in self.gauges.items()],
+                "summaries": summaries,
+                "memory": memory_snapshot(),
+            }
+
+    def write_json(self, path):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.snapshot(), f, indent=4)
+        print(f"✅ [Instrumentation] Metrics saved to {path}")
+
+    def prometheus_text(self):
+        """
+        All metrics in the Prometheus text exposition format (summaries with 0.5/0.95/0.99 quantiles).
+        """
+        def series(name, labels, extra=()):
+            pairs = list(labels) + list(extra)
+            if not pairs:
+                return METRIC_PREFIX + name
+            formatted = ",".join(f'{k}="{_escape_label(v)}"' for k, v in pairs)
+            return f"{METRIC_PREFIX}{name}{{{formatted}}}"
+
+        lines = []
+        with self._lock:
+            for kind, metrics in (("counter", self.counters), ("gauge", self.gauges)):
+                for name in sorted({name for name, _ in metrics}):
+                    lines.append(f"# TYPE {METRIC_PREFIX}{name} {kind}")
+                    for (metric, labels), value in metrics.items():
+                        if metric == name:
+                            lines.append(f"{series(name, labels)} {value}")
+            for name in sorted({name for name, _ in self.summaries}):
+                lines.append(f"# TYPE {METRIC_PREFIX}{name} summary")
+                for (metric, labels), summary in self.summaries.items():
+                    if metric != name:
+                        continue
+                    for q, value in _quantiles(summary["recent"]):
+                        lines.append(f"{series(name, labels, [('quantile', q)])} {value:.6g}")
+                    lines.append(f"{series(name + '_sum', labels)} {summary['sum']:.6g}")
+                    lines.append(f"{series(name + '_count', labels)} {summary['count']}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        """
+        Write the Prometheus text, e.g. for the node_exporter textfile collector.
+        """
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(self.prometheus_text())
+        print(f"✅ [Instrumentation] Metrics saved to {path}")
+
+    def write_metrics_file(self, path=None):
+        path = path or self.metrics_file
+        if path:
+            (self.write_prometheus if path.endswith(".prom") else self.write_json)(path)
+
+    def serve(self, host="127.0.0.1", port=9108):
+        """
+        Serve GET /metrics (Prometheus text) and /metrics.json from a daemon thread, for batch jobs
+        such as crawls and pipeline runs. Returns the server; call shutdown() to stop it.
+        """
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == "/metrics":
+                    body, content_type = registry.prometheus_text(), "text/plain; version=0.0.4"
+                elif self.path == "/metrics.json":
+                    body, content_type = json.dumps(registry.snapshot()), "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                data = body.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        print(f"✅ [Instrumentation] Metrics at http://{host}:{port}/metrics")
+        return server
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.gauges.clear()
+            self.summaries.clear()
+
+
+class StageRecord:
+    def __init__(self, name, rows_in=None):
+        self.name = name
+        self.rows_in = rows_in
+        self.rows_out = None
+        self.extra = {}  # additional fields for the JSON event
+
+
+class Timer:
+    def __init__(self, registry, name, labels):
+        self.registry = registry
+        self.name = name
+        self.labels = labels
+        self._starts = threading.local()
+
+    def __enter__(self):
+        self._starts.__dict__.setdefault("stack", []).append(time.perf_counter())
+        return self
+
+    def __exit__(self, *exc):
+        self.registry.observe(self.name, time.perf_counter() - self._starts.stack.pop(), **self.labels)
+
+    def __call__(self, fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with self:
+                return fn(*args, **kwargs)
+        return wrapper
+
+
+def add_metrics_arguments(parser):
+    """
+    Shared --metrics/--metrics-log/--metrics-port/--profile options for the entry scripts.
+    """
+    group = parser.add_argument_group("metrics")
+    group.add_argument("--metrics", help="Write all metrics here on exit (.prom for Prometheus text, JSON otherwise).")
+    group.add_argument("--metrics-log", help="Append one JSON line per stage to this file ('-' for stdout).")
+    group.add_argument("--metrics-port", type=int, help="Serve Prometheus metrics on this port while running.")
+    group.add_argument("--profile", nargs="+", metavar="STAGE", help="Profile these stages ('all' for every stage).")
+    group.add_argument("--profile-mode", choices=["cprofile", "tracemalloc"], default=None)
+    return parser
+
+
+def apply_metrics_arguments(args):
+    METRICS.configure(json_log=args.metrics_log, profile=args.profile, profile_mode=args.profile_mode,
+                      metrics_file=args.metrics)
+    if args.metrics_port:
+        METRICS.serve(port=args.metrics_port)
+
+
+# Process-wide registry used by every component
+METRICS = MetricsRegistry()
+METRICS.configure_from_env()
@@ -0,0 +1,122 @@
+import os
+import shutil
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+
+def dataframe_to_arrow(df: pd.DataFrame):
+    """
+    Convert a laptop DataFrame to an Arrow table.
+    Object columns can hold mixed values (e.g. Ryans prices are numbers, Startech prices are
+    strings), so they are stored as strings with missing values kept as nulls.
+    """
+    df = df.reset_index(drop=True).copy()
+    for col in df.columns:
+        if df[col].dtype == object:
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+
+def write_table(df: pd.DataFrame, path, excel=False):
+    """
+    Save a pipeline stage's output as Parquet (typed columns, zstd-compressed).
+    :param excel: Also export a human-readable .xlsx copy next to it.
+    """
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    pq.write_table(dataframe_to_arrow(df), path, compression="zstd")
+    if excel:
+        excel_path = os.path.splitext(path)[0] + ".xlsx"
+        df.to_excel(excel_path, index=False)
+        print(f"[io] Excel report saved to {excel_path}")
+
+
+def read_table(path):
+    """
+    Load a pipeline stage's output: a Parquet file or dataset directory, an Arrow IPC file,
+    or an Excel workbook. A missing .parquet falls back to the .xlsx of the same name,
+    for data prepared before the switch to Parquet.
+    """
+    if not os.path.exists(path) and path.endswith(".parquet"):
+        excel_path = os.path.splitext(path)[0] + ".xlsx"
+        if os.path.exists(excel_path):
+            print(f"⚠️ [io] {path} not found, reading {excel_path} instead.")
+            path = excel_path
+    if path.endswith((".xlsx", ".xls")):
+        return pd.read_excel(path)
+    if path.endswith((".arrow", ".feather")):
+        return pd.read_feather(path)
+    return pd.read_parquet(path)
+
+
+class ParquetAppender:
+    def __init__(self, path, compression="zstd"):
+        """
+        Append DataFrame chunks to one Parquet file. The schema is fixed by the first chunk
+        (all-empty columns are typed as strings) and later chunks are cast to it.
+        Chunks go to a hidden temporary file (ignored by dataset readers) that replaces path on
+        close(); leaving a with block on an exception discards it and keeps the old file.
+        Closing without any chunk written removes the old file, as its rows are no longer current.
+        """
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.tmp_path = os.path.join(os.path.dirname(path), "." + os.path.basename(path) + ".tmp")
+        self.compression = compression
+        self.writer = None
+        self.schema = None
+        self.rows = 0
+
+    def write(self, df):
+        table = dataframe_to_arrow(df)
+        if self.writer is None:
+            self.schema = pa.schema([
+                field.with_type(pa.string()) if pa.types.is_null(field.type) else field
+                for field in table.schema
+            ])
+            self.writer = pq.ParquetWriter(self.tmp_path, self.schema, compression=self.compression)
+        table = table.select(self.schema.names).cast(self.schema)
+        self.writer.write_table(table)
+        self.rows += len(df)
+
+    def close(self, discard=False):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+            if discard:
+                os.remove(self.tmp_path)
+            else:
+                os.replace(self.tmp_path, self.path)
+        elif not discard and os.path.exists(self.path):
+            # No rows (e.g. an empty source file): there is no schema to write an empty file with
+            os.remove(self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        self.close(discard=exc_type is not None)
+
+
+def part_path(dataset_dir, source_file, overwrite=False):
+    """
+    Path of the part file holding the rows of one source file in a Parquet dataset directory
+    (read back whole with pd.read_parquet(dataset_dir)). Processing the same source again
+    replaces its part instead of adding duplicate rows.
+    :param overwrite: Remove the existing parts first, so the dataset holds only this run's sources.
+    """
+    if overwrite and os.path.isdir(dataset_dir):
+        shutil.rmtree(dataset_dir)
+    os.makedirs(dataset_dir, exist_ok=True)
+    return os.path.join(dataset_dir, f"part-{os.path.splitext(os.path.basename(source_file))[0]}.parquet")
+
+
+def newest_table(*paths):
+    """
+    The most recently written of several tables (files or dataset directories) that may hold the
+    same data, e.g. the single-file and the streamed output of data_prepare.py; None if none exists.
+    """
+    existing = [path for path in paths if os.path.exists(path)]
+    return max(existing, key=os.path.getmtime) if existing else None
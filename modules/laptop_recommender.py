@@ -1,44 +1,132 @@
 import json
-import pickle
+import os
 
+import numpy as np
 import pandas as pd
-import torch
-from sentence_transformers import SentenceTransformer
+
+from modules.bulk_encoder import BulkEncoder, build_texts
+from modules.embedding_cache import content_hash
+from modules.embedding_model import load_model
+from modules.embedding_store import load_embedding_index, save_embedding_index
+from modules.instrumentation import METRICS
+from modules.vector_index import build_index
 
 
 class LaptopRecommender:
-    def __init__(self, model_name="all-MiniLM-L6-v2"):
+    def __init__(self, model_name="all-MiniLM-L6-v2", workers=0, batch_size=64):
         """
         Initialize the Laptop Recommender with a Sentence Transformer model.
+        The model (and torch) is only loaded when texts are first encoded.
+        :param workers: Encode through a BulkEncoder of this many worker processes (length-sorted
+                        batches, one copy of the same model each) for large catalogs; 0 sends
+                        all texts through a single model.encode call. close() stops the workers.
+        :param batch_size: Texts per forward pass in the BulkEncoder workers.
+        """
+        self.model_name = model_name
+        self.encoder = BulkEncoder(model_name, workers=workers, batch_size=batch_size) if workers else None
+
+    def close(self):
+        if self.encoder is not None:
+            self.encoder.close()
+
+    @property
+    def model(self):
+        return load_model(self.model_name)
+
+    def combine_texts(self, df, text_cols):
+        """
+        Concatenate the text columns of every row into the text that gets embedded.
+        """
+        return build_texts(df, text_cols)
+
+    def encode_texts(self, texts):
+        """
+        Encode a list of texts into a float32 embedding matrix.
         """
-        self.model = SentenceTransformer(model_name)
+        with METRICS.timer("embed_encode_seconds"):
+            if self.encoder is not None:
+                embeddings = self.encoder.encode(texts)
+            else:
+                embeddings = self.model.encode(list(texts), convert_to_numpy=True)
+        METRICS.inc("embed_encoded_total", len(embeddings))
+        return np.asarray(embeddings, dtype=np.float32)
 
-    def generate_embeddings(self, df, text_cols):
+    def generate_embeddings(self, df, text_cols, cache=None):
         """
         Generate embeddings for selected text columns and store them in the dataframe.
         :param df: DataFrame containing laptop details.
         :param text_cols: List of columns to generate embeddings from.
-        :return: DataFrame with an added 'Embedding' column containing list-based text embeddings.
+        :param cache: Optional EmbeddingCache; only rows whose text is new or changed are encoded,
+                      and cache entries for products no longer in df are evicted.
+        :return: DataFrame with an added 'Embedding' column containing per-row float32 text embeddings.
         """
-        combined_texts = df[text_cols].astype(str).agg(' '.join, axis=1)
-        embeddings = self.model.encode(combined_texts, convert_to_numpy=True)
-        df['Embedding'] = embeddings.tolist()
+        with METRICS.stage("embed", rows_in=len(df)) as stage:
+            combined_texts = self.combine_texts(df, text_cols)
+
+            if cache is None:
+                embeddings = self.encode_texts(combined_texts)
+            else:
+                hashes = [content_hash(text) for text in combined_texts]
+                hits = cache.lookup(hashes)
+                misses = hits < 0
+                new_embeddings = self.encode_texts(combined_texts[misses]) if misses.any() else []
+                embeddings = cache.update(hashes, hits, new_embeddings)
+                cache.save()
+                METRICS.inc("embed_cache_hits_total", len(df) - int(misses.sum()))
+                stage.extra["cache_hits"] = len(df) - int(misses.sum())
+                print(f"[LaptopRecommender] Encoded {int(misses.sum())} new/changed of {len(df)} laptops "
+                      f"({len(df) - int(misses.sum())} from cache).")
+
+            df['Embedding'] = list(embeddings)
+            stage.rows_out = len(df)
         return df
 
-    def save_embeddings(self, df, embedding_file="data/processed/laptop_embeddings.pkl", config_file="config/recommender_config.json"):
+    def save_embeddings(self, df, index_dir="data/processed/laptop_index", config_file="config/recommender_config.json", index_config=None):
+        """
+        Save embeddings as a memory-mappable index directory, build the search index and
+        record both in the JSON config. Existing config entries (e.g. the query) are kept.
+        :param index_config: Search backend and its params, e.g. {"backend": "ivf", "n_lists": 64, "n_probe": 8}.
+                             Defaults to the "index" entry of the existing config, or the exact backend.
+        """
+        self.save_embedding_store(df, index_dir)
+        self.build_search_index(index_dir, config_file, index_config)
+
+    def save_embedding_store(self, df, index_dir="data/processed/laptop_index"):
         """
-        Save embeddings as a Pickle file and create a JSON config file.
+        Write the embeddings and laptop metadata to a memory-mappable index directory.
         """
-        # Save embeddings as a Pickle file
-        with open(embedding_file, "wb") as f:
-            pickle.dump(df, f)
-        print(f"✅ Embeddings saved to {embedding_file}")
+        embeddings = np.vstack(df['Embedding'].to_numpy())
+        metadata = df.drop(columns=['Embedding'])
+        manifest = save_embedding_index(index_dir, embeddings, metadata, self.model_name)
+        print(f"✅ Embeddings saved to {index_dir} ({manifest['row_count']} x {manifest['dimension']})")
+        return manifest
+
+    @staticmethod
+    def build_search_index(index_dir="data/processed/laptop_index", config_file="config/recommender_config.json", index_config=None):
+        """
+        Build the search index over a saved embedding store and record it in the JSON config.
+        Needs no model, so it can be re-run on its own when only the index settings change.
+        """
+        config_data = {}
+        if os.path.exists(config_file):
+            with open(config_file, "r") as f:
+                config_data = json.load(f)
+
+        # Build the search index over the normalized matrix that was written
+        index_config = dict(index_config or config_data.get("index", {"backend": "exact"}))
+        backend = index_config.pop("backend", "exact")
+        normalized_embeddings, _, _ = load_embedding_index(index_dir)
+        index = build_index(normalized_embeddings, backend, **index_config)
+        index.save(index_dir)
+        print(f"✅ '{backend}' search index saved to {index_dir}")
 
-        # Save metadata in a JSON config
-        config_data = {
-            "embedding_file": embedding_file,
-            "query": ""
-        }
+        # Save metadata in a JSON config. "index" keeps the requested settings (what the pipeline
+        # fingerprints); the params of the index that was built, defaults included, go to "built_index".
+        config_data.pop("embedding_file", None)
+        config_data["index_dir"] = index_dir
+        config_data["index"] = {"backend": backend, **index_config}
+        config_data["built_index"] = {"backend": backend, **index.params()}
+        config_data.setdefault("query", "")
         with open(config_file, "w") as f:
             json.dump(config_data, f, indent=4)
         print(f"✅ Config saved to {config_file}")
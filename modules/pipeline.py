@@ -0,0 +1,360 @@
+import glob
+import hashlib
+import json
+import os
+import time
+
+import pandas as pd
+
+from modules.instrumentation import METRICS
+from modules.io_utils import read_table, write_table
+
+ROW_HASH = "row_hash"
+
+
+def row_hashes(df, columns):
+    """
+    64-bit content hash of each row over the given columns; rows with the same values get the same hash.
+    """
+    columns = [column for column in columns if column in df.columns]
+    return pd.util.hash_pandas_object(df[columns].astype(str), index=False).to_numpy()
+
+
+def code_version(*modules):
+    """
+    Short hash of the source files of the given modules, so a code change invalidates the
+    results computed by the previous version.
+    """
+    digest = hashlib.sha256()
+    for module in modules:
+        with open(module.__file__, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def apply_delta(df, previous_path, transform, label, full=False, version=None):
+    """
+    Run transform only on the rows of df whose row_hash is not in the previous output;
+    every other row is copied from previous_path. Row order follows df.
+    :param full: Ignore the previous output and transform every row.
+    :param version: Code version of the transform (see code_version), stored in a
+                    "<label>_version" column; previous rows of another version are recomputed.
+    """
+    version_column = f"{label}_version"
+    previous = None
+    if not full and os.path.exists(previous_path):
+        previous = read_table(previous_path)
+        if ROW_HASH not in previous.columns:
+            previous = None
+        elif version is not None:
+            previous = previous[previous[version_column] == version] if version_column in previous.columns else None
+
+    if previous is None:
+        known = pd.Series(False, index=df.index)
+    else:
+        columns = previous.columns
+        previous = previous.drop_duplicates(ROW_HASH).set_index(ROW_HASH)
+        known = df[ROW_HASH].isin(previous.index)
+
+    parts = []
+    if known.any():
+        reused = previous.loc[df.loc[known, ROW_HASH]].reset_index()[columns]
+        reused.index = df.index[known]
+        parts.append(reused)
+    if (~known).any():
+        changed = transform(df[~known].copy())
+        changed.index = df.index[~known]
+        if version is not None:
+            changed[version_column] = version
+        parts.append(changed)
+
+    print(f"[Pipeline] {label}: {int((~known).sum())} new/changed rows, {int(known.sum())} reused")
+    return pd.concat(parts).sort_index().reset_index(drop=True) if parts else df.iloc[0:0]
+
+
+def fingerprint(paths, params=None):
+    """
+    Content fingerprint of a stage's inputs: the sha256 of every input file (glob patterns and
+    directories are expanded) plus the stage parameters. Missing inputs are part of the fingerprint too.
+    """
+    digest = hashlib.sha256(json.dumps(params, sort_keys=True, default=str).encode("utf-8"))
+    # Expand patterns and directories first, then hash
+    files = []
+    for pattern in paths:
+        for path in sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]:
+            if os.path.isdir(path):
+                files.extend(sorted(os.path.join(root, name) for root, _, names in os.walk(path) for name in names))
+            else:
+                files.append(path)
+    for path in files:
+        digest.update(path.encode("utf-8"))
+        if not os.path.exists(path):
+            digest.update(b"<missing>")
+            continue
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+class Stage:
+    def __init__(self, name, run, inputs, outputs, params=None):
+        """
+        One pipeline step.
+        :param run: Callable doing the work; it reads inputs and writes outputs itself. Called with
+                    full=True when the run is forced, so it must not reuse previous results.
+                    It may return the number of items that failed; the stage then stays out of
+                    date, so the next run retries them even if the inputs are unchanged.
+        :param inputs: Files, directories or glob patterns the stage reads. Stages producing
+                       one of these as an output run first.
+        :param outputs: Files or directories the stage writes.
+        :param params: Settings that change the result, folded into the fingerprint
+                       (or a callable returning them, evaluated at fingerprint time).
+        """
+        self.name = name
+        self.run = run
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.params = params
+
+    def fingerprint(self):
+        params = self.params() if callable(self.params) else self.params
+        return fingerprint(self.inputs, {"stage": self.name, "params": params})
+
+
+class Pipeline:
+    def __init__(self, stages, state_file="data/processed/pipeline_state.json"):
+        """
+        Runs stages in dependency order and skips a stage when the fingerprint of its inputs
+        matches the last successful run and its outputs still exist.
+        """
+        self.stages = {stage.name: stage for stage in stages}
+        self.state_file = state_file
+        self.state = {}
+        if os.path.exists(state_file):
+            with open(state_file, "r") as f:
+                self.state = json.load(f)
+
+    def dependencies(self, stage):
+        producers = {output: other.name for other in self.stages.values() for output in other.outputs}
+        return [producers[path] for path in stage.inputs if path in producers and producers[path] != stage.name]
+
+    def order(self, targets=None):
+        """
+        Stages needed for targets (default: all), upstream stages first.
+        """
+        ordered = []
+
+        def visit(name, path=()):
+            if name in path:
+                raise ValueError(f"Pipeline stages form a cycle: {' -> '.join(path + (name,))}")
+            if name in ordered:
+                return
+            for dependency in self.dependencies(self.stages[name]):
+                visit(dependency, path + (name,))
+            ordered.append(name)
+
+        for name in targets or self.stages:
+            if name not in self.stages:
+                raise ValueError(f"Unknown stage '{name}'. Available: {', '.join(self.stages)}")
+            visit(name)
+        return ordered
+
+    def is_current(self, stage):
+        record = self.state.get(stage.name)
+        return (
+            record is not None
+            and not record.get("failed")
+            and record["fingerprint"] == stage.fingerprint()
+            and all(os.path.exists(path) for path in stage.outputs)
+        )
+
+    def save_state(self):
+        if os.path.dirname(self.state_file):
+            os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
+        tmp_file = self.state_file + ".tmp"
+        with open(tmp_file, "w") as f:
+            json.dump(self.state, f, indent=4)
+        os.replace(tmp_file, self.state_file)
+
+    def run(self, targets=None, force=False, dry_run=False):
+        """
+        :param force: Run every selected stage even if it is up to date.
+        :param dry_run: Only report which stages would run.
+        :return: Names of the stages that ran (or would run).
+        """
+        ran = []
+        for name in self.order(targets):
+            stage = self.stages[name]
+            if not force and self.is_current(stage):
+                print(f"⏭️ [Pipeline] {name}: up to date, skipped")
+                METRICS.inc("pipeline_stages_skipped_total", stage=name)
+                continue
+            ran.append(name)
+            if dry_run:
+                print(f"🔜 [Pipeline] {name}: would run")
+                continue
+
+            print(f"▶️ [Pipeline] {name}: running")
+            # Fingerprint the inputs the run is about to read (upstream stages have already run),
+            # so an input changed while the stage runs makes it run again next time
+            inputs_fingerprint = stage.fingerprint()
+            start = time.perf_counter()
+            with METRICS.stage(f"pipeline:{name}"):
+                failed = stage.run(full=force) or 0
+            self.state[name] = {
+                "fingerprint": inputs_fingerprint,
+                "seconds": round(time.perf_counter() - start, 3),
+                "finished_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "failed": failed,
+            }
+            self.save_state()
+            if failed:
+                print(f"⚠️ [Pipeline] {name}: done in {self.state[name]['seconds']}s, {failed} failed (retried on the next run)")
+            else:
+                print(f"✅ [Pipeline] {name}: done in {self.state[name]['seconds']}s")
+        return ran
+
+
+def build_laptop_pipeline(data_folder="data/raw", processed_folder="data/processed",
+                          index_dir="data/processed/laptop_index", config_file="config/recommender_config.json",
+                          output_folder="outputs", swot_requests_per_minute=15, embed_workers=0):
+    """
+    The laptop pipeline: ingest -> clean -> extract -> embed -> index -> report, plus match
+    (cross-retailer product matching on the embeddings), history (one price snapshot per crawl date) and swot.
+    Clean, extract, embed and swot only process rows whose content changed since the last run
+    (swot through its response cache).
+    Heavy dependencies (the sentence transformer, Gemini) are imported inside the stages that use them.
+    :param embed_workers: Encode with a BulkEncoder pool of this many processes (0: a single model.encode call).
+    """
+    ingested_file = os.path.join(processed_folder, "ingested.parquet")
+    cleaned_file = os.path.join(processed_folder, "combined_data_cleaned.parquet")
+    features_file = os.path.join(processed_folder, "feature_extracted.parquet")
+    manifest_file = os.path.join(index_dir, "manifest.json")
+    report_file = os.path.join(output_folder, "recommendation_report.txt")
+    swot_file = os.path.join(output_folder, "laptops_swot_output.parquet")
+    matches_file = os.path.join(processed_folder, "product_matches.parquet")
+    history_dir = os.path.join(processed_folder, "price_history")
+    raw_files = os.path.join(data_folder, "*.csv")
+    text_cols = ["Product Name", "Cleaned_Tech_Details", "Cleaned_Description"]
+
+    def ingest(full=False):
+        from modules.data_ingestor import RAW_COLUMNS, DataIngestor
+
+        df = DataIngestor(data_folder).load_data()
+        df[ROW_HASH] = row_hashes(df, RAW_COLUMNS)
+        write_table(df, ingested_file)
+
+    def cleaner_version():
+        from modules import data_cleaner
+
+        return code_version(data_cleaner)
+
+    def extractor_version():
+        # Extract reuses rows by the ingest row_hash, so a cleaner change must invalidate them too
+        from modules import data_cleaner, feature_extractor
+
+        return code_version(data_cleaner, feature_extractor)
+
+    def clean(full=False):
+        from modules.data_cleaner import DataCleaner
+
+        df = apply_delta(read_table(ingested_file), cleaned_file, lambda rows: DataCleaner(rows).clean_data(), "clean", full,
+                         version=cleaner_version())
+        write_table(df, cleaned_file)
+
+    def extract(full=False):
+        from modules.feature_extractor import FeatureExtractor
+
+        df = apply_delta(read_table(cleaned_file), features_file, lambda rows: FeatureExtractor(rows).extract_features(), "extract", full,
+                         version=extractor_version())
+        write_table(df, features_file)
+
+    def embed(full=False):
+        from modules.embedding_cache import EmbeddingCache
+        from modules.laptop_recommender import LaptopRecommender
+
+        df = read_table(features_file)
+        recommender = LaptopRecommender(workers=embed_workers)
+        # The embedding cache is keyed by text hash, so only new/changed laptops are encoded
+        cache = None if full else EmbeddingCache(os.path.join(processed_folder, "embedding_cache"), model_name=recommender.model_name)
+        try:
+            df = recommender.generate_embeddings(df, text_cols=text_cols, cache=cache)
+        finally:
+            recommender.close()
+        recommender.save_embedding_store(df, index_dir)
+
+    def index(full=False):
+        from modules.laptop_recommender import LaptopRecommender
+
+        LaptopRecommender.build_search_index(index_dir, config_file)
+
+    def report(full=False):
+        from modules.query_processor import QueryProcessor
+
+        os.makedirs(output_folder, exist_ok=True)
+        query_processor = QueryProcessor(config_path=config_file)
+        if query_processor.config.get("query"):
+            query_processor.generate_recommendation_report(report_file)
+        if query_processor.get_config_queries():
+            query_processor.generate_batch_recommendation_report(
+                output_file=os.path.join(output_folder, "batch_recommendation_report.txt")
+            )
+
+    def match(full=False):
+        from modules.product_matcher import match_products
+
+        match_products(index_dir, matches_file)
+
+    def crawl_date():
+        from modules.price_history import crawl_date_of
+
+        return crawl_date_of(glob.glob(raw_files))
+
+    def history(full=False):
+        from modules.price_history import PriceHistory
+
+        PriceHistory(history_dir).append_snapshot(read_table(cleaned_file), crawl_date())
+
+    def swot(full=False):
+        from modules.swot_cache import SWOTCache
+        from swot_generator import SWOTAnalyzer
+
+        df = read_table(features_file)
+        # The response cache makes this incremental: only new or changed prompts reach the API.
+        # Failures are not cached and the failure count keeps the stage out of date, so the next
+        # run retries them. A forced run ignores the cache and sends every prompt again.
+        cache = None if full else SWOTCache(os.path.join(processed_folder, "swot_cache.sqlite"))
+        analyzer = SWOTAnalyzer(
+            api_key=os.environ.get("GEMINI_API_KEY", "MY_API_KEY"),
+            requests_per_minute=swot_requests_per_minute,
+            cache=cache,
+        )
+        df = analyzer.generate_swot_for_all(df)
+        write_table(df, swot_file)
+        if cache is not None:
+            cache.close()
+        return analyzer.stats["failed"]
+
+    def index_settings():
+        # Only the requested settings: the params of the built index are kept under "built_index"
+        if not os.path.exists(config_file):
+            return None
+        with open(config_file, "r") as f:
+            return json.load(f).get("index")
+
+    return Pipeline([
+        Stage("ingest", ingest, [raw_files], [ingested_file]),
+        # The code version reruns clean/extract (on every row) after their modules change;
+        # extract's includes the cleaner, whose output it reads
+        Stage("clean", clean, [ingested_file], [cleaned_file], params=lambda: {"code": cleaner_version()}),
+        Stage("extract", extract, [cleaned_file], [features_file], params=lambda: {"code": extractor_version()}),
+        Stage("embed", embed, [features_file], [manifest_file], params={"text_cols": text_cols}),
+        Stage("index", index, [manifest_file], [config_file], params=index_settings),
+        # The manifest changes with every rebuilt store; hashing it beats hashing embeddings.npy
+        Stage("report", report, [config_file, manifest_file, os.path.join(index_dir, "*_index.npz")], [report_file]),
+        Stage("match", match, [manifest_file], [matches_file]),
+        # A new crawl date stores a new snapshot even if every price is unchanged
+        Stage("history", history, [cleaned_file], [history_dir], params=crawl_date),
+        Stage("swot", swot, [features_file], [swot_file]),
+    ], state_file=os.path.join(processed_folder, "pipeline_state.json"))
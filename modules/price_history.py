@@ -0,0 +1,183 @@
+import os
+import shutil
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from modules.data_cleaner import DataCleaner
+from modules.product_matcher import RETAILER_RE
+
+PARTITION_KEY = "crawl_date"
+HISTORY_SCHEMA = pa.schema([
+    ("URL", pa.string()),
+    ("Retailer", pa.string()),
+    ("Product Name", pa.string()),
+    ("Price", pa.float32()),
+])
+
+
+def crawl_date_of(paths):
+    """
+    Crawl date (YYYY-MM-DD) of a snapshot: the modification date of its newest raw file.
+    """
+    mtimes = [os.path.getmtime(path) for path in paths if os.path.exists(path)]
+    return time.strftime("%Y-%m-%d", time.localtime(max(mtimes) if mtimes else time.time()))
+
+
+class PriceHistory:
+    def __init__(self, root="data/processed/price_history"):
+        """
+        Price history of every crawled laptop, one Parquet partition per crawl date
+        (root/crawl_date=YYYY-MM-DD/prices.parquet) holding URL, retailer, name and price.
+        Snapshots are small (four columns, zstd), so a year of daily crawls stays a few MB
+        and is loaded into memory once, as a price matrix, for the queries.
+        """
+        self.root = root
+        self._matrix = None
+
+    def dates(self):
+        """
+        Crawl dates in the store, oldest first.
+        """
+        if not os.path.isdir(self.root):
+            return []
+        prefix = PARTITION_KEY + "="
+        return sorted(name[len(prefix):] for name in os.listdir(self.root) if name.startswith(prefix))
+
+    def partition_path(self, crawl_date):
+        return os.path.join(self.root, f"{PARTITION_KEY}={crawl_date}", "prices.parquet")
+
+    def append_snapshot(self, df: pd.DataFrame, crawl_date=None):
+        """
+        Store the prices of one crawl. Re-appending the same date replaces that day's snapshot,
+        so re-running a stage does not duplicate rows.
+        :param df: Crawled laptops with URL, Product Name and either Cleaned_Price (DataCleaner output)
+                   or the raw Price column, which is cleaned with DataCleaner.clean_prices.
+        :param crawl_date: Snapshot date (YYYY-MM-DD); defaults to today.
+        """
+        crawl_date = crawl_date or time.strftime("%Y-%m-%d")
+        if 'Cleaned_Price' in df.columns:
+            prices = pd.to_numeric(df['Cleaned_Price'], errors='coerce')
+        else:
+            prices = DataCleaner(df[['Price']]).clean_prices(df['Price'])
+        urls = df['URL'].astype(str)
+        snapshot = pd.DataFrame({
+            "URL": urls,
+            "Retailer": urls.str.extract(RETAILER_RE)[0].fillna("").str.lower(),
+            "Product Name": df['Product Name'].astype(str) if 'Product Name' in df.columns else "",
+            "Price": prices.where(prices > 0).astype(np.float32),
+        }).dropna(subset=["Price"]).drop_duplicates("URL", keep="last")
+
+        path = self.partition_path(crawl_date)
+        partition = os.path.dirname(path)
+        if os.path.isdir(partition):
+            shutil.rmtree(partition)
+        os.makedirs(partition)
+        table = pa.Table.from_pandas(snapshot, schema=HISTORY_SCHEMA, preserve_index=False)
+        pq.write_table(table, path, compression="zstd")
+        self._matrix = None
+        print(f"✅ [PriceHistory] Stored {len(snapshot)} prices for {crawl_date} in {self.root}")
+        return snapshot
+
+    def snapshot(self, crawl_date):
+        """
+        Prices of one crawl date (reads only that partition).
+        """
+        return pq.read_table(self.partition_path(crawl_date)).to_pandas()
+
+    def matrix(self):
+        """
+        The whole history as a dense (laptop x crawl date) float32 price matrix, NaN where a laptop
+        was not listed. Loaded once (only the URL, Retailer and Price columns) and kept until the next append.
+        :return: (urls, retailers, dates, prices) with urls/retailers per row and dates per column.
+        """
+        if self._matrix is None:
+            dates = self.dates()
+            tables = [pq.ParquetFile(self.partition_path(d)).read(columns=["URL", "Retailer", "Price"]) for d in dates]
+            lengths = np.array([len(table) for table in tables], dtype=np.int64)
+            if tables:
+                table = pa.concat_tables(tables)
+                url_codes, urls = pd.factorize(table.column("URL").to_numpy(zero_copy_only=False))
+                retailers = np.empty(len(urls), dtype=object)
+                # Later snapshots overwrite earlier ones, so each laptop keeps its latest retailer
+                retailers[url_codes] = table.column("Retailer").to_numpy(zero_copy_only=False)
+                prices = np.full((len(urls), len(dates)), np.nan, dtype=np.float32)
+                prices[url_codes, np.repeat(np.arange(len(dates)), lengths)] = table.column("Price").to_numpy()
+            else:
+                urls, retailers = np.array([], dtype=object), np.array([], dtype=object)
+                prices = np.empty((0, 0), dtype=np.float32)
+            self._matrix = (pd.Index(urls), retailers, pd.DatetimeIndex(dates), prices)
+        return self._matrix
+
+    def history(self, url):
+        """
+        Price series of one laptop, indexed by crawl date (NaN on dates it was not listed).
+        """
+        urls, _, dates, prices = self.matrix()
+        row = urls.get_indexer([url])[0]
+        return pd.Series(prices[row] if row >= 0 else np.nan, index=dates, name=url, dtype=np.float32)
+
+    def price_changes(self, since=None, until=None):
+        """
+        Laptops whose price changed between two crawls (default: the last two).
+        :return: DataFrame with URL, Retailer, Product Name, Old_Price, New_Price, Change and Change_Pct,
+                 biggest drops first. Laptops that appear or disappear are not included.
+        """
+        dates = self.dates()
+        until = until or (dates[-1] if dates else None)
+        if since is None:
+            earlier = [d for d in dates if d < str(until)]
+            since = earlier[-1] if earlier else None
+        if since is None or until is None:
+            print("⚠️ [PriceHistory] Need at least two crawls to compare prices.")
+            return pd.DataFrame(columns=["URL", "Retailer", "Product Name", "Old_Price", "New_Price", "Change", "Change_Pct"])
+
+        old = self.snapshot(since)[["URL", "Price"]].rename(columns={"Price": "Old_Price"})
+        new = self.snapshot(until).rename(columns={"Price": "New_Price"})
+        changes = new.merge(old, on="URL", how="inner")
+        changes = changes[changes["New_Price"] != changes["Old_Price"]]
+        changes["Change"] = changes["New_Price"] - changes["Old_Price"]
+        changes["Change_Pct"] = (100 * changes["Change"] / changes["Old_Price"]).round(2)
+        columns = ["URL", "Retailer", "Product Name", "Old_Price", "New_Price", "Change", "Change_Pct"]
+        return changes[columns].sort_values("Change_Pct", kind="stable").reset_index(drop=True)
+
+    def cheapest_over_time(self, matches: pd.DataFrame, start=None, end=None):
+        """
+        Cheapest retailer per matched product on each crawl date. Both sides of every pair are
+        looked up as rows of the price matrix and compared date by date, so the query costs a
+        few array operations regardless of how many snapshots are stored.
+        :param matches: ProductMatcher.match() output (left_url/right_url per matched pair).
+        :param start, end: Optional date range (inclusive).
+        :return: DataFrame with match_id, crawl_date, Retailer, URL, Price and Other_Price (the other
+                 retailer's price that day, NaN if it was not listed), one row per pair and date on
+                 which either side was listed. Ties go to the left retailer.
+        """
+        urls, retailers, dates, prices = self.matrix()
+        first = dates.searchsorted(pd.Timestamp(start)) if start is not None else 0
+        last = dates.searchsorted(pd.Timestamp(end), side="right") if end is not None else len(dates)
+        dates, prices = dates[first:last], prices[:, first:last]
+
+        sides = []
+        for column in ("left_url", "right_url"):
+            rows = urls.get_indexer(matches[column].astype(str))
+            side = np.full((len(rows), len(dates)), np.nan, dtype=np.float32)
+            side[rows >= 0] = prices[rows[rows >= 0]]
+            sides.append((rows, side))
+        (left_rows, left), (right_rows, right) = sides
+
+        left_wins = ~(right < left) & ~np.isnan(left)
+        pair, day = np.nonzero(~(np.isnan(left) & np.isnan(right)))
+        wins = left_wins[pair, day]
+        winner_rows = np.where(wins, left_rows[pair], right_rows[pair])
+        urls = urls.to_numpy()
+        return pd.DataFrame({
+            "match_id": pair,
+            "crawl_date": dates[day],
+            "Retailer": retailers[winner_rows],
+            "URL": urls[winner_rows],
+            "Price": np.where(wins, left[pair, day], right[pair, day]),
+            "Other_Price": np.where(wins, right[pair, day], left[pair, day]),
+        })
@@ -0,0 +1,215 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+from modules.embedding_store import load_embedding_index
+from modules.feature_extractor import numeric_specs
+from modules.io_utils import write_table
+from modules.spec_filter import SPEC_COLUMNS
+from modules.vector_index import normalize_rows, top_k_indices
+
+RETAILER_RE = r'^(?:https?://)?(?:www\.)?([^/.]+)'
+CPU_FAMILY_RE = re.compile(
+    r'\b(core\s*i[3579]|core\s*ultra\s*[579]|ryzen\s*(?:ai\s*)?[3579]|apple\s*m[1-9](?:\s*(?:pro|max|ultra))?|m[1-9]\s*(?:pro|max|ultra)|m[1-9]'
+    r'|celeron|pentium|athlon|snapdragon|mediatek)\b',
+    re.IGNORECASE,
+)
+CPU_SKU_RE = re.compile(r'(?:\bi[3579]|ryzen\s*[3579]|ultra\s*[579])[\s-]+(\d{3,5}[a-z]{0,2}\d?)\b', re.IGNORECASE)
+MODEL_TOKEN_RE = re.compile(r'[a-z0-9]+(?:-[a-z0-9]+)*', re.IGNORECASE)
+NON_MODEL_TOKEN_RE = re.compile(
+    r'^(?:\d+(?:gb|tb|hz|th|nd|rd|st|k|w|mp|p)|i[3579]|m[1-9]|rtx\d*|gtx\d*|ddr\d\w*|lpddr\d\w*|wi-?fi\d*|usb\d*|gen\d+|\d+)$'
+)
+
+# Weights of the match confidence; a spec counts 1 if both sides agree, 0 if they differ,
+# and UNKNOWN_AGREEMENT if either side is unknown.
+MATCH_WEIGHTS = {"cosine": 0.35, "model_code": 0.2, "cpu_sku": 0.15, "ram": 0.1, "storage": 0.1, "display": 0.1}
+UNKNOWN_AGREEMENT = 0.3
+
+
+def normalize_cpu_family(text):
+    m = CPU_FAMILY_RE.search(str(text))
+    if not m:
+        return ""
+    family = re.sub(r'\s+', '', m.group(1).lower())
+    return family[len("apple"):] if family.startswith("apple") else family
+
+
+def model_codes(name, cpu_sku=""):
+    """
+    Model-number-like tokens of a product name (e.g. "15-fd0292TU" -> "15fd0292tu", "fd0292tu"):
+    tokens, and parts of hyphenated tokens, with both letters and digits that are not specs
+    such as 8GB, i5 or RTX4060.
+    """
+    codes = set()
+    for token in MODEL_TOKEN_RE.findall(str(name).lower()):
+        for code in {token, *token.split("-")}:
+            compact = code.replace("-", "")
+            if (len(compact) >= 4 and re.search(r'\d', compact) and re.search(r'[a-z]', compact)
+                    and not NON_MODEL_TOKEN_RE.match(code) and not (cpu_sku and compact.endswith(cpu_sku))):
+                codes.add(compact)
+    return frozenset(codes)
+
+
+def _agreement(left, right, tolerance=0.0):
+    """
+    1 where both values are known and equal (within tolerance), 0 where they differ,
+    UNKNOWN_AGREEMENT where either is unknown.
+    """
+    known = ~(np.isnan(left) | np.isnan(right))
+    return np.where(known, (np.abs(left - right) <= tolerance).astype(np.float32), np.float32(UNKNOWN_AGREEMENT))
+
+
+class ProductMatcher:
+    def __init__(self, df: pd.DataFrame, embeddings, retailer_col="Retailer", name_col="Product Name"):
+        """
+        Links the same laptop across retailers.
+        Candidate pairs come from blocking on brand + CPU family and, within each block, the
+        embedding top-k from the other retailer; they are then scored on embedding similarity,
+        model code, CPU model number, RAM, storage and display size.
+        :param df: Laptop rows (URL, Product Name, Processor, RAM, Storage, Display, Cleaned_Price...),
+                   aligned with embeddings. The retailer is taken from retailer_col, or from the URL host.
+        :param embeddings: (rows x dim) embedding matrix, e.g. the LaptopRecommender index.
+        """
+        self.df = df.reset_index(drop=True)
+        self.embeddings = normalize_rows(np.asarray(embeddings, dtype=np.float32))
+        self.name_col = name_col
+
+        if retailer_col in self.df.columns:
+            self.retailers = self.df[retailer_col].astype(str).str.lower().to_numpy()
+        else:
+            self.retailers = self.df['URL'].astype(str).str.extract(RETAILER_RE)[0].fillna("").str.lower().to_numpy()
+
+        names = self.df[name_col].astype(str)
+        processors = self.df['Processor'].fillna("").astype(str) if 'Processor' in self.df.columns else pd.Series("", index=self.df.index)
+        cpu_text = names + " " + processors
+        self.brands = names.str.split().str[0].fillna("").str.lower().to_numpy()
+        self.cpu_families = np.array([normalize_cpu_family(text) for text in cpu_text])
+        self.cpu_skus = np.array([
+            (m.group(1).lower() if m else "") for m in (CPU_SKU_RE.search(text) for text in cpu_text)
+        ])
+        self.model_codes = [model_codes(name, sku) for name, sku in zip(names, self.cpu_skus)]
+
+        if all(column in self.df.columns for column in SPEC_COLUMNS):
+            specs = self.df[SPEC_COLUMNS]
+        else:
+            specs = numeric_specs(self.df)
+        self.specs = {column: specs[column].to_numpy(dtype=np.float32) for column in ("ram_gb", "storage_gb", "display_inch", "price")}
+
+    @classmethod
+    def from_index(cls, index_dir="data/processed/laptop_index", **kwargs):
+        """
+        Build a matcher over a saved embedding index (the LaptopRecommender embeddings and metadata).
+        """
+        embeddings, metadata, _ = load_embedding_index(index_dir)
+        return cls(metadata.to_pandas(), embeddings, **kwargs)
+
+    def blocks(self):
+        """
+        Row positions grouped by blocking key (brand, CPU family).
+        """
+        keys = pd.Series(list(zip(self.brands, self.cpu_families)))
+        return keys.groupby(keys).indices.values()
+
+    def candidate_pairs(self, left, right, top_k=5, batch_size=1024):
+        """
+        (left row, right row, cosine) for each left-retailer laptop and its top_k most similar
+        right-retailer laptops in the same block. Blocks are scored in batches of rows, so
+        memory stays bounded even for large blocks.
+        """
+        pairs = []
+        for block in self.blocks():
+            left_rows = block[self.retailers[block] == left]
+            right_rows = block[self.retailers[block] == right]
+            if len(left_rows) == 0 or len(right_rows) == 0:
+                continue
+            right_embeddings = self.embeddings[right_rows]
+            for start in range(0, len(left_rows), batch_size):
+                rows = left_rows[start:start + batch_size]
+                scores = self.embeddings[rows] @ right_embeddings.T
+                best = top_k_indices(scores, top_k)
+                pairs.append((
+                    np.repeat(rows, best.shape[1]),
+                    right_rows[best].ravel(),
+                    np.take_along_axis(scores, best, axis=1).ravel(),
+                ))
+        if not pairs:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        return tuple(np.concatenate(parts) for parts in zip(*pairs))
+
+    def score_pairs(self, left_rows, right_rows, cosine):
+        """
+        Match confidence in [0, 1] for candidate pairs, from MATCH_WEIGHTS.
+        """
+        codes_left = [self.model_codes[i] for i in left_rows]
+        codes_right = [self.model_codes[j] for j in right_rows]
+        model_code = np.array([
+            (1.0 if a & b else 0.0) if a and b else UNKNOWN_AGREEMENT for a, b in zip(codes_left, codes_right)
+        ], dtype=np.float32)
+        sku_left, sku_right = self.cpu_skus[left_rows], self.cpu_skus[right_rows]
+        cpu_sku = np.where((sku_left == "") | (sku_right == ""), UNKNOWN_AGREEMENT, (sku_left == sku_right).astype(np.float32))
+
+        components = {
+            "cosine": np.clip(cosine, 0, 1),
+            "model_code": model_code,
+            "cpu_sku": cpu_sku,
+            "ram": _agreement(self.specs["ram_gb"][left_rows], self.specs["ram_gb"][right_rows]),
+            "storage": _agreement(self.specs["storage_gb"][left_rows], self.specs["storage_gb"][right_rows]),
+            "display": _agreement(self.specs["display_inch"][left_rows], self.specs["display_inch"][right_rows], 0.15),
+        }
+        return sum(MATCH_WEIGHTS[name] * values for name, values in components.items())
+
+    def match(self, left="ryans", right="startech", top_k=5, min_confidence=0.7):
+        """
+        Match the laptops of two retailers one-to-one, most confident pairs first.
+        :return: DataFrame with one row per matched pair: row positions, names, URLs, prices,
+                 cosine similarity and confidence.
+        """
+        left_rows, right_rows, cosine = self.candidate_pairs(left, right, top_k)
+        confidence = self.score_pairs(left_rows, right_rows, cosine)
+
+        keep = confidence >= min_confidence
+        left_rows, right_rows, cosine, confidence = left_rows[keep], right_rows[keep], cosine[keep], confidence[keep]
+        order = np.argsort(-confidence, kind="stable")
+
+        # Greedy one-to-one assignment
+        used_left, used_right, selected = set(), set(), []
+        for n in order:
+            i, j = left_rows[n], right_rows[n]
+            if i not in used_left and j not in used_right:
+                used_left.add(i)
+                used_right.add(j)
+                selected.append(n)
+        selected = np.array(selected, dtype=np.int64)
+        left_rows, right_rows = left_rows[selected], right_rows[selected]
+
+        names = self.df[self.name_col].to_numpy()
+        urls = self.df['URL'].to_numpy() if 'URL' in self.df.columns else np.full(len(self.df), None)
+        matches = pd.DataFrame({
+            "left_row": left_rows,
+            "right_row": right_rows,
+            "left_retailer": left,
+            "right_retailer": right,
+            "left_name": names[left_rows],
+            "right_name": names[right_rows],
+            "left_url": urls[left_rows],
+            "right_url": urls[right_rows],
+            "left_price": self.specs["price"][left_rows],
+            "right_price": self.specs["price"][right_rows],
+            "cosine": cosine[selected],
+            "confidence": confidence[selected],
+        })
+        print(f"[ProductMatcher] Matched {len(matches)} {left}/{right} pairs "
+              f"from {len(order)} candidates (min confidence {min_confidence}).")
+        return matches
+
+
+def match_products(index_dir="data/processed/laptop_index", output_file="data/processed/product_matches.parquet",
+                   left="ryans", right="startech", top_k=5, min_confidence=0.7):
+    """
+    Match the laptops of two retailers in a saved embedding index and save the matched pairs.
+    """
+    matches = ProductMatcher.from_index(index_dir).match(left, right, top_k=top_k, min_confidence=min_confidence)
+    write_table(matches, output_file)
+    print(f"✅ Product matches saved to {output_file}")
+    return matches
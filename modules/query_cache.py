@@ -0,0 +1,111 @@
+import os
+import re
+import sqlite3
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+def normalize_query(query):
+    """
+    Normalize a query so trivially different spellings share a cache entry.
+    """
+    return re.sub(r'\s+', ' ', str(query)).strip().lower()
+
+
+class QueryCache:
+    def __init__(self, max_size=1024, model_name="", index_version="", persist_path=None):
+        """
+        Bounded LRU cache of normalized query -> embedding and (query, top_k) -> ranked results,
+        with hit/miss counters.
+        :param persist_path: Optional SQLite file backing the embedding cache across runs. It is
+                             cleared whenever the model name or index version differs from the one
+                             it was written with.
+        """
+        self.max_size = max_size
+        self.model_name = model_name
+        self.index_version = index_version
+        self.embeddings = OrderedDict()
+        self.results = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.result_hits = 0
+        self._lock = threading.Lock()
+        self._db = None
+        if persist_path:
+            self._open_persistent(persist_path)
+
+    def _open_persistent(self, persist_path):
+        if os.path.dirname(persist_path):
+            os.makedirs(os.path.dirname(persist_path), exist_ok=True)
+        self._db = sqlite3.connect(persist_path, check_same_thread=False)
+        self._db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self._db.execute("CREATE TABLE IF NOT EXISTS embeddings (query TEXT PRIMARY KEY, vector BLOB)")
+        stored = dict(self._db.execute("SELECT key, value FROM meta"))
+        current = {"model_name": self.model_name, "index_version": self.index_version}
+        if stored != current:
+            self._db.execute("DELETE FROM embeddings")
+            self._db.execute("DELETE FROM meta")
+            self._db.executemany("INSERT INTO meta VALUES (?, ?)", current.items())
+        self._db.commit()
+
+    def _remember(self, cache, key, value):
+        cache[key] = value
+        cache.move_to_end(key)
+        if len(cache) > self.max_size:
+            cache.popitem(last=False)
+
+    def get_embedding(self, query):
+        key = normalize_query(query)
+        with self._lock:
+            if key in self.embeddings:
+                self.embeddings.move_to_end(key)
+                self.hits += 1
+                return self.embeddings[key]
+            if self._db is not None:
+                row = self._db.execute("SELECT vector FROM embeddings WHERE query = ?", (key,)).fetchone()
+                if row is not None:
+                    vector = np.frombuffer(row[0], dtype=np.float32)
+                    self._remember(self.embeddings, key, vector)
+                    self.hits += 1
+                    return vector
+            self.misses += 1
+            return None
+
+    def put_embedding(self, query, vector):
+        key = normalize_query(query)
+        vector = np.asarray(vector, dtype=np.float32)
+        with self._lock:
+            self._remember(self.embeddings, key, vector)
+            if self._db is not None:
+                self._db.execute("INSERT OR REPLACE INTO embeddings VALUES (?, ?)", (key, vector.tobytes()))
+                self._db.commit()
+
+    def get_result(self, query, top_k):
+        key = (normalize_query(query), top_k)
+        with self._lock:
+            if key in self.results:
+                self.results.move_to_end(key)
+                self.result_hits += 1
+                return self.results[key]
+            return None
+
+    def put_result(self, query, top_k, result):
+        with self._lock:
+            self._remember(self.results, (normalize_query(query), top_k), result)
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "result_hits": self.result_hits,
+            "size": len(self.embeddings),
+        }
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
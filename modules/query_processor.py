@@ -1,17 +1,33 @@
+import hashlib
 import json
+import os
 import pickle
 
+import numpy as np
 import pandas as pd
-import torch
-from sentence_transformers import SentenceTransformer
+import pyarrow as pa
+
+from modules.embedding_model import load_model
+from modules.embedding_store import load_embedding_index
+from modules.feature_extractor import numeric_specs
+from modules.instrumentation import METRICS
+from modules.io_utils import dataframe_to_arrow
+from modules.query_cache import QueryCache
+from modules.spec_filter import SPEC_COLUMNS, SpecFilter, describe_constraints, parse_query_constraints
+from modules.vector_index import build_index, load_index, normalize_rows
+
+# Constraints given up first when a query matches no laptop; the budget is kept longest
+RELAX_ORDER = ["display_inch", "is_ssd", "storage_gb", "ram_gb", "price"]
 
 
 class QueryProcessor:
     def __init__(self, model_name="all-MiniLM-L6-v2", config_path="config/recommender_config.json", top_k=3):
         """
         Initialize the query processor for laptop recommendations.
+        The model is loaded on the first query that misses the query cache, so answering
+        cached queries or reading the index never imports torch.
         """
-        self.model = SentenceTransformer(model_name)
+        self.model_name = model_name
         self.config_path = config_path
         self.top_k = top_k
 
@@ -19,26 +35,236 @@ class QueryProcessor:
         with open(config_path, "r") as f:
             self.config = json.load(f)
 
-        # Load Embeddings from Pickle File
-        with open(self.config["embedding_file"], "rb") as f:
-            self.df = pickle.load(f)
+        if self.config.get("index_dir"):
+            # Memory-map the embedding matrix and metadata; nothing is copied until it is searched.
+            self.embeddings, self.metadata, self.manifest = load_embedding_index(self.config["index_dir"])
+            if self.manifest["model_name"] != model_name:
+                raise ValueError(
+                    f"Index was built with '{self.manifest['model_name']}' but the query model is '{model_name}'"
+                )
+        else:
+            # Legacy format: a pickled DataFrame with a list-based 'Embedding' column
+            with open(self.config["embedding_file"], "rb") as f:
+                df = pickle.load(f)
+
+            # Stack the stored embeddings once into a contiguous, L2-normalized float32 matrix
+            # so every query is a single matrix-vector product.
+            self.embeddings = normalize_rows(np.vstack(df['Embedding'].to_numpy()))
+            self.metadata = dataframe_to_arrow(df.drop(columns=['Embedding']))
+            self.manifest = None
+
+        # Search backend recorded in the config, e.g. {"backend": "ivf", "n_probe": 8}
+        index_config = dict(self.config.get("index", {"backend": "exact"}))
+        backend = index_config.pop("backend", "exact")
+        if self.manifest is not None:
+            # Load the index that was built; query-time settings (n_probe, rescore) in "index" still apply
+            built_backend = self.config.get("built_index", {}).get("backend", backend)
+            if built_backend != backend:
+                print(f"⚠️ [QueryProcessor] Config asks for the '{backend}' index but '{built_backend}' was built; "
+                      f"using it until the index is rebuilt.")
+                backend, index_config = built_backend, {}
+            self.index = load_index(self.config["index_dir"], self.embeddings, backend, **index_config)
+        else:
+            self.index = build_index(self.embeddings, backend, **index_config)
+
+        # Hard constraints parsed from the query ("8GB RAM", "15-inch", "under 80,000") filter
+        # the candidates before they are ranked by similarity.
+        self.spec_filter = self.build_spec_filter() if self.config.get("filter_constraints", True) else None
+
+        # Repeated queries skip the transformer (and the search, for identical top_k)
+        self.query_cache = QueryCache(
+            max_size=self.config.get("query_cache_size", 1024),
+            model_name=model_name,
+            index_version=self.index_version(),
+            persist_path=self.config.get("query_cache_file"),
+        )
+
+    @property
+    def model(self):
+        return load_model(self.model_name)
+
+    def index_version(self):
+        """
+        Identify the loaded index; cached query results are only valid for the same version.
+        """
+        if self.manifest is not None:
+            source = {"manifest": self.manifest, "index": self.config.get("index"), "built_index": self.config.get("built_index")}
+        else:
+            stat = os.stat(self.config["embedding_file"])
+            source = {"embedding_file": self.config["embedding_file"], "size": stat.st_size, "mtime": stat.st_mtime}
+        source["filter_constraints"] = self.spec_filter is not None
+        return hashlib.sha256(json.dumps(source, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+    def build_spec_filter(self):
+        """
+        Load the numeric spec columns from the metadata, deriving them from the RAM / Storage /
+        Display / Cleaned_Price text columns when the index was built without them.
+        :return: SpecFilter, or None when the metadata has no spec information at all.
+        """
+        names = self.metadata.column_names
+        if all(column in names for column in SPEC_COLUMNS):
+            return SpecFilter({
+                column: self.metadata.column(column).fill_null(False if column == "is_ssd" else np.nan).to_numpy()
+                for column in SPEC_COLUMNS
+            })
+        source_columns = [column for column in ("RAM", "Storage", "Display", "Cleaned_Price") if column in names]
+        if not source_columns:
+            print("⚠️ [QueryProcessor] No spec columns in the index metadata; constraint filtering disabled.")
+            return None
+        return SpecFilter(numeric_specs(self.metadata.select(source_columns).to_pandas()))
+
+    def query_constraints(self, query):
+        return parse_query_constraints(query) if self.spec_filter is not None else {}
+
+    def filter_candidates(self, constraints):
+        """
+        Row positions satisfying the constraints, or None to search the whole index.
+        When nothing satisfies them, constraints are dropped one at a time in RELAX_ORDER
+        (display size first, price last) until some laptops match.
+        """
+        constraints = dict(constraints)
+        while constraints:
+            candidates = self.spec_filter.candidates(constraints)
+            if len(candidates):
+                return candidates
+            column = next(column for column in RELAX_ORDER if column in constraints)
+            print(f"⚠️ [QueryProcessor] No laptops match ({describe_constraints(constraints)}); dropping the {column} constraint.")
+            del constraints[column]
+        return None
+
+    @METRICS.timer("query_search_seconds")
+    def search(self, queries, query_embeddings, top_k):
+        """
+        Rank laptops for each query: unconstrained queries go through the index together,
+        constrained ones are scored against their filtered candidates only (on the quantized
+        codes first for the int8/binary backends).
+        :return: List with one (ranked row indices, scores) tuple per query.
+        """
+        results = [None] * len(queries)
+        unfiltered = []
+        for i, query in enumerate(queries):
+            candidates = self.filter_candidates(self.query_constraints(query))
+            if candidates is None:
+                unfiltered.append(i)
+                continue
+            METRICS.inc("query_filtered_total")
+            # Scored exactly, or on the quantized codes and then rescored, depending on the backend
+            results[i] = self.index.search_candidates(query_embeddings[i], candidates, top_k)
 
-        # Convert stored embeddings back to tensors
-        self.df['Embedding'] = self.df['Embedding'].apply(lambda x: torch.tensor(x))
+        if unfiltered:
+            top_indices, top_scores = self.index.search(query_embeddings[unfiltered], top_k)
+            for i, indices, scores in zip(unfiltered, top_indices, top_scores):
+                found = indices >= 0
+                results[i] = (indices[found], scores[found])
+        return results
+
+    def get_rows(self, indices):
+        """
+        Materialize the metadata rows at the given positions as a DataFrame indexed by row position.
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        rows = self.metadata.take(pa.array(indices)).to_pandas()
+        rows.index = indices
+        return rows
+
+    def encode_query(self, query):
+        """
+        Encode a query into a normalized float32 vector, using the query cache when possible.
+        """
+        query_embedding = self.query_cache.get_embedding(query)
+        if query_embedding is None:
+            with METRICS.timer("query_encode_seconds"):
+                query_embedding = self.model.encode(query, convert_to_numpy=True, normalize_embeddings=True)
+            query_embedding = np.asarray(query_embedding, dtype=np.float32)
+            self.query_cache.put_embedding(query, query_embedding)
+        return query_embedding
 
+    def encode_queries(self, queries, batch_size=64):
+        """
+        Encode many queries into a (queries x dim) normalized float32 matrix.
+        Cached queries are reused; all others are encoded together in one batch.
+        """
+        cached = [self.query_cache.get_embedding(query) for query in queries]
+        missing = [i for i, embedding in enumerate(cached) if embedding is None]
+        if missing:
+            with METRICS.timer("query_encode_seconds"):
+                new_embeddings = self.model.encode(
+                    [queries[i] for i in missing], batch_size=batch_size, convert_to_numpy=True, normalize_embeddings=True
+                )
+            for i, embedding in zip(missing, np.asarray(new_embeddings, dtype=np.float32)):
+                self.query_cache.put_embedding(queries[i], embedding)
+                cached[i] = embedding
+        return np.vstack(cached).astype(np.float32, copy=False)
+
+    @METRICS.timer("query_seconds")
     def get_similar_laptops(self, query):
         """
         Find the most similar laptops based on a user query.
         """
-        query_embedding = self.model.encode(query, convert_to_tensor=True)
-        stored_embeddings = torch.stack(self.df['Embedding'].tolist())
+        METRICS.inc("queries_total")
+        cached = self.query_cache.get_result(query, self.top_k)
+        if cached is not None:
+            METRICS.inc("query_result_cache_hits_total")
+            return self.get_rows(cached[0])
 
-        # Compute cosine similarity
-        similarities = torch.nn.functional.cosine_similarity(query_embedding, stored_embeddings, dim=1)
+        query_embedding = self.encode_query(query)
 
         # Get top K recommendations
-        top_indices = similarities.argsort(descending=True)[:self.top_k].tolist()
-        return self.df.iloc[top_indices]
+        indices, scores = self.search([query], query_embedding[np.newaxis, :], self.top_k)[0]
+        self.query_cache.put_result(query, self.top_k, (indices, scores))
+        return self.get_rows(indices)
+
+    @METRICS.timer("query_batch_seconds")
+    def get_similar_laptops_batch(self, queries, top_k=None, batch_size=64):
+        """
+        Find the most similar laptops for many queries at once.
+        All uncached queries are encoded in one batched call and searched together.
+        :return: List with one (ranked row indices, scores) tuple per query.
+        """
+        top_k = top_k or self.top_k
+        queries = list(queries)
+        if not queries:
+            return []
+
+        METRICS.inc("queries_total", len(queries))
+        results = [self.query_cache.get_result(query, top_k) for query in queries]
+        missing = [i for i, result in enumerate(results) if result is None]
+        METRICS.inc("query_result_cache_hits_total", len(queries) - len(missing))
+        if missing:
+            missing_queries = [queries[i] for i in missing]
+            query_embeddings = self.encode_queries(missing_queries, batch_size=batch_size)
+            for i, result in zip(missing, self.search(missing_queries, query_embeddings, top_k)):
+                results[i] = result
+                self.query_cache.put_result(queries[i], top_k, result)
+        return results
+
+    def _write_laptops(self, f, top_laptops):
+        for i, (_, row) in enumerate(top_laptops.iterrows(), 1):
+            f.write(f"{i}. **{row['Product Name']}**\n")
+            f.write(f"   - **Price:** {row.get('Cleaned_Price', 'N/A')} BDT\n")
+            f.write(f"   - **Tech Details:** {row['Cleaned_Tech_Details']}\n")
+            f.write(f"   - **Description:** {row['Cleaned_Description']}\n")
+            f.write(f"   - **Product Link:** {row['URL']}\n")
+            if 'Similarity' in row:
+                f.write(f"   - **Similarity:** {row['Similarity']:.4f}\n")
+            f.write("="*50 + "\n")
+
+    def _write_constraints(self, f, query):
+        constraints = self.query_constraints(query)
+        if constraints:
+            f.write(f"🧮 **Filters:** {describe_constraints(constraints)}\n")
+
+    def get_config_queries(self):
+        """
+        Collect the saved queries for a batch run from the config:
+        an inline "queries" list and/or a "queries_file" with one query per line.
+        """
+        queries = list(self.config.get("queries", []))
+        queries_file = self.config.get("queries_file")
+        if queries_file:
+            with open(queries_file, "r", encoding="utf-8") as f:
+                queries.extend(line.strip() for line in f)
+        return [q for q in queries if q]
 
     def generate_recommendation_report(self, output_file="outputs/recommendation_report.txt"):
         """
@@ -54,15 +280,37 @@ class QueryProcessor:
         with open(output_file, "w", encoding="utf-8") as f:
             f.write("📌 Laptop Recommendation Report\n")
             f.write("="*50 + "\n")
-            f.write(f"🔍 **Query:** {query}\n\n")
+            f.write(f"🔍 **Query:** {query}\n")
+            self._write_constraints(f, query)
+            f.write("\n")
             f.write("🎯 **Top Recommended Laptops:**\n\n")
-
-            for i, (_, row) in enumerate(top_laptops.iterrows(), 1):
-                f.write(f"{i}. **{row['Product Name']}**\n")
-                f.write(f"   - **Price:** {row.get('Cleaned_Price', 'N/A')} BDT\n")
-                f.write(f"   - **Tech Details:** {row['Cleaned_Tech_Details']}\n")
-                f.write(f"   - **Description:** {row['Cleaned_Description']}\n")
-                f.write(f"   - **Product Link:** {row['URL']}\n")
-                f.write("="*50 + "\n")
+            self._write_laptops(f, top_laptops)
 
         print(f"✅ Recommendation report saved to {output_file}")
+
+    def generate_batch_recommendation_report(self, queries=None, output_file="outputs/batch_recommendation_report.txt"):
+        """
+        Run all saved queries through the batch API and write one consolidated report.
+        """
+        queries = queries if queries is not None else self.get_config_queries()
+        if not queries:
+            print("⚠️ No queries found in config file. Please add \"queries\" or a \"queries_file\".")
+            return
+
+        results = self.get_similar_laptops_batch(queries)
+
+        with open(output_file, "w", encoding="utf-8") as f:
+            f.write("📌 Laptop Recommendation Report\n")
+            f.write("="*50 + "\n")
+            f.write(f"🧾 **Queries:** {len(queries)}\n\n")
+
+            for n, (query, (indices, scores)) in enumerate(zip(queries, results), 1):
+                f.write(f"🔍 **Query {n}:** {query}\n")
+                self._write_constraints(f, query)
+                f.write("\n")
+                f.write("🎯 **Top Recommended Laptops:**\n\n")
+                top_laptops = self.get_rows(indices).assign(Similarity=scores)
+                self._write_laptops(f, top_laptops)
+                f.write("\n")
+
+        print(f"✅ Batch recommendation report for {len(queries)} queries saved to {output_file}")
@@ -0,0 +1,47 @@
+import threading
+import time
+
+
+class TokenBucket:
+    def __init__(self, rate, capacity=None):
+        """
+        Thread-safe token-bucket rate limiter.
+        :param rate: Tokens added per second (the sustained request rate).
+        :param capacity: Maximum burst size (default: one second worth of tokens, at least 1).
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self, tokens=1):
+        """
+        Take tokens if available without waiting. Returns True on success.
+        """
+        with self._lock:
+            self._refill()
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return True
+            return False
+
+    def acquire(self, tokens=1):
+        """
+        Block until the requested number of tokens is available, then take them.
+        """
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                wait = (tokens - self.tokens) / self.rate
+            time.sleep(wait)
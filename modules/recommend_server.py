@@ -0,0 +1,180 @@
+import asyncio
+import json
+import time
+from collections import deque
+
+import numpy as np
+
+from modules.instrumentation import METRICS
+
+
+class RecommendationServer:
+    def __init__(self, query_processor, host="127.0.0.1", port=8765, unix_socket=None, max_batch_size=64, max_wait_ms=5):
+        """
+        Long-running HTTP recommendation service that keeps the model and index resident.
+        Concurrent requests are collected into micro-batches (up to max_batch_size queries or
+        max_wait_ms of waiting) and answered with a single batched encode call.
+        :param query_processor: A loaded QueryProcessor.
+        :param unix_socket: Serve on this Unix socket path instead of host/port.
+        """
+        self.query_processor = query_processor
+        self.host = host
+        self.port = port
+        self.unix_socket = unix_socket
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.latencies_ms = deque(maxlen=10000)  # recent request latencies for /stats
+        self._queue = None
+
+    async def recommend(self, query, top_k=None):
+        """
+        Queue a query for the next micro-batch and wait for its result.
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((query, top_k or self.query_processor.top_k, future))
+        return await future
+
+    async def _batch_worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            queries = [query for query, _, _ in batch]
+            try:
+                top_k = max(k for _, k, _ in batch)
+                # Encoding and search are CPU-bound; keep the event loop free to accept requests
+                results = await loop.run_in_executor(
+                    None, self.query_processor.get_similar_laptops_batch, queries, top_k
+                )
+            except Exception as e:
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for (_, k, future), (indices, scores) in zip(batch, results):
+                if not future.done():
+                    future.set_result((indices[:k], scores[:k]))
+
+    def _format_results(self, query, indices, scores):
+        rows = self.query_processor.get_rows(indices)
+        laptops = []
+        for (_, row), score in zip(rows.iterrows(), scores):
+            price = row.get("Cleaned_Price")
+            laptops.append({
+                "product_name": row.get("Product Name"),
+                "price": None if price is None or np.isnan(price) else float(price),
+                "url": row.get("URL"),
+                "similarity": float(score),
+            })
+        return {"query": query, "results": laptops}
+
+    def stats(self):
+        latencies = np.array(self.latencies_ms)
+        stats = {"requests": int(len(latencies)), "query_cache": self.query_processor.query_cache.stats()}
+        if len(latencies):
+            stats["p50_ms"] = float(np.percentile(latencies, 50))
+            stats["p99_ms"] = float(np.percentile(latencies, 99))
+        return stats
+
+    async def _handle_request(self, method, path, body):
+        if method == "GET" and path == "/health":
+            return 200, {"status": "ok", "rows": int(self.query_processor.embeddings.shape[0])}
+        if method == "GET" and path == "/stats":
+            return 200, self.stats()
+        if method == "GET" and path == "/metrics":
+            return 200, METRICS.prometheus_text()
+        if method != "POST" or path != "/recommend":
+            return 404, {"error": f"Unknown endpoint {method} {path}"}
+
+        try:
+            payload = json.loads(body or b"{}")
+        except json.JSONDecodeError:
+            return 400, {"error": "Request body must be JSON"}
+        if not isinstance(payload, dict):
+            return 400, {"error": "Request body must be a JSON object"}
+        top_k = payload.get("top_k")
+        if top_k is not None and (not isinstance(top_k, int) or isinstance(top_k, bool) or top_k < 1):
+            return 400, {"error": "\"top_k\" must be a positive integer"}
+        queries = payload.get("queries") or ([payload["query"]] if payload.get("query") else [])
+        if not isinstance(queries, list) or not queries or not all(isinstance(q, str) and q for q in queries):
+            return 400, {"error": "Provide a non-empty \"query\" string or \"queries\" list"}
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(self.recommend(q, top_k) for q in queries))
+        self.latencies_ms.append((time.perf_counter() - start) * 1000)
+        METRICS.observe("server_request_seconds", self.latencies_ms[-1] / 1000)
+        METRICS.inc("server_queries_total", len(queries))
+        responses = [self._format_results(q, indices, scores) for q, (indices, scores) in zip(queries, results)]
+        if payload.get("queries"):
+            return 200, {"responses": responses}
+        return 200, responses[0]
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+                try:
+                    status, response = await self._handle_request(method, path, body)
+                except Exception as e:
+                    # A failed request must still get a response; the connection and server stay up
+                    print(f"❌ [RecommendationServer] {method} {path} failed: {e!r}")
+                    status, response = 500, {"error": "Internal server error"}
+                if isinstance(response, str):
+                    data, content_type = response.encode("utf-8"), "text/plain; version=0.0.4"
+                else:
+                    data, content_type = json.dumps(response, ensure_ascii=False).encode("utf-8"), "application/json"
+                keep_alive = headers.get("connection", "").lower() != "close"
+                writer.write(
+                    f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}\r\n"
+                    f"Content-Type: {content_type}\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ValueError, asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self):
+        # The query processor loads its model lazily; load it now so the first request does not wait for it
+        self.query_processor.model
+        self._queue = asyncio.Queue()
+        worker = asyncio.create_task(self._batch_worker())
+        if self.unix_socket:
+            server = await asyncio.start_unix_server(self._handle_connection, path=self.unix_socket)
+            print(f"✅ Recommendation server listening on unix:{self.unix_socket}")
+        else:
+            server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+            print(f"✅ Recommendation server listening on http://{self.host}:{self.port}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            worker.cancel()
+
+    def run(self):
+        asyncio.run(self.serve())
@@ -0,0 +1,183 @@
+import re
+
+import numpy as np
+
+SPEC_COLUMNS = ["ram_gb", "storage_gb", "is_ssd", "display_inch", "price"]
+
+CURRENCY = r"(?:tk\.?|taka|bdt|৳)"
+# Units that mark a number as a spec, never a price ("16GB RAM", "2kg", "15.6 inch", "144Hz")
+SPEC_UNITS = r"GB|TB|MB|inch(?:es)?\b|in\b|\"|”|kg\b|g\b|lbs?\b|Hz\b|W\b|mAh\b|cores?\b|th\b"
+AMOUNT = (
+    rf"({CURRENCY})?\s*(\d[\d,]*(?:\.\d+)?)\s*(?:(k|lakh|lac)\b)?"
+    rf"(?!\d|[.,]\d|\s*(?:{SPEC_UNITS}))(\s*{CURRENCY}(?!\w))?"
+)
+RAM_QUERY_RES = [
+    re.compile(r"(\d+)\s*GB\s*(?:of\s+)?(?:DDR\d\w*\s+)?(?:RAM|memory)\b", re.IGNORECASE),
+    re.compile(r"\b(?:RAM|memory)\s*(?:of\s+)?[-:]?\s*(\d+)\s*GB", re.IGNORECASE),
+]
+STORAGE_QUERY_RES = [
+    re.compile(r"(\d+(?:\.\d+)?)\s*(TB|GB)\s*(?:of\s+)?(?:NVMe\s+|M\.2\s+)?(?:SSD|NVMe|HDD|storage)\b", re.IGNORECASE),
+    re.compile(r"\b(?:SSD|NVMe|HDD|storage)\s*(?:of\s+)?[-:]?\s*(\d+(?:\.\d+)?)\s*(TB|GB)\b(?!\s*(?:DDR\d\w*\s+)?(?:RAM|memory))", re.IGNORECASE),
+]
+SSD_QUERY_RE = re.compile(r"\b(?:SSD|NVMe)\b", re.IGNORECASE)
+DISPLAY_QUERY_RE = re.compile(r"(\d{2}(?:\.\d+)?)\s*(?:-\s*)?(?:inch(?:es)?\b|in\b|\"|”)", re.IGNORECASE)
+PRICE_BETWEEN_RE = re.compile(rf"\b(?:between|from)\s+{AMOUNT}\s*(?:and|to|-)\s*{AMOUNT}", re.IGNORECASE)
+PRICE_MAX_RE = re.compile(rf"\b(?:under|below|less than|within|up to|upto|max(?:imum)?|budget(?: of)?)\s+{AMOUNT}", re.IGNORECASE)
+PRICE_MIN_RE = re.compile(rf"\b(?:over|above|more than|at least|min(?:imum)?)\s+{AMOUNT}", re.IGNORECASE)
+PRICE_MULTIPLIERS = {"k": 1_000, "lakh": 100_000, "lac": 100_000}
+# A bare number (no currency word, no k/lakh) only counts as a price from this size up
+MIN_BARE_PRICE = 1_000
+
+
+def _amount(currency, number, suffix, trailing_currency, default_suffix=None):
+    """
+    Price in taka of one AMOUNT match, or None when the number does not look like a price.
+    :param default_suffix: Multiplier suffix to assume for a bare number ("50 to 80k" -> 50k).
+    """
+    suffix = suffix or default_suffix
+    value = float(number.replace(",", "")) * PRICE_MULTIPLIERS.get((suffix or "").lower(), 1)
+    if currency or trailing_currency or suffix or value >= MIN_BARE_PRICE:
+        return value
+    return None
+
+
+def _price_bound(pattern, query):
+    """
+    First plausible price after one of the pattern's keywords, skipping spec numbers like "max 16GB RAM".
+    """
+    for m in pattern.finditer(query):
+        value = _amount(*m.groups())
+        if value is not None:
+            return value
+    return None
+
+
+def _price_between(query):
+    for m in PRICE_BETWEEN_RE.finditer(query):
+        low_groups, high_groups = m.groups()[:4], m.groups()[4:]
+        low = _amount(*low_groups, default_suffix=high_groups[2])
+        high = _amount(*high_groups, default_suffix=low_groups[2])
+        if low is not None and high is not None:
+            return tuple(sorted((low, high)))
+    return None
+
+
+def parse_query_constraints(query):
+    """
+    Parse hard spec constraints out of a free-text query, e.g.
+    "15-inch laptop with 8GB RAM and 512GB SSD under 80,000" ->
+    {"ram_gb": (8, None), "storage_gb": (512, None), "is_ssd": True, "display_inch": (15, 16), "price": (None, 80000)}
+    Ranges are (min, max) with None for an open end; display sizes match the whole inch (15 -> [15, 16)).
+    Storage needs a GB/TB unit, and a number is only a price with a currency word (tk, BDT, ৳),
+    a k/lakh suffix or a size of at least MIN_BARE_PRICE, so "RTX 4060" or "under 2kg" are not constraints.
+    """
+    constraints = {}
+
+    for pattern in RAM_QUERY_RES:
+        m = pattern.search(query)
+        if m:
+            constraints["ram_gb"] = (float(m.group(1)), None)
+            break
+
+    for pattern in STORAGE_QUERY_RES:
+        m = pattern.search(query)
+        if m:
+            size = float(m.group(1)) * (1024 if m.group(2).upper() == "TB" else 1)
+            constraints["storage_gb"] = (size, None)
+            break
+    if SSD_QUERY_RE.search(query):
+        constraints["is_ssd"] = True
+
+    m = DISPLAY_QUERY_RE.search(query)
+    if m:
+        inch = float(int(float(m.group(1))))
+        constraints["display_inch"] = (inch, inch + 1)
+
+    price = _price_between(query)
+    if price is None:
+        low = _price_bound(PRICE_MIN_RE, query)
+        high = _price_bound(PRICE_MAX_RE, query)
+        if low is not None or high is not None:
+            price = (low, high)
+    if price is not None:
+        constraints["price"] = price
+
+    return constraints
+
+
+def describe_constraints(constraints):
+    """
+    Human-readable summary of parsed constraints, for reports.
+    """
+    parts = []
+    for column, value in constraints.items():
+        if column == "is_ssd":
+            parts.append("SSD")
+            continue
+        low, high = value
+        if column == "display_inch":
+            parts.append(f"display {low:g}-{high:g} inch")
+        elif low is not None and high is not None:
+            parts.append(f"{column} {low:g}-{high:g}")
+        elif low is not None:
+            parts.append(f"{column} >= {low:g}")
+        else:
+            parts.append(f"{column} <= {high:g}")
+    return ", ".join(parts)
+
+
+class SpecFilter:
+    def __init__(self, specs):
+        """
+        Columnar store of the numeric spec columns (float32 / bool numpy arrays, one value per
+        indexed laptop) for vectorized pre-filtering. Prices are additionally kept sorted so a
+        price range is two binary searches instead of a full scan.
+        :param specs: Mapping (DataFrame, dict of arrays, ...) with the SPEC_COLUMNS.
+        """
+        self.columns = {}
+        for column in SPEC_COLUMNS:
+            dtype = bool if column == "is_ssd" else np.float32
+            self.columns[column] = np.asarray(specs[column], dtype=dtype)
+        self.size = len(self.columns["price"])
+
+        # Unknown (NaN) prices sort to the end and are never inside a range
+        self.price_order = np.argsort(self.columns["price"], kind="stable")
+        self.sorted_prices = self.columns["price"][self.price_order]
+        self.known_prices = int(np.count_nonzero(~np.isnan(self.sorted_prices)))
+
+    def price_range(self, low=None, high=None):
+        """
+        Row positions whose price lies in [low, high], from the sorted price index.
+        """
+        start = 0 if low is None else np.searchsorted(self.sorted_prices[:self.known_prices], low, side="left")
+        stop = self.known_prices if high is None else np.searchsorted(self.sorted_prices[:self.known_prices], high, side="right")
+        return self.price_order[start:stop]
+
+    def mask(self, constraints):
+        """
+        Boolean mask of the laptops satisfying every constraint. Laptops with an unknown value
+        for a constrained column are excluded.
+        """
+        mask = np.ones(self.size, dtype=bool)
+        for column, value in constraints.items():
+            if column == "price":
+                price_mask = np.zeros(self.size, dtype=bool)
+                price_mask[self.price_range(*value)] = True
+                mask &= price_mask
+            elif column == "is_ssd":
+                mask &= self.columns["is_ssd"] == value
+            else:
+                low, high = value
+                values = self.columns[column]
+                # NaN comparisons are False, so unknown values drop out
+                if low is not None:
+                    mask &= values >= low
+                if high is not None:
+                    mask &= values < high if column == "display_inch" else values <= high
+        return mask
+
+    def candidates(self, constraints):
+        """
+        Row positions of the laptops satisfying every constraint.
+        """
+        return np.flatnonzero(self.mask(constraints))
@@ -0,0 +1,69 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+
+def prompt_key(model_name, prompt):
+    """
+    Content address of a request: the model name plus the prompt with case and whitespace
+    normalized, so listings that differ only in spacing share one entry.
+    """
+    normalized = " ".join(str(prompt).lower().split())
+    return hashlib.sha256(f"{model_name}\0{normalized}".encode("utf-8")).hexdigest()
+
+
+class SWOTCache:
+    def __init__(self, path="data/processed/swot_cache.sqlite", ttl_days=30):
+        """
+        Persistent cache of LLM responses keyed by prompt_key(model, prompt).
+        Entries older than ttl_days are ignored and removed by evict_expired().
+        Failed calls are never stored, so they are retried on the next run.
+        """
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.ttl_seconds = ttl_days * 86400
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, model_name TEXT, response TEXT, created_at REAL)"
+        )
+        self._db.commit()
+
+    def get(self, key):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT response FROM responses WHERE key = ? AND created_at >= ?",
+                (key, time.time() - self.ttl_seconds),
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(self, key, model_name, response):
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)", (key, model_name, response, time.time())
+            )
+            self._db.commit()
+
+    def evict_expired(self):
+        """
+        Delete entries older than the TTL. Returns the number of entries removed.
+        """
+        with self._lock:
+            removed = self._db.execute(
+                "DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl_seconds,)
+            ).rowcount
+            self._db.commit()
+        return removed
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
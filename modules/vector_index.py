@@ -0,0 +1,423 @@
+import os
+
+import numpy as np
+
+IVF_INDEX_FILE = "ivf_index.npz"
+INT8_INDEX_FILE = "int8_index.npz"
+BINARY_INDEX_FILE = "binary_index.npz"
+# Set bits per byte value, for numpy versions without np.bitwise_count
+POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def normalize_rows(matrix):
+    """
+    L2-normalize each row of a 2D float32 matrix (zero rows are left as zeros).
+    """
+    matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def top_k_indices(scores, k):
+    """
+    Return the indices of the k highest scores along the last axis, best first.
+    Works on a single score vector or a (queries x laptops) score matrix, and uses a
+    partial selection (argpartition) so only the k winners per row get sorted.
+    """
+    n = scores.shape[-1]
+    k = min(k, n)
+    if k <= 0:
+        return np.empty(scores.shape[:-1] + (0,), dtype=np.int64)
+    if k < n:
+        candidates = np.argpartition(-scores, k - 1, axis=-1)[..., :k]
+    else:
+        candidates = np.broadcast_to(np.arange(n), scores.shape).copy()
+    candidate_scores = np.take_along_axis(scores, candidates, axis=-1)
+    order = np.argsort(-candidate_scores, axis=-1, kind="stable")
+    return np.take_along_axis(candidates, order, axis=-1)
+
+
+def score_candidates(embeddings, query_embedding, candidates, k):
+    """
+    Exact cosine scores of one query against the given rows, keeping the best k.
+    :return: (indices, scores) of up to k rows, best first.
+    """
+    candidates = np.sort(candidates)  # sequential reads from the memory-mapped matrix
+    scores = np.asarray(embeddings[candidates], dtype=np.float32) @ query_embedding
+    top = top_k_indices(scores, k)
+    return candidates[top], scores[top]
+
+
+def rescore_candidates(embeddings, query_embeddings, candidates, k):
+    """
+    Exact scores of each query against its candidate rows, as (queries x k) arrays.
+    :param candidates: Row indices into the float32 embedding matrix, one array per query.
+    :return: (indices, scores), both (queries x k), best first, padded with -1 / -inf.
+    """
+    indices = np.full((len(query_embeddings), k), -1, dtype=np.int64)
+    scores = np.full((len(query_embeddings), k), -np.inf, dtype=np.float32)
+    for row, (query, ids) in enumerate(zip(query_embeddings, candidates)):
+        best, best_scores = score_candidates(embeddings, query, ids, k)
+        indices[row, :len(best)] = best
+        scores[row, :len(best)] = best_scores
+    return indices, scores
+
+
+def hamming_distances(codes, query_code):
+    """
+    Number of differing bits between every packed code and one packed query code.
+    :param codes: (words x rows) uint64 matrix, one row per 64-bit word of the codes, so each
+                  pass reads one contiguous array.
+    :param query_code: (words,) uint64 vector.
+    """
+    distances = np.zeros(codes.shape[1], dtype=np.uint16)
+    xor = np.empty(codes.shape[1], dtype=np.uint64)
+    for word, query_word in zip(codes, query_code):
+        np.bitwise_xor(word, query_word, out=xor)
+        if hasattr(np, "bitwise_count"):
+            distances += np.bitwise_count(xor)
+        else:
+            distances += POPCOUNT_TABLE[xor.view(np.uint8)].reshape(-1, 8).sum(axis=1, dtype=np.uint16)
+    return distances
+
+
+class ExactIndex:
+    """
+    Brute-force cosine search: one matrix product against every stored embedding.
+    """
+    backend = "exact"
+
+    def __init__(self, embeddings):
+        self.embeddings = embeddings
+
+    @classmethod
+    def build(cls, embeddings, **params):
+        return cls(embeddings)
+
+    @classmethod
+    def load(cls, index_dir, embeddings, **params):
+        return cls(embeddings)
+
+    def save(self, index_dir):
+        pass
+
+    def params(self):
+        return {}
+
+    def nbytes(self):
+        return self.embeddings.nbytes
+
+    def search(self, query_embeddings, k):
+        """
+        :param query_embeddings: (queries x dim) normalized float32 matrix.
+        :return: (indices, scores), both (queries x k), best first.
+        """
+        similarities = query_embeddings @ self.embeddings.T
+        indices = top_k_indices(similarities, k)
+        return indices, np.take_along_axis(similarities, indices, axis=1)
+
+    def search_candidates(self, query_embedding, candidates, k):
+        """
+        Rank a subset of rows (e.g. the laptops passing the spec filter) for one query.
+        :return: (indices, scores) of up to k rows, best first.
+        """
+        return score_candidates(self.embeddings, query_embedding, candidates, k)
+
+
+class IVFIndex:
+    """
+    Inverted-file approximate index: embeddings are clustered with spherical k-means and
+    a query only scores the laptops in its n_probe closest clusters.
+    n_probe is the recall-vs-latency knob: higher values scan more clusters.
+    """
+    backend = "ivf"
+
+    def __init__(self, embeddings, centroids, list_offsets, list_ids, n_probe=8):
+        self.embeddings = embeddings
+        self.centroids = centroids
+        self.list_offsets = list_offsets
+        self.list_ids = list_ids
+        self.n_probe = n_probe
+
+    @classmethod
+    def build(cls, embeddings, n_lists=None, n_probe=8, n_iter=20, train_size=50000, seed=0, chunk_size=65536, **params):
+        """
+        Train the cluster centroids on a sample of the embeddings and assign every row to a list.
+        :param n_lists: Number of clusters (default: sqrt of the row count).
+        """
+        n = embeddings.shape[0]
+        n_lists = min(n_lists or max(1, int(np.sqrt(n))), n)
+        rng = np.random.default_rng(seed)
+
+        sample_ids = np.sort(rng.choice(n, size=min(n, max(train_size, n_lists)), replace=False))
+        sample = np.asarray(embeddings[sample_ids], dtype=np.float32)
+        centroids = sample[rng.choice(len(sample), size=n_lists, replace=False)].copy()
+
+        for _ in range(n_iter):
+            assignments = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, sample)
+            counts = np.bincount(assignments, minlength=n_lists)
+            empty = counts == 0
+            if empty.any():
+                # Re-seed empty clusters with random sample points
+                sums[empty] = sample[rng.choice(len(sample), size=int(empty.sum()), replace=False)]
+            centroids = normalize_rows(sums)
+
+        assignments = np.concatenate([
+            np.argmax(np.asarray(embeddings[start:start + chunk_size], dtype=np.float32) @ centroids.T, axis=1)
+            for start in range(0, n, chunk_size)
+        ])
+        list_ids = np.argsort(assignments, kind="stable").astype(np.int64)
+        list_offsets = np.concatenate([[0], np.cumsum(np.bincount(assignments, minlength=n_lists))]).astype(np.int64)
+        return cls(embeddings, centroids, list_offsets, list_ids, n_probe=n_probe)
+
+    @classmethod
+    def load(cls, index_dir, embeddings, n_probe=None, **params):
+        with np.load(os.path.join(index_dir, IVF_INDEX_FILE), allow_pickle=False) as data:
+            index = cls(
+                embeddings,
+                data["centroids"],
+                data["list_offsets"],
+                data["list_ids"],
+                n_probe=int(data["n_probe"]),
+            )
+        if index.list_offsets[-1] != embeddings.shape[0]:
+            raise ValueError(f"IVF index in {index_dir} does not match the embedding matrix; rebuild it")
+        if n_probe:
+            index.n_probe = n_probe
+        return index
+
+    def save(self, index_dir):
+        os.makedirs(index_dir, exist_ok=True)
+        np.savez(
+            os.path.join(index_dir, IVF_INDEX_FILE),
+            centroids=self.centroids,
+            list_offsets=self.list_offsets,
+            list_ids=self.list_ids,
+            n_probe=np.int64(self.n_probe),
+        )
+
+    def params(self):
+        return {"n_lists": int(len(self.centroids)), "n_probe": int(self.n_probe)}
+
+    def nbytes(self):
+        return self.embeddings.nbytes + self.centroids.nbytes + self.list_offsets.nbytes + self.list_ids.nbytes
+
+    def search(self, query_embeddings, k):
+        """
+        :param query_embeddings: (queries x dim) normalized float32 matrix.
+        :return: (indices, scores), both (queries x k), best first. Rows are padded with
+                 -1 / -inf when the probed clusters hold fewer than k laptops.
+        """
+        n_probe = min(self.n_probe, len(self.centroids))
+        probes = top_k_indices(query_embeddings @ self.centroids.T, n_probe)
+
+        indices = np.full((len(query_embeddings), k), -1, dtype=np.int64)
+        scores = np.full((len(query_embeddings), k), -np.inf, dtype=np.float32)
+        for row, (query, lists) in enumerate(zip(query_embeddings, probes)):
+            candidates = np.concatenate([
+                self.list_ids[self.list_offsets[l]:self.list_offsets[l + 1]] for l in lists
+            ])
+            if not len(candidates):
+                continue
+            candidates.sort()  # sequential reads from the memory-mapped matrix
+            candidate_scores = np.asarray(self.embeddings[candidates], dtype=np.float32) @ query
+            best = top_k_indices(candidate_scores, k)
+            indices[row, :len(best)] = candidates[best]
+            scores[row, :len(best)] = candidate_scores[best]
+        return indices, scores
+
+    def search_candidates(self, query_embedding, candidates, k):
+        # A filtered subset is usually small enough to score exactly
+        return score_candidates(self.embeddings, query_embedding, candidates, k)
+
+
+class Int8Index:
+    """
+    Scalar-quantized index: every dimension is scaled to int8, so the codes scanned per query
+    take a quarter of the float32 matrix. The best rescore * k laptops by approximate score are
+    then rescored exactly against the float32 embeddings (only those rows are read).
+    """
+    backend = "int8"
+
+    def __init__(self, embeddings, codes, scale, rescore=4, block_size=512):
+        self.embeddings = embeddings
+        self.codes = codes
+        self.scale = scale
+        self.rescore = rescore
+        # Rows dequantized at a time; small blocks stay in cache (256-512 rows is ~2.5x faster than 16k)
+        self.block_size = block_size
+
+    @classmethod
+    def build(cls, embeddings, rescore=4, chunk_size=65536, **params):
+        """
+        :param rescore: Candidates rescored exactly per requested result.
+        """
+        n = embeddings.shape[0]
+        max_abs = np.zeros(embeddings.shape[1], dtype=np.float32)
+        for start in range(0, n, chunk_size):
+            chunk = np.asarray(embeddings[start:start + chunk_size], dtype=np.float32)
+            np.maximum(max_abs, np.abs(chunk).max(axis=0), out=max_abs)
+        scale = np.where(max_abs > 0, max_abs / 127.0, 1.0).astype(np.float32)
+
+        codes = np.empty(embeddings.shape, dtype=np.int8)
+        for start in range(0, n, chunk_size):
+            chunk = np.asarray(embeddings[start:start + chunk_size], dtype=np.float32)
+            codes[start:start + chunk_size] = np.clip(np.rint(chunk / scale), -127, 127)
+        return cls(embeddings, codes, scale, rescore=rescore)
+
+    @classmethod
+    def load(cls, index_dir, embeddings, rescore=None, **params):
+        with np.load(os.path.join(index_dir, INT8_INDEX_FILE), allow_pickle=False) as data:
+            index = cls(embeddings, data["codes"], data["scale"], rescore=int(data["rescore"]))
+        if index.codes.shape != embeddings.shape:
+            raise ValueError(f"int8 index in {index_dir} does not match the embedding matrix; rebuild it")
+        if rescore:
+            index.rescore = rescore
+        return index
+
+    def save(self, index_dir):
+        os.makedirs(index_dir, exist_ok=True)
+        np.savez(
+            os.path.join(index_dir, INT8_INDEX_FILE),
+            codes=self.codes,
+            scale=self.scale,
+            rescore=np.int64(self.rescore),
+        )
+
+    def params(self):
+        return {"rescore": int(self.rescore)}
+
+    def nbytes(self):
+        return self.codes.nbytes + self.scale.nbytes
+
+    def approximate_scores(self, query_embeddings):
+        """
+        (queries x laptops) dot products against the dequantized codes, a block of rows at a time.
+        """
+        scaled = np.ascontiguousarray(query_embeddings * self.scale, dtype=np.float32)
+        scores = np.empty((len(query_embeddings), len(self.codes)), dtype=np.float32)
+        for start in range(0, len(self.codes), self.block_size):
+            block = self.codes[start:start + self.block_size].astype(np.float32)
+            scores[:, start:start + len(block)] = scaled @ block.T
+        return scores
+
+    def search(self, query_embeddings, k):
+        """
+        :param query_embeddings: (queries x dim) normalized float32 matrix.
+        :return: (indices, scores), both (queries x k), best first, with exact float32 scores.
+        """
+        candidates = top_k_indices(self.approximate_scores(query_embeddings), k * self.rescore)
+        return rescore_candidates(self.embeddings, query_embeddings, candidates, k)
+
+    def search_candidates(self, query_embedding, candidates, k):
+        """
+        Rank a subset of rows for one query: approximate scores on their codes, then exact rescoring.
+        """
+        approximate = self.codes[candidates].astype(np.float32) @ (query_embedding * self.scale)
+        shortlist = candidates[top_k_indices(approximate, k * self.rescore)]
+        return score_candidates(self.embeddings, query_embedding, shortlist, k)
+
+
+class BinaryIndex:
+    """
+    Binary index: every embedding is reduced to its sign bits (dim / 8 bytes, 32x smaller than
+    float32) and candidates are the laptops at the smallest Hamming distance from the query's
+    bits. Signs are a coarse approximation, so more candidates (rescore * k) are rescored exactly.
+    """
+    backend = "binary"
+
+    def __init__(self, embeddings, codes, rescore=100):
+        self.embeddings = embeddings
+        self.codes = codes  # (64-bit words x rows), see hamming_distances
+        self.rescore = rescore
+
+    @staticmethod
+    def pack(matrix):
+        """
+        Sign bits of each row, packed and padded to whole 64-bit words: (rows x words) uint64.
+        """
+        bits = np.packbits(np.asarray(matrix) > 0, axis=1)
+        padding = -bits.shape[1] % 8
+        if padding:
+            bits = np.pad(bits, ((0, 0), (0, padding)))
+        return np.ascontiguousarray(bits).view(np.uint64)
+
+    @classmethod
+    def build(cls, embeddings, rescore=100, chunk_size=65536, **params):
+        """
+        :param rescore: Candidates rescored exactly per requested result.
+        """
+        codes = np.concatenate([
+            cls.pack(embeddings[start:start + chunk_size]) for start in range(0, embeddings.shape[0], chunk_size)
+        ] or [cls.pack(embeddings[:0])])
+        return cls(embeddings, np.ascontiguousarray(codes.T), rescore=rescore)
+
+    @classmethod
+    def load(cls, index_dir, embeddings, rescore=None, **params):
+        with np.load(os.path.join(index_dir, BINARY_INDEX_FILE), allow_pickle=False) as data:
+            index = cls(embeddings, data["codes"], rescore=int(data["rescore"]))
+        if index.codes.shape[1] != embeddings.shape[0]:
+            raise ValueError(f"binary index in {index_dir} does not match the embedding matrix; rebuild it")
+        if rescore:
+            index.rescore = rescore
+        return index
+
+    def save(self, index_dir):
+        os.makedirs(index_dir, exist_ok=True)
+        np.savez(os.path.join(index_dir, BINARY_INDEX_FILE), codes=self.codes, rescore=np.int64(self.rescore))
+
+    def params(self):
+        return {"rescore": int(self.rescore)}
+
+    def nbytes(self):
+        return self.codes.nbytes
+
+    def search(self, query_embeddings, k):
+        """
+        :param query_embeddings: (queries x dim) normalized float32 matrix.
+        :return: (indices, scores), both (queries x k), best first, with exact float32 scores.
+        """
+        candidates = [
+            top_k_indices(-hamming_distances(self.codes, code).astype(np.int32), k * self.rescore)
+            for code in self.pack(query_embeddings)
+        ]
+        return rescore_candidates(self.embeddings, query_embeddings, candidates, k)
+
+    def search_candidates(self, query_embedding, candidates, k):
+        """
+        Rank a subset of rows for one query: Hamming distance on their codes, then exact rescoring.
+        """
+        distances = hamming_distances(self.codes[:, candidates], self.pack(query_embedding[np.newaxis, :])[0])
+        shortlist = candidates[top_k_indices(-distances.astype(np.int32), k * self.rescore)]
+        return score_candidates(self.embeddings, query_embedding, shortlist, k)
+
+
+INDEX_BACKENDS = {
+    ExactIndex.backend: ExactIndex,
+    IVFIndex.backend: IVFIndex,
+    Int8Index.backend: Int8Index,
+    BinaryIndex.backend: BinaryIndex,
+}
+
+
+def _backend_class(backend):
+    if backend not in INDEX_BACKENDS:
+        raise ValueError(f"Unknown index backend '{backend}'. Available: {', '.join(INDEX_BACKENDS)}")
+    return INDEX_BACKENDS[backend]
+
+
+def build_index(embeddings, backend="exact", **params):
+    """
+    Build a search index over a normalized embedding matrix with the given backend.
+    """
+    return _backend_class(backend).build(embeddings, **params)
+
+
+def load_index(index_dir, embeddings, backend="exact", **params):
+    """
+    Load a saved search index; query-time params (e.g. n_probe) override the saved ones.
+    """
+    return _backend_class(backend).load(index_dir, embeddings, **params)
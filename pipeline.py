@@ -0,0 +1,43 @@
+import argparse
+
+from modules.instrumentation import add_metrics_arguments, apply_metrics_arguments
+from modules.pipeline import build_laptop_pipeline
+
+DEFAULT_TARGETS = ["report", "match", "history"]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Run the laptop pipeline (ingest -> clean -> extract -> embed -> index -> report, match, history and swot), "
+                    "skipping stages whose inputs have not changed."
+    )
+    parser.add_argument("stages", nargs="*", default=DEFAULT_TARGETS,
+                        help="Stages to bring up to date, together with everything they depend on (default: report, match and history).")
+    parser.add_argument("--swot", action="store_true", help="Also run the SWOT stage (calls the Gemini API).")
+    parser.add_argument("--force", action="store_true", help="Re-run the selected stages from scratch.")
+    parser.add_argument("--dry-run", action="store_true", help="Only show which stages would run.")
+    parser.add_argument("--data-folder", default="data/raw")
+    parser.add_argument("--processed-folder", default="data/processed")
+    parser.add_argument("--config", default="config/recommender_config.json")
+    parser.add_argument("--output-folder", default="outputs")
+    parser.add_argument("--embed-workers", type=int, default=0,
+                        help="Encode embeddings with this many worker processes (0: in this process).")
+    add_metrics_arguments(parser)
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    apply_metrics_arguments(args)
+    pipeline = build_laptop_pipeline(
+        data_folder=args.data_folder,
+        processed_folder=args.processed_folder,
+        index_dir=f"{args.processed_folder}/laptop_index",
+        config_file=args.config,
+        output_folder=args.output_folder,
+        embed_workers=args.embed_workers,
+    )
+    targets = list(args.stages) + (["swot"] if args.swot and "swot" not in args.stages else [])
+    pipeline.run(targets, force=args.force, dry_run=args.dry_run)
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,65 @@
+import argparse
 import json
 
-from modules.query_processor import QueryProcessor
+from modules.instrumentation import add_metrics_arguments, apply_metrics_arguments
 
 
-def main():
+def add_arguments(parser):
+    parser.add_argument("--config", default="config/recommender_config.json")
+    parser.add_argument("--serve", action="store_true", help="Run a long-lived HTTP server with the model and index kept warm.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix-socket", help="Serve on a Unix socket instead of host/port.")
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=5)
+    add_metrics_arguments(parser)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Laptop recommendations from the saved embedding index.")
+    add_arguments(parser)
+    return parser.parse_args()
+
+def run(args):
+    # Imported here so the unified CLI does not load pandas/pyarrow for other commands
+    from modules.query_processor import QueryProcessor
+
+    apply_metrics_arguments(args)
+
     # Load JSON Config
-    config_path = "config/recommender_config.json"
+    config_path = args.config
     with open(config_path, "r") as f:
         config = json.load(f)
 
+    if args.serve:
+        from modules.recommend_server import RecommendationServer
+
+        server = RecommendationServer(
+            QueryProcessor(config_path=config_path),
+            host=args.host,
+            port=args.port,
+            unix_socket=args.unix_socket,
+            max_batch_size=args.max_batch_size,
+            max_wait_ms=args.max_wait_ms,
+        )
+        server.run()
+        return
+
+    batch_mode = bool(config.get("queries") or config.get("queries_file"))
+
     # Ensure there is a query in the config
-    if not config.get("query"):
+    if not config.get("query") and not batch_mode:
         print("⚠️ No query found in config file. Please add a query before running.")
         return
 
     # Run Recommender System
     query_processor = QueryProcessor(config_path=config_path)
-    query_processor.generate_recommendation_report()
+    if config.get("query"):
+        query_processor.generate_recommendation_report()
+    if batch_mode:
+        query_processor.generate_batch_recommendation_report()
+
+def main():
+    run(parse_args())
 
 if __name__ == "__main__":
     main()
@@ -1,22 +1,54 @@
-import os
+import argparse
 
-import pandas as pd
-from modules.laptop_recommender import LaptopRecommender
+from modules.instrumentation import add_metrics_arguments, apply_metrics_arguments
 
 
-def main():
+def add_arguments(parser):
+    parser.add_argument("--input-file",
+                        help="Feature table or dataset directory (default: the newer of data/processed/feature_extracted.parquet "
+                             "and the data_prepare.py --stream dataset data/processed/features/).")
+    parser.add_argument("--index-dir", default="data/processed/laptop_index")
+    parser.add_argument("--config", default="config/recommender_config.json")
+    parser.add_argument("--cache-dir", default="data/processed/embedding_cache")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="Encode with this many worker processes (one model each, length-sorted batches); "
+                             "0 encodes in a single model.encode call.")
+    parser.add_argument("--batch-size", type=int, default=64, help="Texts per forward pass with --workers.")
+    add_metrics_arguments(parser)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Embed the feature-extracted laptops and build the search index.")
+    add_arguments(parser)
+    return parser.parse_args()
+
+def run(args):
+    from modules.embedding_cache import EmbeddingCache
+    from modules.io_utils import newest_table, read_table
+    from modules.laptop_recommender import LaptopRecommender
+
+    apply_metrics_arguments(args)
+
     # Load the dataset (250 laptops)
-    input_file = "data/processed/feature_extracted.xlsx"
-    df = pd.read_excel(input_file)
+    input_file = args.input_file or newest_table("data/processed/feature_extracted.parquet", "data/processed/features")
+    if input_file is None:
+        raise FileNotFoundError("No feature table in data/processed. Run `python cli.py prepare` first.")
+    print(f"[Main] Reading {input_file}")
+    df = read_table(input_file)
 
     # Initialize recommender and generate embeddings
-    recommender = LaptopRecommender()
-    df = recommender.generate_embeddings(df, text_cols=["Product Name", "Cleaned_Tech_Details", "Cleaned_Description"])
+    recommender = LaptopRecommender(workers=args.workers, batch_size=args.batch_size)
+    # Only new or changed laptops are re-encoded; the rest come from the persistent cache
+    cache = EmbeddingCache(args.cache_dir, model_name=recommender.model_name)
+    try:
+        df = recommender.generate_embeddings(df, text_cols=["Product Name", "Cleaned_Tech_Details", "Cleaned_Description"], cache=cache)
+    finally:
+        recommender.close()
 
+    # Save embeddings as a memory-mapped index and record it in the JSON config
+    recommender.save_embeddings(df, index_dir=args.index_dir, config_file=args.config)
 
-    embedding_file_name = "data/processed/all_laptop_embeddings.pkl"
-    # Save embeddings as Pickle and metadata as JSON
-    recommender.save_embeddings(df, embedding_file = embedding_file_name)
+def main():
+    run(parse_args())
 
 if __name__ == "__main__":
     main()
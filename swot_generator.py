@@ -1,20 +1,71 @@
+import argparse
 import os
+import random
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 
-import google.generativeai as genai
-import pandas as pd
 from tqdm import tqdm
 
+from modules.instrumentation import METRICS
+from modules.io_utils import read_table, write_table
+from modules.rate_limiter import TokenBucket
+from modules.swot_cache import SWOTCache, prompt_key
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+API_ERROR = "Error: API Call Failed"
+
+
+def status_code(error):
+    """
+    HTTP status of an API error, if it has one (google.api_core errors expose it as .code).
+    """
+    for attribute in ("code", "status_code"):
+        code = getattr(error, attribute, None)
+        if isinstance(code, int):
+            return code
+    return None
+
+
+def is_retryable(error):
+    return status_code(error) in RETRY_STATUS_CODES or isinstance(error, (ConnectionError, TimeoutError))
+
 
 class SWOTAnalyzer:
-    def __init__(self, model_name="gemini-1.5-flash", api_key="MY_API_KEY"):
-        # Configure the Gemini API
-        genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel(model_name)
+    def __init__(self, model_name="gemini-1.5-flash", api_key="MY_API_KEY", client=None,
+                 requests_per_minute=15, max_workers=4, max_retries=5, backoff=2.0, cache=None):
+        """
+        :param client: Object with a generate_content(prompt) method returning a response with .text.
+                       Defaults to a Gemini GenerativeModel; pass a fake client to run without the API.
+        :param requests_per_minute: Sustained request rate, enforced with a token bucket across all workers.
+        :param max_workers: Maximum number of requests in flight.
+        :param max_retries: Retries for rate-limit (429) and server (5xx) errors, with exponential backoff.
+        :param cache: Optional SWOTCache; prompts answered before (for this model) are not sent again.
+        """
+        self.model_name = model_name
+        if client is None:
+            import google.generativeai as genai
 
-    def generate_swot(self, tech_details: str, description: str):
-        # Construct the prompt
-        prompt = (
+            # Configure the Gemini API
+            genai.configure(api_key=api_key)
+            client = genai.GenerativeModel(model_name)
+        self.model = client
+        self.requests_per_minute = requests_per_minute
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.bucket = TokenBucket(requests_per_minute / 60.0)
+        self.cache = cache
+        self.stats = {"calls": 0, "retries": 0, "failed": 0, "cache_hits": 0, "duplicates": 0}
+        self._lock = threading.Lock()
+
+    def count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+        METRICS.inc(f"swot_{key}_total")
+
+    def build_prompt(self, tech_details: str, description: str):
+        return (
             f"Perform a detailed SWOT analysis for the following laptop product.\n\n"
             f"**Technical Details:** {tech_details}\n"
             f"**Product Description:** {description}\n\n"
@@ -26,35 +77,103 @@ class SWOTAnalyzer:
             f"Keep the response concise and structured."
         )
 
+    def call_model(self, prompt):
+        """
+        Call the model within the rate limit, retrying 429/5xx and connection errors with
+        exponential backoff and jitter. Other errors (e.g. an invalid API key) are raised at once.
+        """
+        for attempt in range(self.max_retries + 1):
+            self.bucket.acquire()
+            self.count("calls")
+            try:
+                with METRICS.timer("swot_request_seconds"):
+                    response = self.model.generate_content(prompt)
+                return response.text.strip() if response.text else "Error: No response from API"
+            except Exception as e:
+                METRICS.inc("swot_api_errors_total", status=status_code(e) or type(e).__name__)
+                if not is_retryable(e) or attempt == self.max_retries:
+                    raise
+                wait = self.backoff * (2 ** attempt) + random.uniform(0, self.backoff)
+                print(f"⚠️ [SWOTAnalyzer] {type(e).__name__} ({status_code(e)}), retrying in {wait:.1f}s")
+                self.count("retries")
+                time.sleep(wait)
+
+    def generate_swot(self, tech_details: str, description: str):
+        # Construct the prompt
+        prompt = self.build_prompt(tech_details, description)
+        return self.generate_for_prompt(prompt)
+
+    def generate_for_prompt(self, prompt, key=None):
+        key = key or prompt_key(self.model_name, prompt)
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.count("cache_hits")
+                return cached
+
         try:
             # Call Gemini API
-            response = self.model.generate_content(prompt)
-            print(response)
-            return response.text.strip() if response.text else "Error: No response from API"
+            response = self.call_model(prompt)
         except Exception as e:
-            print(f"Error generating SWOT analysis: {e}")
-            return "Error: API Call Failed"
-
-    def generate_swot_for_all(self, df, tech_col="Cleaned_Tech_Details", desc_col="Cleaned_Description", delay=3):
-        swot_analyses = []
-        for _, row in tqdm(df.iterrows(), total=len(df), desc="Generating SWOT Analyses"):
-            tech_details = row.get(tech_col, "")
-            description = row.get(desc_col, "")
-            swot_analysis = self.generate_swot(tech_details, description)
-            swot_analyses.append(swot_analysis)
-            time.sleep(delay)  # Delay between requests to respect rate limits
-        df['SWOT_Analysis'] = swot_analyses
-        print("[SWOTAnalyzer] SWOT analysis generation complete.")
+            self.count("failed")
+            print(f"❌ [SWOTAnalyzer] Error generating SWOT analysis: {type(e).__name__}: {e}")
+            return API_ERROR
+
+        if self.cache is not None and not response.startswith("Error:"):
+            self.cache.put(key, self.model_name, response)
+        return response
+
+    def generate_swot_for_all(self, df, tech_col="Cleaned_Tech_Details", desc_col="Cleaned_Description", max_workers=None):
+        """
+        Generate a SWOT analysis for every row, with up to max_workers requests in flight.
+        The request rate is limited by requests_per_minute rather than a fixed delay per row.
+        Rows with the same prompt share one request, and cached prompts are not sent at all.
+        """
+        with METRICS.stage("swot", rows_in=len(df)) as stage:
+            prompts = [self.build_prompt(row.get(tech_col, ""), row.get(desc_col, "")) for _, row in df.iterrows()]
+            keys = [prompt_key(self.model_name, prompt) for prompt in prompts]
+            unique = dict(zip(keys, prompts))
+            self.stats["duplicates"] += len(keys) - len(unique)
+            METRICS.inc("swot_duplicates_total", len(keys) - len(unique))
+            if self.cache is not None:
+                self.cache.evict_expired()
+
+            with ThreadPoolExecutor(max_workers=max_workers or self.max_workers) as executor:
+                responses = list(tqdm(
+                    executor.map(lambda item: self.generate_for_prompt(item[1], item[0]), unique.items()),
+                    total=len(unique), desc="Generating SWOT Analyses",
+                ))
+            by_key = dict(zip(unique, responses))
+            df['SWOT_Analysis'] = [by_key[key] for key in keys]
+            stage.rows_out = len(df)
+            stage.extra.update(self.stats)
+        print(f"[SWOTAnalyzer] SWOT analysis generation complete. Stats: {self.stats}")
+        if self.stats["failed"]:
+            print(f"⚠️ [SWOTAnalyzer] {self.stats['failed']} analyses failed and are marked '{API_ERROR}'.")
         return df
 
 # Usage example
 if __name__ == "__main__":
-    input_file = "data/processed/laptops_data.xlsx"
-    df = pd.read_excel(input_file)
+    parser = argparse.ArgumentParser(description="Generate a SWOT analysis for every laptop.")
+    parser.add_argument("--input", default="data/processed/laptops_data.parquet")
+    parser.add_argument("--output", default="outputs/laptops_swot_output.parquet")
+    parser.add_argument("--no-excel", action="store_true", help="Skip the human-readable .xlsx report.")
+    parser.add_argument("--requests-per-minute", type=float, default=15)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--cache", default="data/processed/swot_cache.sqlite", help="Response cache file.")
+    parser.add_argument("--cache-ttl-days", type=float, default=30)
+    parser.add_argument("--no-cache", action="store_true", help="Call the API for every product.")
+    args = parser.parse_args()
+
+    df = read_table(args.input)
 
-    swot_analyzer = SWOTAnalyzer()
+    swot_analyzer = SWOTAnalyzer(
+        api_key=os.environ.get("GEMINI_API_KEY", "MY_API_KEY"),
+        requests_per_minute=args.requests_per_minute,
+        max_workers=args.workers,
+        cache=None if args.no_cache else SWOTCache(args.cache, ttl_days=args.cache_ttl_days),
+    )
     updated_df = swot_analyzer.generate_swot_for_all(df)
 
-    output_file = "outputs/laptops_swot_output.xlsx"
-    updated_df.to_excel(output_file, index=False)
-    print(f"SWOT Analysis saved to {output_file}")
+    write_table(updated_df, args.output, excel=not args.no_excel)
+    print(f"SWOT Analysis saved to {args.output}")
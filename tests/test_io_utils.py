@@ -0,0 +1,38 @@
+import pandas as pd
+
+from modules.data_ingestor import DataIngestor
+from modules.io_utils import ParquetAppender, part_path
+
+
+def write_part(dataset_dir, csv_file):
+    with ParquetAppender(part_path(str(dataset_dir), str(csv_file))) as out:
+        for chunk in DataIngestor(str(csv_file.parent)).iter_file_chunks(str(csv_file)):
+            out.write(chunk)
+    return out.rows
+
+
+def test_empty_source_removes_its_stale_part(tmp_path):
+    raw, dataset = tmp_path / "raw", tmp_path / "dataset"
+    raw.mkdir()
+    csv_file, other_file = raw / "shop_laptops_raw.csv", raw / "other_laptops_raw.csv"
+    for path in (csv_file, other_file):
+        pd.DataFrame({"URL": ["https://example.com/a", "https://example.com/b"], "Price": ["1,000৳", "2,000৳"]}).to_csv(path, index=False)
+    assert write_part(dataset, csv_file) == 2
+    assert write_part(dataset, other_file) == 2
+
+    # The crawl of this source came back empty: its old rows must not stay in the dataset
+    csv_file.write_text("")
+    assert write_part(dataset, csv_file) == 0
+    assert len(pd.read_parquet(dataset)) == 2
+
+
+def test_failed_write_keeps_the_old_part(tmp_path):
+    path = str(tmp_path / "part-shop.parquet")
+    with ParquetAppender(path) as out:
+        out.write(pd.DataFrame({"URL": ["https://example.com/a"]}))
+    try:
+        with ParquetAppender(path):
+            raise RuntimeError("crawl failed")
+    except RuntimeError:
+        pass
+    assert len(pd.read_parquet(path)) == 1
@@ -0,0 +1,66 @@
+import os
+
+import pandas as pd
+
+from modules import pipeline
+from modules.data_cleaner import DataCleaner
+from modules.io_utils import read_table
+from modules.pipeline import Pipeline, Stage, build_laptop_pipeline
+
+RAW_ROWS = [
+    {
+        "URL": f"https://example.com/laptop-{i}",
+        "Product Name": f"Laptop {i}",
+        "Price": f"{50000 + i * 1000}৳",
+        "Technical Details": f"Processor - Intel Core i{3 + i} RAM - {8 * (i + 1)}GB Storage - 512GB SSD Display - 15.6 inch FHD",
+        "Description": f"Laptop {i} description",
+    }
+    for i in range(3)
+]
+
+
+def make_pipeline(tmp_path):
+    data_folder = tmp_path / "raw"
+    if not data_folder.exists():
+        data_folder.mkdir()
+        pd.DataFrame(RAW_ROWS).to_csv(data_folder / "shop_laptops_raw.csv", index=False)
+    processed_folder = tmp_path / "processed"
+    return build_laptop_pipeline(data_folder=str(data_folder), processed_folder=str(processed_folder),
+                                 index_dir=str(processed_folder / "index"), config_file=str(tmp_path / "config.json"),
+                                 output_folder=str(tmp_path / "outputs"))
+
+
+def test_cleaner_change_recomputes_extract(tmp_path, monkeypatch):
+    laptop_pipeline = make_pipeline(tmp_path)
+    assert laptop_pipeline.run(["extract"]) == ["ingest", "clean", "extract"]
+    features_file = os.path.join(tmp_path, "processed", "feature_extracted.parquet")
+    assert read_table(features_file)["Cleaned_Tech_Details"].str.contains("Processor").all()
+
+    # A new cleaner version whose output differs
+    clean_tech_details = DataCleaner.clean_tech_details
+    monkeypatch.setattr(DataCleaner, "clean_tech_details",
+                        lambda self, tech: clean_tech_details(self, tech).str.replace("Processor", "CPU"))
+    code_version = pipeline.code_version
+    monkeypatch.setattr(pipeline, "code_version",
+                        lambda *modules: code_version(*modules) + ("-new-cleaner" if any(m.__name__ == "modules.data_cleaner" for m in modules) else ""))
+
+    assert make_pipeline(tmp_path).run(["extract"]) == ["clean", "extract"]
+    features = read_table(features_file)
+    assert not features["Cleaned_Tech_Details"].str.contains("Processor").any()
+    assert features["Cleaned_Tech_Details"].str.contains("CPU").all()
+
+
+def test_stage_with_failures_stays_out_of_date(tmp_path):
+    failures = [2, 0]
+    output_file = tmp_path / "out.txt"
+
+    def run(full=False):
+        output_file.write_text("done")
+        return failures.pop(0)
+
+    def make():
+        return Pipeline([Stage("flaky", run, [], [str(output_file)])], state_file=str(tmp_path / "state.json"))
+
+    assert make().run() == ["flaky"]
+    assert make().run() == ["flaky"]  # retried: the first run had failures
+    assert make().run() == []